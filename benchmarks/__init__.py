@@ -0,0 +1 @@
+"""성능/부하 확인용 스크립트 모음. 저장소 루트에서 python -m benchmarks.<이름> 으로 실행한다."""
@@ -0,0 +1,286 @@
+"""Streamlit AppTest 기반 헤드리스 벤치마크.
+
+실제 브라우저 없이 streamlit.testing.v1.AppTest 로 앱을 돌리면서,
+사용자 조작(위젯 변경) 한 번 = 재실행 한 번의 벽시계 시간과 최대 메모리를 잰다.
+
+  kiosk        name.py — 모든 용기를 장바구니에 담아 한 번에 결제 + 바로 결제 한 번
+  mbti         pages/01_MBTI국가.py — 국가를 바꿔 가며 선택
+  hana-<N>     하나줍줍.py — N개(100 / 10,000 / 100,000) 가상 분실물로 검색/업로드
+
+시나리오마다 별도 프로세스에서 돌린다. (st.cache_* 와 모듈 상태가 섞이지 않도록)
+
+    python -m benchmarks.apptest_bench                   # 전부 실행 + 기준값과 비교
+    python -m benchmarks.apptest_bench --only kiosk mbti
+    python -m benchmarks.apptest_bench --write-baseline  # 현재 결과를 기준값으로 저장
+                                                         # (--update-baseline 과 같음)
+
+기준값(benchmarks/baseline.json)보다 중앙값/최대 메모리가 --tolerance 이상
+나빠지면 종료 코드 1 로 끝난다. 기준값 파일이 없거나 실행한 시나리오의 기준값이
+빠져 있어도 1 로 끝난다. (비교 없이 통과하지 않도록)
+
+기준값은 머신마다 다르므로 저장소에는 넣어 두지 않았다. 처음 한 번은:
+  1) 배포 환경과 같은 머신에서 --write-baseline 으로 baseline.json 을 만든다
+  2) benchmarks/baseline.json 을 커밋한다
+  3) 그 뒤로는 옵션 없이 돌려 비교한다. 일부러 느려지거나 빨라진 변경이면
+     --write-baseline --only <시나리오> 로 그 시나리오만 다시 저장해 같이 커밋한다.
+(benchmarks/README.md 에도 같은 절차가 있다)
+메모리는 tracemalloc 으로 재므로 시간에도 그만큼의 부하가 같이 들어간다.
+(기준값도 같은 방식으로 쟀으므로 비교에는 문제없다.)
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+HANA_SIZES = (100, 10_000, 100_000)
+DEFAULT_TOLERANCE = 0.25
+
+
+# ============================================
+# 측정 도우미
+# ============================================
+class Recorder:
+    def __init__(self):
+        self.steps = []
+
+    def run(self, name, action):
+        """action() 한 번(= 재실행 한 번)의 시간과 최대 메모리를 기록한다."""
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        at = action()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        if at is not None and len(at.exception):
+            raise RuntimeError(f"{name}: {at.exception[0].message}")
+        self.steps.append({"step": name, "ms": round(elapsed_ms, 2), "peak_mb": round(peak_mb, 2)})
+        return at
+
+    def summary(self, skip=("startup",)):
+        times = sorted(s["ms"] for s in self.steps if s["step"] not in skip)
+        return {
+            "reruns": len(times),
+            "median_ms": round(statistics.median(times), 2),
+            "p90_ms": round(times[min(len(times) - 1, int(0.9 * len(times)))], 2),
+            "max_ms": round(times[-1], 2),
+            "peak_mb": round(max(s["peak_mb"] for s in self.steps), 2),
+            "startup_ms": next((s["ms"] for s in self.steps if s["step"] == "startup"), None),
+        }
+
+
+def widget(widgets, label_prefix):
+    return next(w for w in widgets if w.label.startswith(label_prefix))
+
+
+# ============================================
+# 시나리오
+# ============================================
+def bench_kiosk(rec):
+    # 결제 단계에서 주문이 기록되므로 임시 폴더에 쓴다. (kiosk.orders import 전에 지정)
+    os.environ["KIOSK_DATA_DIR"] = tempfile.mkdtemp(prefix="kiosk-bench-")
+    from streamlit.testing.v1 import AppTest
+
+    from kiosk.catalog import load_catalog
+
+    catalog = load_catalog()
+    at = AppTest.from_file(str(ROOT / "name.py"), default_timeout=60)
+    rec.run("startup", at.run)
+    containers = widget(at.selectbox, "2)").options
+    for container in containers:
+        rec.run(f"container:{container}", lambda: widget(at.selectbox, "2)").set_value(container).run())
+        flavors = widget(at.multiselect, "3)")
+        # 용기의 최대 스쿱 수까지만 고른다. (넘으면 담기 버튼이 꺼져 있어 사용자가 갈 수 없는 경로)
+        max_scoops = catalog.containers[container].get("scoops", 1)
+        picked = flavors.options[: max(1, min(4, max_scoops, len(flavors.options)))]
+        for i in range(1, len(picked) + 1):
+            rec.run(f"flavors:{i}", lambda: widget(at.multiselect, "3)").set_value(picked[:i]).run())
+        for dine in widget(at.radio, "1)").options:
+            rec.run(f"dine:{dine}", lambda: widget(at.radio, "1)").set_value(dine).run())
+        rec.run("cart:add", lambda: widget(at.button, "🛒 장바구니에 담기").click().run())
+    # 담아 둔 구성을 한 번에 결제 (주문 하나, 트랜잭션 하나)
+    rec.run("pay:cart", lambda: widget(at.button, "결제 진행하기").click().run())
+    # 장바구니 없이 지금 고른 구성만 바로 결제
+    rec.run("quick:flavors", lambda: widget(at.multiselect, "3)").set_value(picked[:1]).run())
+    rec.run("pay:quick", lambda: widget(at.button, "결제 진행하기").click().run())
+
+
+def bench_mbti(rec, switches=40):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / "pages" / "01_MBTI국가.py"), default_timeout=60)
+    rec.run("startup", at.run)
+    countries = list(widget(at.sidebar.selectbox, "국가를 선택하세요").options)
+    rng = random.Random(0)
+    for country in rng.sample(countries, min(switches, len(countries))):
+        rec.run("country", lambda: widget(at.sidebar.selectbox, "국가를 선택하세요").set_value(country).run())
+
+
+def synthetic_items(n, seed=0):
+    rng = random.Random(seed)
+    names = ["충전기", "C타입 충전기", "갤럭시 버즈", "에어팟", "영어 교과서", "수학 문제집",
+             "하나카드", "텀블러", "우산", "필통", "체육복", "안경", "지갑", "학생증"]
+    places = ["매점 입구", "급식실", "A동 움파", "B305", "도서관", "체육관", "기숙사 로비"]
+    users = [f"25{i:03d} 학생{i}" for i in range(200)]
+    now = datetime.now()
+    items = [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "name": f"{rng.choice(names)} {i}",
+            "location": rng.choice(places),
+            "floor": rng.randint(0, 7),
+            "uploaded_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 170)),
+            "image_url": None,
+            "image_hash": None,
+            "uploader": rng.choice(users),
+            "resolved": False,
+        }
+        for i in range(n)
+    ]
+    counts = {}
+    for item in items:
+        counts[item["uploader"]] = counts.get(item["uploader"], 0) + 1
+    return items, {u: {"upload_count": c, "notification_on": True} for u, c in counts.items()}
+
+
+def bench_hana(rec, n):
+    # 저장소 경로는 hana.store import 시점에 정해지므로, 앱을 불러오기 전에 바꿔 둔다.
+    data_dir = tempfile.mkdtemp(prefix="hana-bench-")
+    os.environ["HANA_DATA_DIR"] = data_dir
+    from hana.store import DB_PATH, ItemStore
+    from streamlit.testing.v1 import AppTest
+
+    store = ItemStore(DB_PATH)
+    store.seed_if_empty(*synthetic_items(n))
+    store.close()
+
+    at = AppTest.from_file(str(ROOT / "하나줍줍.py"), default_timeout=300)
+    rec.run("startup", at.run)
+
+    def select_view(label):
+        return lambda: at.radio(key="active_view").set_value(label).run()
+
+    rec.run("view:search", select_view("🔍 전체/검색 목록"))
+    for query in ["충", "충전", "충전기", "C타입", "버즈", "B305", "학생증 12", ""]:
+        rec.run(f"search:{query}", lambda: widget(at.text_input, "검색어 입력").set_value(query).run())
+    rec.run("floor:3", lambda: widget(at.selectbox, "층수").set_value(3).run())
+    rec.run("page:2", lambda: widget(at.number_input, "페이지").set_value(2).run())
+
+    rec.run("view:upload", select_view("📝 업로드"))
+    for i in range(5):
+        def upload():
+            widget(at.text_input, "📦 물건 이름").set_value(f"벤치마크 물건 {i}")
+            widget(at.text_input, "📍 발견 장소").set_value("급식실")
+            return widget(at.button, "등록하기").click().run()
+        rec.run("upload", upload)
+
+    for label in ["🏠 홈 (최근 분실물)", "⏳ 오래된 분실물", "🏆 랭킹", "🔔 알림/설정"]:
+        rec.run(f"view:{label}", select_view(label))
+
+
+def run_child(scenario):
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+    os.environ.setdefault("APP_PERF", "0")
+    rec = Recorder()
+    tracemalloc.start()
+    if scenario == "kiosk":
+        bench_kiosk(rec)
+    elif scenario == "mbti":
+        bench_mbti(rec)
+    elif scenario.startswith("hana-"):
+        bench_hana(rec, int(scenario.split("-", 1)[1]))
+    else:
+        raise SystemExit(f"unknown scenario: {scenario}")
+    tracemalloc.stop()
+    print(json.dumps({"summary": rec.summary(), "steps": rec.steps}, ensure_ascii=False))
+
+
+# ============================================
+# 실행 / 기준값 비교
+# ============================================
+def all_scenarios():
+    return ["kiosk", "mbti", *(f"hana-{n}" for n in HANA_SIZES)]
+
+
+def run_scenario(scenario):
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.apptest_bench", "--child", scenario],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{scenario} failed:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for scenario, result in results.items():
+        base = baseline.get(scenario)
+        if base is None:
+            print(f"  {scenario}: 기준값 없음 (MISSING)")
+            regressions.append((scenario, "baseline"))
+            continue
+        for metric in ("median_ms", "p90_ms", "peak_mb"):
+            now, before = result["summary"][metric], base[metric]
+            change = (now - before) / before if before else 0.0
+            flag = "REGRESSION" if change > tolerance else "ok"
+            print(f"  {scenario:12s} {metric:10s} {before:10.2f} -> {now:10.2f} ({change:+.0%}) {flag}")
+            if change > tolerance:
+                regressions.append((scenario, metric))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", help="실행할 시나리오 (기본: 전부)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", "--write-baseline", dest="update_baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--output", type=Path, help="전체 결과(JSON)를 저장할 경로")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.child)
+        return 0
+
+    # 비교할 기준값이 없으면 돌려 보기 전에 실패로 끝낸다.
+    if not args.update_baseline and not args.baseline.exists():
+        print(f"기준값 파일이 없습니다: {args.baseline}\n--write-baseline 으로 먼저 만들어 주세요. (benchmarks/README.md 참고)")
+        return 1
+
+    results = {}
+    for scenario in args.only or all_scenarios():
+        print(f"running {scenario} ...", flush=True)
+        results[scenario] = run_scenario(scenario)
+        s = results[scenario]["summary"]
+        print(f"  {s['reruns']} reruns, median {s['median_ms']} ms, p90 {s['p90_ms']} ms, "
+              f"peak {s['peak_mb']} MB, startup {s['startup_ms']} ms")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if args.update_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+        baseline.update({name: r["summary"] for name, r in results.items()})
+        args.baseline.write_text(json.dumps(baseline, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline saved: {args.baseline}")
+        return 0
+
+    print("baseline comparison:")
+    regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""MBTI 데이터 콜드 스타트 비교: CSV 파싱 vs 이진 스냅샷 메모리 매핑.
+
+새 프로세스를 띄워 각 방식으로 한 번 불러오고, 걸린 시간(import 포함)과
+최대 RSS 를 잰다. 워커 하나가 처음 뜰 때의 비용과 같다.
+
+메모리는 자식 프로세스 안에서 /proc/self/status 의 VmHWM(최대 RSS)/VmRSS 로 읽는다.
+ru_maxrss 는 fork/exec 를 넘어 부모 값을 이어받으므로 쓰지 않는다. (Linux 전용)
+아무것도 불러오지 않는 빈 인터프리터도 같은 방법으로 재서, 그 차이를 보여 준다.
+스냅샷 만들기(pandas 사용)도 별도 프로세스에서 하므로 이 스크립트는 pandas 를 불러오지 않는다.
+
+    python -m benchmarks.mbti_snapshot --repeat 7
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CSV_PATH = ROOT / "countriesMBTI_16types.csv"  # mbti.snapshot.CSV_PATH (여기서는 불러오지 않음)
+MODES = ("empty", "csv", "snapshot")
+
+CHILD = r"""
+import json, sys, time
+started = time.perf_counter()
+mode, csv_path, snapshot_dir = sys.argv[1:4]
+if mode == "prepare":
+    from mbti import snapshot
+    snapshot.write_snapshot(snapshot.read_csv_matrix(csv_path), csv_path, snapshot_dir)
+elif mode == "csv":
+    from mbti import snapshot
+    matrix = snapshot.read_csv_matrix(csv_path)
+elif mode == "snapshot":
+    from mbti import snapshot
+    matrix = snapshot.read_snapshot(csv_path, snapshot_dir)
+    assert matrix is not None, "stale snapshot"
+if mode in ("csv", "snapshot"):
+    total = float(matrix.values.sum())  # 실제로 값을 한 번 다 읽는다
+elapsed_ms = (time.perf_counter() - started) * 1000
+status = {}
+with open("/proc/self/status") as f:
+    for line in f:
+        key, _, value = line.partition(":")
+        if key in ("VmHWM", "VmRSS"):
+            status[key] = int(value.split()[0]) / 1024  # kB -> MB
+print(json.dumps({
+    "ms": elapsed_ms,
+    "hwm_mb": status["VmHWM"],
+    "rss_mb": status["VmRSS"],
+    "pandas_loaded": "pandas" in sys.modules,
+}))
+"""
+
+
+def run_child(mode, csv_path, snapshot_dir):
+    proc = subprocess.run(
+        [sys.executable, "-c", CHILD, mode, str(csv_path), str(snapshot_dir)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout)
+
+
+def measure(mode, csv_path, snapshot_dir, repeat):
+    runs = [run_child(mode, csv_path, snapshot_dir) for _ in range(repeat)]
+    return {
+        "median_ms": statistics.median(r["ms"] for r in runs),
+        "median_hwm_mb": statistics.median(r["hwm_mb"] for r in runs),
+        "median_rss_mb": statistics.median(r["rss_mb"] for r in runs),
+        "pandas_loaded": runs[0]["pandas_loaded"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", type=Path, default=CSV_PATH)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run_child("prepare", args.csv, tmp)
+        results = {mode: measure(mode, args.csv, tmp, args.repeat) for mode in MODES}
+
+    empty = results["empty"]
+    print(f"empty interpreter: max RSS {empty['median_hwm_mb']:.1f} MB (아래는 이 값과의 차이)")
+    for mode in ("csv", "snapshot"):
+        r = results[mode]
+        print(f"{mode:9s} {r['median_ms']:8.1f} ms"
+              f"   max RSS +{r['median_hwm_mb'] - empty['median_hwm_mb']:6.1f} MB"
+              f"   RSS +{r['median_rss_mb'] - empty['median_rss_mb']:6.1f} MB"
+              f"   pandas imported: {r['pandas_loaded']}")
+    csv, snap = results["csv"], results["snapshot"]
+    print(f"speedup x{csv['median_ms'] / snap['median_ms']:.1f}, "
+          f"max RSS -{csv['median_hwm_mb'] - snap['median_hwm_mb']:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""주문 기록 부하 테스트.
+
+여러 키오스크(스레드, 또는 --processes 로 프로세스)가 동시에 결제할 때
+초당 몇 건을 기록할 수 있는지 재고, 주문 번호가 빠짐없이 1..N 으로
+이어지는지 확인한다. --max-batch 1 로 돌리면 그룹 커밋 없이 잰 값과 비교할 수 있다.
+
+    python -m benchmarks.order_load --kiosks 32 --orders 300
+    python -m benchmarks.order_load --kiosks 32 --orders 300 --max-batch 1
+    python -m benchmarks.order_load --processes 4 --kiosks 8 --orders 300
+"""
+import argparse
+import multiprocessing
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from kiosk.orders import OrderJournal, make_order
+
+LINE = {"container": "더블컵 (2스쿱)", "flavors": ["엄마는외계인", "쿨민트"], "subtotal": 6200, "tax": 620, "total": 6820}
+
+
+def run_kiosks(path, kiosks, orders, max_batch, tag=""):
+    journal = OrderJournal(path, max_batch=max_batch)
+    try:
+        def kiosk(k):
+            return [
+                journal.place(make_order([LINE], "매장식사 (Eat in)", "카드 결제", kiosk=f"{tag}k{k}"))
+                for _ in range(orders)
+            ]
+
+        with ThreadPoolExecutor(max_workers=kiosks) as pool:
+            return [n for numbers in pool.map(kiosk, range(kiosks)) for n in numbers]
+    finally:
+        journal.close()
+
+
+def _process_main(args):
+    return run_kiosks(*args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kiosks", type=int, default=32, help="프로세스당 동시 키오스크 수")
+    parser.add_argument("--orders", type=int, default=300, help="키오스크당 주문 수")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--max-batch", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "orders.db"
+        OrderJournal(path).close()  # 스키마를 먼저 만들어 둔다
+        started = time.perf_counter()
+        if args.processes == 1:
+            numbers = run_kiosks(path, args.kiosks, args.orders, args.max_batch)
+        else:
+            jobs = [(path, args.kiosks, args.orders, args.max_batch, f"p{p}-") for p in range(args.processes)]
+            with multiprocessing.Pool(args.processes) as pool:
+                numbers = [n for chunk in pool.map(_process_main, jobs) for n in chunk]
+        elapsed = time.perf_counter() - started
+
+        journal = OrderJournal(path)
+        stored = journal.count()
+        journal.close()
+
+    expected = args.processes * args.kiosks * args.orders
+    contiguous = sorted(numbers) == list(range(1, expected + 1))
+    print(f"{expected:,} orders from {args.processes * args.kiosks} kiosks in {elapsed:.2f}s "
+          f"-> {expected / elapsed:,.0f} orders/s (max_batch={args.max_batch})")
+    print(f"stored {stored:,}, order numbers 1..{expected:,} contiguous: {contiguous}")
+    return 0 if contiguous and stored == expected else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
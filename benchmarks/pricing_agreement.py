@@ -0,0 +1,99 @@
+"""가격 계산 일치 확인 + 배치 처리량.
+
+kiosk.pricing.quote() (주문 하나) 와 price_batch() (배열 연산) 가 모든 경우에
+같은 소계/세금/총액/가격 상세를 내는지 확인한다.
+  1) 모든 용기 x 맛 0~8개 x 매장/포장 조합 전부
+  2) 무작위 주문 --orders 건
+그다음 같은 주문을 두 방식으로 계산한 시간을 비교한다.
+
+    python -m benchmarks.pricing_agreement --orders 200000
+"""
+import argparse
+import random
+import sys
+import time
+
+import pandas as pd
+
+from kiosk.catalog import load_catalog
+from kiosk.pricing import batch_breakdown, price_batch, quote
+
+CONTAINERS = load_catalog().containers
+
+DINE_CHOICES = ("매장식사 (Eat in)", "포장 (Takeout)")
+
+
+def grid_orders(max_flavors=8):
+    return pd.DataFrame(
+        [
+            {"container": c, "flavor_count": n, "dine_choice": d}
+            for c in CONTAINERS for n in range(max_flavors + 1) for d in DINE_CHOICES
+        ]
+    )
+
+
+def random_orders(n, seed=0):
+    rng = random.Random(seed)
+    names = list(CONTAINERS)
+    return pd.DataFrame(
+        {
+            "container": [rng.choice(names) for _ in range(n)],
+            "flavor_count": [rng.randint(0, 8) for _ in range(n)],
+            "dine_choice": [rng.choice(DINE_CHOICES) for _ in range(n)],
+        }
+    )
+
+
+def single_quotes(orders):
+    return [
+        quote(CONTAINERS[c], n, d)
+        for c, n, d in zip(orders["container"], orders["flavor_count"], orders["dine_choice"])
+    ]
+
+
+def check(orders):
+    """일치하지 않는 행 번호 목록."""
+    batch = price_batch(orders, CONTAINERS)
+    mismatches = []
+    for i, (single, (_, row)) in enumerate(zip(single_quotes(orders), batch.iterrows())):
+        same = (
+            single["subtotal"] == row["subtotal"]
+            and single["tax"] == row["tax"]
+            and single["total"] == row["total"]
+            and single["tax_rate"] == row["tax_rate"]
+            and single["breakdown"] == batch_breakdown(row)
+        )
+        if not same:
+            mismatches.append(i)
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--check-rows", type=int, default=20_000, help="무작위 주문 중 한 행씩 비교할 개수")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name, orders in (("grid", grid_orders()), ("random", random_orders(args.check_rows))):
+        mismatches = check(orders)
+        print(f"{name:6s} {len(orders):>8,} orders  mismatches: {len(mismatches)}")
+        for i in mismatches[:5]:
+            print("   ", orders.iloc[i].to_dict())
+        failed |= bool(mismatches)
+
+    orders = random_orders(args.orders, seed=1)
+    started = time.perf_counter()
+    singles = single_quotes(orders)
+    single_s = time.perf_counter() - started
+    started = time.perf_counter()
+    batch = price_batch(orders, CONTAINERS)
+    batch_s = time.perf_counter() - started
+    assert sum(q["total"] for q in singles) == int(batch["total"].sum())
+    print(f"single {args.orders / single_s:>12,.0f} orders/s")
+    print(f"batch  {args.orders / batch_s:>12,.0f} orders/s  (x{single_s / batch_s:.0f})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""외부 이미지 캐시(hana.remote_images) 오프라인 확인.
+
+localhost 에 http.server 로 가짜 이미지 서버를 띄우고 RemoteImageCache 를 돌려 본다.
+  1) 같은 URL 은 한 번만 받는다 (두 번째부터는 디스크 캐시)
+  2) 용량 상한을 넘으면 가장 오래 안 쓴 파일부터 지운다 (LRU, 최근에 쓴 것은 남음)
+  3) 다시 만들어도 디스크에 남은 파일과 용량을 그대로 이어받는다
+  4) 응답이 늦으면 timeout 안에 자리 표시 이미지로 넘어가고, retry_after 동안 다시 받지 않는다
+  5) 404 / 이미지가 아닌 응답 / placehold.co 주소는 자리 표시 이미지로 처리한다
+  6) wait 없이 부르면 늦은 응답을 기다리지 않고 바로 자리 표시 이미지를 돌려주고,
+     뒤에서 받은 이미지는 다음 호출부터 나온다
+
+1)~5) 는 결과를 보려고 wait=True 로 부른다.
+
+    python -m benchmarks.remote_image_cache
+"""
+import argparse
+import functools
+import io
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from PIL import Image
+
+from hana.remote_images import BUNDLED_IMAGES, NO_IMAGE_URL, RemoteImageCache, fetch_url
+
+SLOW_SECONDS = 2.0
+
+
+def sample_png(width=800, height=500):
+    # 무늬가 있어야 JPEG 크기가 너무 작아지지 않는다.
+    img = Image.effect_noise((width, height), 64).convert("RGB")
+    out = io.BytesIO()
+    img.save(out, format="PNG")
+    return out.getvalue()
+
+
+class StandIn:
+    """/img/<n> 은 같은 PNG, /slow* 는 늦게 응답, /text 는 이미지가 아님, 나머지는 404."""
+
+    def __init__(self):
+        self.png = sample_png()
+        self.requests = Counter()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.requests[self.path] += 1
+                if self.path.startswith("/img/"):
+                    self._send(200, "image/png", stand_in.png)
+                elif self.path.startswith("/slow"):
+                    time.sleep(SLOW_SECONDS)
+                    self._send(200, "image/png", stand_in.png)
+                elif self.path == "/text":
+                    self._send(200, "text/plain", b"not an image")
+                else:
+                    self._send(404, "text/plain", b"missing")
+
+            def _send(self, status, content_type, body):
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", content_type)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # 클라이언트가 timeout 으로 먼저 끊은 경우
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server.server_address[1]}{path}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def check(stand_in, root, width, timeout):
+    errors = []
+    fetch = functools.partial(fetch_url, timeout=timeout)
+
+    # 1) 한 번만 받기
+    cache = RemoteImageCache(root / "hit", fetch=fetch)
+    first = cache.get(stand_in.url("/img/0"), width, wait=True)
+    second = cache.get(stand_in.url("/img/0"), width, wait=True)
+    if first != second or not Path(first).exists() or first == cache.fallback:
+        errors.append(f"hit: expected the same cached file, got {first} / {second}")
+    if stand_in.requests["/img/0"] != 1:
+        errors.append(f"hit: /img/0 fetched {stand_in.requests['/img/0']} times")
+    size = Path(first).stat().st_size
+
+    # 2) 용량 상한 + LRU (모든 /img/<n> 이 같은 그림이라 캐시 파일 크기도 같다)
+    cap = 3 * size
+    cache = RemoteImageCache(root / "lru", max_bytes=cap, fetch=fetch)
+    paths = {n: cache.get(stand_in.url(f"/img/lru-{n}"), width, wait=True) for n in range(3)}
+    cache.get(stand_in.url("/img/lru-0"), width, wait=True)  # 0번을 최근에 쓴 것으로
+    paths[3] = cache.get(stand_in.url("/img/lru-3"), width, wait=True)
+    if cache.total_bytes > cap:
+        errors.append(f"cap: {cache.total_bytes} bytes > {cap}")
+    on_disk = sum(p.stat().st_size for p in (root / "lru").glob("*.jpg"))
+    if on_disk != cache.total_bytes or len(list((root / "lru").glob("*.jpg"))) != len(cache):
+        errors.append(f"cap: disk {on_disk} bytes vs tracked {cache.total_bytes} bytes")
+    if paths[1].exists():
+        errors.append("lru: least recently used entry (1) was not evicted")
+    if not (paths[0].exists() and paths[2].exists() and paths[3].exists()):
+        errors.append("lru: a recently used entry was evicted")
+
+    # 3) 다시 만들어도 이어받기
+    reopened = RemoteImageCache(root / "lru", max_bytes=cap, fetch=fetch)
+    if len(reopened) != len(cache) or reopened.total_bytes != cache.total_bytes:
+        errors.append(f"reload: {len(reopened)} entries / {reopened.total_bytes} bytes, "
+                      f"expected {len(cache)} / {cache.total_bytes}")
+
+    # 4) timeout -> 자리 표시 이미지, retry_after 동안은 다시 받지 않음
+    cache = RemoteImageCache(root / "slow", fetch=fetch, retry_after=60)
+    started = time.perf_counter()
+    result = cache.get(stand_in.url("/slow"), width, wait=True)
+    elapsed = time.perf_counter() - started
+    if result != cache.fallback:
+        errors.append(f"timeout: expected fallback, got {result}")
+    if elapsed >= SLOW_SECONDS:
+        errors.append(f"timeout: waited {elapsed:.2f}s (timeout {timeout}s)")
+    cache.get(stand_in.url("/slow"), width, wait=True)
+    if stand_in.requests["/slow"] != 1:
+        errors.append(f"timeout: /slow retried {stand_in.requests['/slow'] - 1} times within retry_after")
+
+    # 5) 실패 응답 / 번들 이미지
+    cache = RemoteImageCache(root / "fallback", fetch=fetch)
+    for path in ("/missing", "/text"):
+        result = cache.get(stand_in.url(path), width, wait=True)
+        if result != cache.fallback:
+            errors.append(f"fallback: {path} returned {result}")
+    before = sum(stand_in.requests.values())
+    if cache.get(NO_IMAGE_URL, width) != BUNDLED_IMAGES[NO_IMAGE_URL]:
+        errors.append("bundled: placehold.co URL was not mapped to the bundled asset")
+    if sum(stand_in.requests.values()) != before or len(cache) != 0:
+        errors.append("bundled: placehold.co URL should not be fetched or cached")
+
+    # 6) 화면 쪽은 기다리지 않는다 (서버는 SLOW_SECONDS 뒤에 응답하고 timeout 은 그보다 길게)
+    cache = RemoteImageCache(root / "async", fetch=functools.partial(fetch_url, timeout=SLOW_SECONDS * 2))
+    url = stand_in.url("/slow?async")
+    started = time.perf_counter()
+    results = [cache.get(url, width) for _ in range(3)]
+    render_s = time.perf_counter() - started
+    if any(result != cache.fallback for result in results):
+        errors.append(f"async: expected the placeholder while fetching, got {results}")
+    if render_s >= SLOW_SECONDS / 2:
+        errors.append(f"async: get() blocked for {render_s:.2f}s")
+    cache.wait_idle()
+    filled = cache.get(url, width)
+    if filled == cache.fallback or not Path(filled).exists():
+        errors.append(f"async: background fetch did not fill the cache ({filled})")
+    if stand_in.requests["/slow?async"] != 1:
+        errors.append(f"async: fetched {stand_in.requests['/slow?async']} times while pending")
+    return errors, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    with StandIn() as stand_in, tempfile.TemporaryDirectory() as tmp:
+        errors, timeout_s = check(stand_in, Path(tmp), args.width, args.timeout)
+        print(f"requests: {dict(stand_in.requests)}")
+        print(f"timeout fallback after {timeout_s:.2f}s")
+    for error in errors:
+        print("FAIL", error)
+    print("ok" if not errors else f"{len(errors)} failure(s)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""동시 업로드 스트레스 테스트.
+
+스레드 풀에서 수천 건의 업로드를 한꺼번에 보내고, 업로드 횟수/항목 수/
+인덱스 크기/알림 수가 하나도 빠지지 않았는지 확인한다.
+
+    python -m benchmarks.stress_uploads --uploads 5000 --threads 32
+"""
+import argparse
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from hana.leaderboard import Leaderboard
+from hana.notifications import NotificationLog
+from hana.search import SearchIndex
+from hana.state import SharedState
+from hana.store import ItemStore
+from hana.timeline import TimeIndex
+
+
+def run(uploads, threads, users):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ItemStore(Path(tmp) / "stress.db", pool_size=min(threads, 8))
+        state = SharedState(
+            store, SearchIndex(), TimeIndex(), NotificationLog(retention=uploads), Leaderboard()
+        )
+        names = [f"2{i:04d} 학생{i}" for i in range(users)]
+        expected = Counter(names[i % users] for i in range(uploads))
+
+        def upload(i):
+            state.record_upload({
+                "id": str(uuid.uuid4()),
+                "name": f"분실물 {i}",
+                "location": "급식실",
+                "floor": i % 8,
+                "uploaded_at": datetime.now(),
+                "image_url": None,
+                "image_hash": None,
+                "uploader": names[i % users],
+                "resolved": False,
+            })
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(upload, range(uploads)))
+        elapsed = time.perf_counter() - started
+
+        counts = {name: info["upload_count"] for name, info in state.all_user_stats().items()}
+        errors = []
+        if counts != dict(expected):
+            lost = sum(expected.values()) - sum(counts.values())
+            errors.append(f"upload_count mismatch (lost {lost})")
+        if store.count() != uploads:
+            errors.append(f"items: {store.count()} != {uploads}")
+        if len(state.search_index) != uploads or len(state.timeline) != uploads:
+            errors.append("in-memory indexes out of sync")
+        if {name: count for _, name, count in state.leaderboard.top(users)} != dict(expected):
+            errors.append("leaderboard out of sync")
+        if len(state.notifications) != uploads:
+            errors.append(f"notifications: {len(state.notifications)} != {uploads}")
+        store.close()
+
+    print(f"{uploads} uploads / {threads} threads: {elapsed:.2f}s ({uploads / elapsed:,.0f} uploads/s)")
+    for error in errors:
+        print("FAIL:", error)
+    return not errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--users", type=int, default=20)
+    args = parser.parse_args(argv)
+    return 0 if run(args.uploads, args.threads, args.users) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
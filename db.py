@@ -0,0 +1,69 @@
+"""SQLite 공용 도구 — 하나줍줍(hana.store) / 키오스크(kiosk.orders) 공용.
+
+  - ConnectionPool: 스레드 간에 돌려 쓰는 고정 크기 연결 풀 (WAL)
+  - migrate(pool, migrations): PRAGMA user_version 기준으로 아직 적용하지 않은
+    스키마 변경만 차례로 적용한다. 변경 목록은 항상 뒤에 추가만 한다.
+"""
+import queue
+import sqlite3
+from contextlib import contextmanager
+
+
+class ConnectionPool:
+    """스레드 간에 돌려 쓰는 고정 크기 SQLite 연결 풀.
+
+    Streamlit 은 세션마다 스레드를 따로 쓰므로, 연결을 매번 새로 열지 않고
+    미리 만들어 둔 연결을 빌려주고 돌려받는다.
+    """
+
+    def __init__(self, path, size=4):
+        self.path = str(path)
+        self._idle = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            self._idle.put(self._connect())
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        # 쓰기 잠금을 처음부터 잡는다(BEGIN IMMEDIATE). 읽기 -> 쓰기로 잠금을 올리다가
+        # 다른 세션과 부딪혀 바로 "database is locked" 가 나는 일을 막기 위해서다.
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def migrate(pool, migrations):
+    """migrations[user_version:] 을 한 트랜잭션으로 적용한다. (PRAGMA user_version = 적용된 개수)"""
+    with pool.transaction() as conn:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for i, script in enumerate(migrations[version:], start=version + 1):
+            for statement in script.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {i}")
@@ -0,0 +1 @@
+"""하나줍줍(하나고 온라인 분실물함) 앱에서 쓰는 저장소/인덱스 모듈 모음."""
@@ -0,0 +1,118 @@
+"""업로드 이미지 저장소 (SHA-256 내용 주소 방식).
+
+원본은 한 번만 파일로 저장하고, 업로드 시점에 카드 크기(220px / 400px)
+썸네일을 미리 만들어 둔다. 같은 사진을 다시 올리면 같은 해시가 나오므로
+파일을 새로 쓰지 않는다.
+
+    images/
+      originals/ab/abcdef...      (원본 바이트 그대로)
+      w220/ab/abcdef....jpg       (가로 220px 썸네일)
+      w400/ab/abcdef....jpg       (가로 400px 썸네일)
+
+이미지가 아니거나, 잘렸거나, 픽셀 수가 지나치게 큰(압축 폭탄) 파일은
+InvalidImage 로 거절하고 아무 것도 저장하지 않는다.
+"""
+import base64
+import hashlib
+import io
+import os
+import tempfile
+from pathlib import Path
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from hana.store import DATA_DIR
+
+IMAGE_DIR = DATA_DIR / "images"
+THUMB_WIDTHS = (220, 400)
+
+
+class InvalidImage(ValueError):
+    pass
+
+
+def write_atomic(path, data):
+    # 다른 세션이 반쯤 쓰인 파일을 읽지 않도록 임시 파일에 쓰고 이름만 바꾼다.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def make_thumbnail(data, width):
+    """이미지 바이트를 가로 width 픽셀 이하의 JPEG 바이트로 줄인다. (확대는 하지 않음)"""
+    with Image.open(io.BytesIO(data)) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.mode in ("RGBA", "LA", "P"):
+            img = img.convert("RGBA")
+            background = Image.new("RGB", img.size, (255, 255, 255))
+            background.paste(img, mask=img.split()[-1])
+            img = background
+        elif img.mode != "RGB":
+            img = img.convert("RGB")
+        if img.width > width:
+            height = max(1, round(img.height * width / img.width))
+            img = img.resize((width, height), Image.LANCZOS)
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=85, optimize=True)
+        return out.getvalue()
+
+
+class ImageStore:
+    def __init__(self, root=IMAGE_DIR, widths=THUMB_WIDTHS):
+        self.root = Path(root)
+        self.widths = tuple(sorted(widths))
+
+    def original_path(self, digest):
+        return self.root / "originals" / digest[:2] / digest
+
+    def thumbnail_path(self, digest, width):
+        return self.root / f"w{width}" / digest[:2] / f"{digest}.jpg"
+
+    def put(self, data):
+        """이미지를 저장하고 SHA-256 해시를 돌려준다. 이미 있으면 다시 쓰지 않는다."""
+        digest = hashlib.sha256(data).hexdigest()
+        original = self.original_path(digest)
+        if not original.exists():
+            try:
+                thumbnails = [(width, make_thumbnail(data, width)) for width in self.widths]
+            except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError, ValueError) as e:
+                # PIL 은 깨진 파일 종류에 따라 여러 예외를 낸다. (SyntaxError 는 일부 포맷 파서)
+                raise InvalidImage(str(e)) from e
+            # 썸네일을 먼저 써야 원본 존재 == 썸네일까지 준비 완료가 된다.
+            for width, thumbnail in thumbnails:
+                write_atomic(self.thumbnail_path(digest, width), thumbnail)
+            write_atomic(original, data)
+        return digest
+
+    def exists(self, digest):
+        return self.original_path(digest).exists()
+
+    def best_width(self, width=None):
+        # 요청 폭 이상인 가장 작은 썸네일. 폭을 모르면(컬럼 너비) 가장 큰 것.
+        if width is None:
+            return self.widths[-1]
+        for w in self.widths:
+            if w >= width:
+                return w
+        return self.widths[-1]
+
+    def thumbnail(self, digest, width=None):
+        """화면에 그릴 썸네일 파일 경로."""
+        return self.thumbnail_path(digest, self.best_width(width))
+
+
+def migrate_inline_images(item_store, image_store):
+    """예전 버전이 image_data(base64)로 저장한 항목을 파일 저장소로 옮긴다."""
+    for item_id, image_b64 in item_store.inline_images():
+        try:
+            digest = image_store.put(base64.b64decode(image_b64))
+        except InvalidImage:
+            continue  # 읽을 수 없는 예전 이미지는 그대로 둔다. (다음 실행 때도 건너뜀)
+        item_store.set_image_hash(item_id, digest)
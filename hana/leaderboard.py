@@ -0,0 +1,114 @@
+"""업로드 랭킹 (증분 갱신).
+
+전체 랭킹은 (-업로드 횟수, 이름) 키의 SortedList 로 항상 정렬된 상태를 유지한다.
+업로드 한 건은 키 하나를 빼고 넣는 O(log n) 이고,
+상위 K명은 앞에서 K개, "내 순위"는 bisect 한 번이다.
+
+이번 주 / 이번 달 랭킹도 기간마다 (합계, SortedList) 를 따로 들고 있고,
+업로드 한 건은 그 날짜가 들어가는 기간에만 같은 방식으로 더한다. (조회 때 정렬 없음)
+날짜별 카운터(day -> Counter)는 새 주/새 달로 넘어가 기간을 다시 만들 때만 합치고,
+가장 긴 기간보다 오래된 날짜는 지워서 계속 늘어나지 않게 한다.
+"""
+import threading
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+from sortedcontainers import SortedList
+
+WINDOWS = ("week", "month")
+
+
+def window_start(window, today=None):
+    """"week" -> 이번 주 월요일, "month" -> 이번 달 1일, 그 외(전체) -> None"""
+    today = today or date.today()
+    if window == "week":
+        return today - timedelta(days=today.weekday())
+    if window == "month":
+        return today.replace(day=1)
+    return None
+
+
+def _bump(counts, ranked, name, n):
+    old = counts.get(name)
+    if old is not None:
+        ranked.remove((-old, name))
+    counts[name] = (old or 0) + n
+    ranked.add((-counts[name], name))
+
+
+class Leaderboard:
+    def __init__(self, counts=None, daily=(), windows=WINDOWS):
+        """counts: {이름: 전체 업로드 횟수}, daily: (날짜, 이름, 횟수) 목록"""
+        self._lock = threading.Lock()
+        self._counts = dict(counts or {})
+        self._ranked = SortedList((-count, name) for name, count in self._counts.items())
+        self._daily = defaultdict(Counter)
+        for day, name, count in daily:
+            self._daily[day][name] += count
+        self._windows = dict.fromkeys(windows)  # 기간 -> {"start", "counts", "ranked"}
+
+    def __len__(self):
+        return len(self._ranked)
+
+    def increment(self, name, day, n=1, today=None):
+        with self._lock:
+            _bump(self._counts, self._ranked, name, n)
+            new_day = day not in self._daily
+            self._daily[day][name] += n
+            for window in self._windows.values():
+                if window is not None and day >= window["start"]:
+                    _bump(window["counts"], window["ranked"], name, n)
+            if new_day:
+                self._prune(today)
+
+    # ---------- 전체 랭킹 ----------
+    def top(self, k):
+        """[(순위, 이름, 횟수)] 상위 k명."""
+        with self._lock:
+            return [(i + 1, name, -neg) for i, (neg, name) in enumerate(self._ranked[:k])]
+
+    def rank(self, name):
+        """(순위, 횟수). 업로드 기록이 없으면 None."""
+        with self._lock:
+            count = self._counts.get(name)
+            if count is None:
+                return None
+            return self._ranked.bisect_left((-count, name)) + 1, count
+
+    # ---------- 기간별 랭킹 ----------
+    def _window(self, window, today):
+        # 잠금을 잡은 상태에서 호출된다. 처음 보거나 새 주/새 달로 넘어갔을 때만 다시 만든다.
+        start = window_start(window, today)
+        current = self._windows[window]
+        if current is None or current["start"] != start:
+            totals = Counter()
+            for day, counter in self._daily.items():
+                if day >= start:
+                    totals.update(counter)
+            current = {
+                "start": start,
+                "counts": dict(totals),
+                "ranked": SortedList((-count, name) for name, count in totals.items()),
+            }
+            self._windows[window] = current
+            self._prune(today)
+        return current
+
+    def _prune(self, today):
+        # 잠금을 잡은 상태에서 호출된다. 가장 긴 기간보다 오래된 날짜는 다시 쓸 일이 없다.
+        oldest = min(window_start(window, today) for window in self._windows)
+        for day in [day for day in self._daily if day < oldest]:
+            del self._daily[day]
+
+    def top_window(self, window, k, today=None):
+        with self._lock:
+            ranked = self._window(window, today)["ranked"]
+            return [(i + 1, name, -neg) for i, (neg, name) in enumerate(ranked[:k])]
+
+    def rank_window(self, window, name, today=None):
+        with self._lock:
+            current = self._window(window, today)
+            count = current["counts"].get(name)
+            if count is None:
+                return None
+            return current["ranked"].bisect_left((-count, name)) + 1, count
@@ -0,0 +1,102 @@
+"""크기가 정해진 알림 로그 + 사용자별 안 읽은 알림.
+
+알림은 deque(maxlen=retention) 에 일련번호(seq)와 함께 쌓이고, 오래된 것은
+자동으로 밀려난다. 추가는 O(1) 이다. (예전 list.insert(0, ...) 는 O(n))
+
+사용자별 "안 읽은 알림 큐"는 알림을 사용자마다 복사하지 않고,
+구독자마다 "마지막으로 읽은 seq" 하나만 들고 있는 방식으로 만든다.
+그래서 구독자가 수백 명이어도 알림 하나를 올리는 비용은 그대로다.
+알림을 끈 사용자는 커서가 없으므로 아무 것도 받지 않고,
+다시 켜면 그 시점 이후의 알림부터 받는다.
+
+로그는 모든 세션이 같이 보므로 "지우기"도 사용자별이다. 공용 deque 는 그대로 두고
+그 사용자에게 "이 seq 까지는 숨김" 표시만 남긴다.
+"""
+import threading
+from collections import deque
+from datetime import datetime
+
+DEFAULT_RETENTION = 500
+
+
+class NotificationLog:
+    def __init__(self, retention=DEFAULT_RETENTION):
+        self._lock = threading.Lock()
+        self._entries = deque(maxlen=retention)  # {"seq", "time", "message"}
+        self._last_seq = 0
+        self._cursors = {}  # 구독자 -> 마지막으로 읽은 seq
+        self._hidden = {}  # 사용자 -> 이 seq 까지는 내역에서 숨김 ("지우기")
+
+    def __len__(self):
+        return len(self._entries)
+
+    # ---------- 쓰기 ----------
+    def publish(self, message, time=None):
+        with self._lock:
+            self._last_seq += 1
+            self._entries.append(
+                {"seq": self._last_seq, "time": time or datetime.now(), "message": message}
+            )
+            return self._last_seq
+
+    # ---------- 구독 ----------
+    def subscribe(self, user):
+        # 이미 구독 중이면 커서를 그대로 둔다. (여러 세션이 불러도 안전)
+        with self._lock:
+            self._cursors.setdefault(user, self._last_seq)
+
+    def unsubscribe(self, user):
+        with self._lock:
+            self._cursors.pop(user, None)
+
+    def is_subscribed(self, user):
+        return user in self._cursors
+
+    def mark_read(self, user):
+        with self._lock:
+            if user in self._cursors:
+                self._cursors[user] = self._last_seq
+
+    def clear_for(self, user):
+        """user 에게만 지금까지의 알림을 지운다. (다른 사용자의 내역은 그대로)"""
+        with self._lock:
+            self._hidden[user] = self._last_seq
+            if user in self._cursors:
+                self._cursors[user] = self._last_seq
+
+    # ---------- 읽기 ----------
+    def _first_seq(self):
+        return self._entries[0]["seq"] if self._entries else self._last_seq + 1
+
+    def _newest_first(self, start_seq, stop_seq, limit):
+        # seq 는 연속이라 deque 안 위치를 바로 계산할 수 있다. (start_seq 부터 내려가며)
+        first = self._first_seq()
+        stop_seq = max(stop_seq, first - 1)
+        end = start_seq - first
+        count = min(limit, start_seq - stop_seq)
+        return [self._entries[end - i] for i in range(count)]
+
+    def page(self, before=None, limit=20, user=None):
+        """최신순 한 페이지와 다음 페이지 커서 (마지막 페이지면 None).
+        user 를 주면 그 사용자가 지운 알림은 빼고 본다."""
+        with self._lock:
+            hidden = self._hidden.get(user, 0)
+            start = self._last_seq if before is None else min(before - 1, self._last_seq)
+            entries = self._newest_first(start, hidden, limit) if start > hidden else []
+            has_more = bool(entries) and entries[-1]["seq"] > max(self._first_seq(), hidden + 1)
+            return entries, (entries[-1]["seq"] if has_more else None)
+
+    def unread_count(self, user):
+        with self._lock:
+            cursor = self._cursors.get(user)
+            if cursor is None:
+                return 0
+            return max(0, self._last_seq - max(cursor, self._first_seq() - 1))
+
+    def unread(self, user, limit=20):
+        """구독자가 아직 안 읽은 알림 (최신순, 최대 limit개)."""
+        with self._lock:
+            cursor = self._cursors.get(user)
+            if cursor is None:
+                return []
+            return self._newest_first(self._last_seq, cursor, limit)
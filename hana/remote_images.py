@@ -0,0 +1,174 @@
+"""외부 이미지(image_url) 로컬 캐시.
+
+시드 항목의 image_url 은 당근마켓/서울대/메르카리 CDN 원본을 가리켜서,
+카드를 그릴 때마다 브라우저가 큰 원본을 외부에서 받아 왔다.
+여기서는 서버가 URL 마다 딱 한 번만 받아 카드 폭으로 줄인 뒤 디스크에 두고,
+용량 상한을 넘으면 가장 오래 안 쓴 파일부터 지운다(LRU).
+placehold.co 자리 표시 이미지는 hana/assets 에 같이 넣어 둔 파일로 대신한다.
+
+캐시에 없는 이미지는 화면을 그리는 스레드에서 받지 않는다. 바로 자리 표시 이미지를
+돌려주고 작은 스레드 풀이 뒤에서 받아 채우므로, 다음 재실행부터 진짜 사진이 보인다.
+(응답이 없는 호스트가 있어도 재실행이 카드마다 몇 초씩 멈추지 않음)
+"""
+import hashlib
+import os
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from hana.images import make_thumbnail, write_atomic
+from hana.store import DATA_DIR
+
+CACHE_DIR = DATA_DIR / "remote_images"
+ASSET_DIR = Path(__file__).resolve().parent / "assets"
+
+# 예전 데이터에 저장된 placehold.co 주소도 그대로 로컬 파일로 연결된다.
+NO_IMAGE_URL = "https://placehold.co/400x250?text=No+Image"
+LOST_ITEM_URL = "https://placehold.co/400x250?text=Lost+Item"
+BUNDLED_IMAGES = {
+    NO_IMAGE_URL: ASSET_DIR / "no_image.png",
+    LOST_ITEM_URL: ASSET_DIR / "lost_item.png",
+}
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+MAX_DOWNLOAD_BYTES = 10 * 1024 * 1024
+FETCH_TIMEOUT = 2
+FETCH_WORKERS = 4
+
+
+def fetch_url(url, timeout=FETCH_TIMEOUT):
+    request = urllib.request.Request(url, headers={"User-Agent": "hanajupjup-image-cache/1.0"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        data = response.read(MAX_DOWNLOAD_BYTES + 1)
+    if len(data) > MAX_DOWNLOAD_BYTES:
+        raise ValueError(f"image too large: {url}")
+    return data
+
+
+class RemoteImageCache:
+    """URL + 폭 단위로 한 번만 받아 오는 디스크 캐시.
+
+    fetch 를 바꿔 끼울 수 있어서, 테스트에서는 로컬 HTTP 서버 주소를
+    넣거나 fetch 함수 자체를 대신할 수 있다.
+    """
+
+    def __init__(self, root=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, fetch=fetch_url,
+                 retry_after=600, fallback=BUNDLED_IMAGES[NO_IMAGE_URL], workers=FETCH_WORKERS):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.fetch = fetch
+        self.retry_after = retry_after
+        self.fallback = Path(fallback)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> 파일 크기 (앞쪽이 가장 오래 안 쓴 것)
+        self._total_bytes = 0
+        self._failed = {}  # url -> 실패 시각 (잠깐 동안 다시 받지 않음)
+        self._pending = {}  # key -> 받는 중인 Future (같은 이미지를 두 번 받지 않음)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="remote-image")
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._load_entries()
+
+    def _load_entries(self):
+        # 재시작해도 LRU 순서가 이어지도록 파일 수정 시각(사용 시 갱신)으로 정렬한다.
+        files = sorted(self.root.glob("*.jpg"), key=lambda p: p.stat().st_mtime)
+        for path in files:
+            size = path.stat().st_size
+            self._entries[path.stem] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def key(url, width):
+        return f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}-w{width}"
+
+    def path_for(self, key):
+        return self.root / f"{key}.jpg"
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, url, width=400, wait=False):
+        """화면에 그릴 로컬 파일 경로. 아직 없으면 뒤에서 받기 시작하고 자리 표시 이미지를
+        돌려준다. (wait=True 면 받을 때까지 기다림) 받을 수 없으면 자리 표시 이미지."""
+        if url in BUNDLED_IMAGES:
+            return BUNDLED_IMAGES[url]
+
+        key = self.key(url, width)
+        path = self.path_for(key)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                hit = True
+            else:
+                hit = False
+                failed_at = self._failed.get(url)
+                if failed_at is not None and time.time() - failed_at < self.retry_after:
+                    return self.fallback
+        if hit:
+            try:
+                os.utime(path)
+                return path
+            except FileNotFoundError:
+                # 다른 프로세스가 지웠으면 다시 받는다.
+                self._forget(key)
+
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self._executor.submit(self._fill, url, width, key)
+                self._pending[key] = future
+        return future.result() if wait else self.fallback
+
+    def _fill(self, url, width, key):
+        # 뒤쪽 스레드 풀에서 돈다.
+        path = self.path_for(key)
+        try:
+            try:
+                data = make_thumbnail(self.fetch(url), width)
+            except Exception:
+                # 네트워크 오류, 이미지가 아닌 응답 등은 모두 자리 표시 이미지로 처리
+                with self._lock:
+                    self._failed[url] = time.time()
+                return self.fallback
+
+            write_atomic(path, data)
+            with self._lock:
+                self._failed.pop(url, None)
+                if key in self._entries:
+                    self._total_bytes -= self._entries[key]
+                self._entries[key] = len(data)
+                self._total_bytes += len(data)
+                self._evict()
+            return path
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def wait_idle(self):
+        """지금 받는 중인 이미지가 모두 끝날 때까지 기다린다. (확인 스크립트용)"""
+        with self._lock:
+            futures = list(self._pending.values())
+        for future in futures:
+            future.result()
+
+    def _forget(self, key):
+        with self._lock:
+            size = self._entries.pop(key, None)
+            if size is not None:
+                self._total_bytes -= size
+
+    def _evict(self):
+        # 잠금을 잡은 상태에서 호출된다. 방금 넣은 항목(맨 뒤)은 지우지 않는다.
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                self.path_for(key).unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,110 @@
+"""분실물 검색용 역색인 (글자 바이그램).
+
+한글은 띄어쓰기 단위로 자르면 "충전" 으로 "C타입 충전기" 를 찾을 수 없어서,
+name / location 을 글자 1-gram + 2-gram 으로 잘라 색인한다.
+검색할 때는 검색어의 n-gram 목록 중 가장 드문 것부터 교집합을 구하고,
+마지막에 원문에 검색어가 그대로 들어 있는지 한 번 더 확인한다.
+(정규식을 쓰지 않으므로 "(", "*" 같은 글자도 그냥 글자로 찾는다.)
+"""
+import threading
+from collections import defaultdict
+
+FIELDS = ("name", "location")
+
+
+def normalize(text):
+    return " ".join((text or "").casefold().split())
+
+
+def ngrams(text):
+    """1-gram + 2-gram 집합. 공백은 토큰에 넣지 않는다."""
+    grams = set()
+    for word in text.split():
+        grams.update(word)
+        grams.update(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+def query_grams(text):
+    # 검색어는 2-gram 만으로 충분하고, 한 글자짜리 단어만 1-gram 을 쓴다.
+    grams = set()
+    for word in text.split():
+        if len(word) == 1:
+            grams.add(word)
+        else:
+            grams.update(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+class SearchIndex:
+    def __init__(self, items=()):
+        self._lock = threading.Lock()
+        self._postings = defaultdict(set)  # n-gram -> 항목 id 집합
+        self._docs = {}  # 항목 id -> (정규화된 name, location, floor, uploaded_at, n-gram 집합)
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, item):
+        """새 항목 색인. 비용은 그 항목의 토큰 수에만 비례한다."""
+        fields = tuple(normalize(item.get(field)) for field in FIELDS)
+        grams = set()
+        for text in fields:
+            grams |= ngrams(text)
+        with self._lock:
+            self._remove_locked(item["id"])
+            self._docs[item["id"]] = (*fields, item.get("floor"), item["uploaded_at"], grams)
+            for gram in grams:
+                self._postings[gram].add(item["id"])
+
+    def remove(self, item_id):
+        with self._lock:
+            self._remove_locked(item_id)
+
+    def _remove_locked(self, item_id):
+        doc = self._docs.pop(item_id, None)
+        if doc is None:
+            return
+        for gram in doc[-1]:
+            ids = self._postings[gram]
+            ids.discard(item_id)
+            if not ids:
+                del self._postings[gram]
+
+    def search(self, query, floor=None, order="relevance"):
+        """검색어가 name 또는 location 에 그대로 들어 있는 항목 id 목록.
+
+        order: "relevance" (이름 일치 > 장소 일치, 같으면 최신순),
+               "newest", "oldest"
+        """
+        needle = normalize(query)
+        if not needle:
+            return []
+        grams = query_grams(needle)
+        with self._lock:
+            postings = sorted((self._postings.get(g, ()) for g in grams), key=len)
+            if not postings or not postings[0]:
+                return []
+            candidates = set(postings[0]).intersection(*postings[1:])
+            hits = []
+            for item_id in candidates:
+                name, location, item_floor, uploaded_at, _ = self._docs[item_id]
+                if floor is not None and item_floor != floor:
+                    continue
+                if needle in name:
+                    score = 3 if name.startswith(needle) else 2
+                elif needle in location:
+                    score = 1
+                else:
+                    continue
+                hits.append((score, uploaded_at, item_id))
+
+        if order == "oldest":
+            hits.sort(key=lambda h: h[1])
+        elif order == "newest":
+            hits.sort(key=lambda h: h[1], reverse=True)
+        else:
+            hits.sort(key=lambda h: (h[0], h[1]), reverse=True)
+        return [item_id for _, _, item_id in hits]
@@ -0,0 +1,49 @@
+"""여러 세션이 같이 쓰는 하나줍줍 상태 서비스.
+
+Streamlit 은 세션마다 스레드를 하나씩 쓰기 때문에, 예전처럼
+stats["upload_count"] += 1 같은 읽기-수정-쓰기를 하면 동시에 올린 업로드의
+횟수가 사라질 수 있다. 여기서는
+  - 항목 추가 + 업로드 횟수 증가를 SQLite 트랜잭션 하나로 묶고
+    (UPDATE ... SET upload_count = upload_count + 1 이라 값이 덮어써지지 않음)
+  - 메모리 인덱스(검색/시간순/랭킹)와 알림 로그는 각자 잠금을 가진 자료구조에
+    추가만 한다.
+앱에서는 st.cache_resource 로 SharedState 하나를 만들어 모든 세션이 공유한다.
+"""
+
+
+class SharedState:
+    def __init__(self, store, search_index, timeline, notifications, leaderboard):
+        self.store = store
+        self.search_index = search_index
+        self.timeline = timeline
+        self.notifications = notifications
+        self.leaderboard = leaderboard
+        for user, info in store.list_users().items():
+            if info["notification_on"]:
+                notifications.subscribe(user)
+
+    def record_upload(self, item):
+        """새 분실물 등록. 어느 스레드에서 동시에 불러도 횟수/항목이 빠지지 않는다."""
+        stats = self.store.add_upload(item)
+        self.search_index.add(item)
+        self.timeline.add(item)
+        self.leaderboard.increment(item["uploader"], item["uploaded_at"].date())
+        if stats["notification_on"]:
+            self.notifications.subscribe(item["uploader"])
+        self.notifications.publish(
+            f"새로운 분실물 '{item['name']}'이(가) 등록되었습니다. (업로더: {item['uploader']})"
+        )
+        return stats
+
+    def user_stats(self, user):
+        return self.store.get_user(user)
+
+    def all_user_stats(self):
+        return self.store.list_users()
+
+    def set_notification(self, user, on):
+        self.store.set_notification(user, on)
+        if on:
+            self.notifications.subscribe(user)
+        else:
+            self.notifications.unsubscribe(user)
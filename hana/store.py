@@ -0,0 +1,259 @@
+"""하나줍줍 분실물 저장소 (SQLite).
+
+예전에는 세션마다 st.session_state.lost_items 에 목록을 따로 들고 있었지만,
+이제는 모든 세션이 하나의 SQLite 파일을 공유한다.
+연결은 작은 풀(db.ConnectionPool)로 재사용하고, 앱에서는 st.cache_resource 로
+ItemStore 인스턴스 하나만 만들어 쓴다.
+"""
+import os
+import threading
+from datetime import date, datetime
+from pathlib import Path
+
+from db import ConnectionPool, migrate
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = Path(os.environ.get("HANA_DATA_DIR", ROOT_DIR / "data" / "hana"))
+DB_PATH = DATA_DIR / "hana.db"
+
+ITEM_COLUMNS = (
+    "id",
+    "name",
+    "location",
+    "floor",
+    "uploaded_at",
+    "image_url",
+    "image_hash",
+    "uploader",
+    "resolved",
+)
+
+# 스키마 변경은 항상 뒤에 추가만 한다. (PRAGMA user_version = 적용된 개수)
+_MIGRATIONS = [
+    """
+    CREATE TABLE items (
+        id          TEXT PRIMARY KEY,
+        name        TEXT NOT NULL,
+        location    TEXT NOT NULL,
+        floor       INTEGER NOT NULL,
+        uploaded_at TEXT NOT NULL,
+        image_url   TEXT,
+        image_data  TEXT,
+        uploader    TEXT NOT NULL,
+        resolved    INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX idx_items_uploaded_at ON items(uploaded_at);
+    CREATE INDEX idx_items_floor ON items(floor);
+    CREATE INDEX idx_items_resolved ON items(resolved);
+    """,
+    # 업로드 이미지는 base64(image_data) 대신 이미지 저장소의 SHA-256 해시로 가리킨다.
+    """
+    ALTER TABLE items ADD COLUMN image_hash TEXT;
+    """,
+    # 오래된 항목 자동 보관 (hana.timeline.archive_expired). 보관된 항목은 목록에서 빠진다.
+    """
+    ALTER TABLE items ADD COLUMN archived_at TEXT;
+    CREATE INDEX idx_items_archived_at ON items(archived_at);
+    """,
+    # 업로드 횟수/알림 설정. 세션별 user_stats 대신 모든 세션이 공유한다.
+    """
+    CREATE TABLE users (
+        name            TEXT PRIMARY KEY,
+        upload_count    INTEGER NOT NULL DEFAULT 0,
+        notification_on INTEGER NOT NULL DEFAULT 1
+    );
+    """,
+    # 날짜별 업로드 횟수 (이번 주/이번 달 랭킹용). day 는 'YYYY-MM-DD'.
+    """
+    CREATE TABLE daily_uploads (
+        day   TEXT NOT NULL,
+        name  TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, name)
+    );
+    """,
+]
+
+
+# ============================================
+# 변환 함수 (dict <-> row)
+# ============================================
+def _to_db_time(value):
+    # ISO 문자열은 사전순 정렬 == 시간순 정렬이라 인덱스를 그대로 탈 수 있다.
+    return value.isoformat(sep=" ", timespec="microseconds")
+
+
+def _from_db_time(value):
+    return datetime.fromisoformat(value)
+
+
+def _row_to_item(row):
+    item = dict(zip(ITEM_COLUMNS, row))
+    item["uploaded_at"] = _from_db_time(item["uploaded_at"])
+    item["resolved"] = bool(item["resolved"])
+    return item
+
+
+def _item_to_row(item):
+    row = {col: item.get(col) for col in ITEM_COLUMNS}
+    row["uploaded_at"] = _to_db_time(item["uploaded_at"])
+    row["resolved"] = int(bool(item.get("resolved", False)))
+    return row
+
+
+# ============================================
+# 분실물 저장소
+# ============================================
+class ItemStore:
+    def __init__(self, path=DB_PATH, pool_size=4):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.pool = ConnectionPool(path, size=pool_size)
+        self._migrate()
+        # 업로드/보관/이미지 이전 때마다 1씩 올라간다. 캐시된 뷰(hana.views)의 무효화 기준.
+        self._generation = 0
+        self._generation_lock = threading.Lock()
+
+    def _migrate(self):
+        migrate(self.pool, _MIGRATIONS)
+
+    def close(self):
+        self.pool.close()
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def _bump_generation(self):
+        with self._generation_lock:
+            self._generation += 1
+
+    # ---------- 쓰기 ----------
+    def archive_items(self, item_ids, when):
+        with self.pool.transaction() as conn:
+            conn.executemany(
+                "UPDATE items SET archived_at = ? WHERE id = ?",
+                [(_to_db_time(when), item_id) for item_id in item_ids],
+            )
+        self._bump_generation()
+
+    def set_image_hash(self, item_id, digest):
+        with self.pool.transaction() as conn:
+            conn.execute(
+                "UPDATE items SET image_hash = ?, image_data = NULL WHERE id = ?",
+                (digest, item_id),
+            )
+        self._bump_generation()
+
+    def seed_if_empty(self, items, users=None):
+        # 여러 세션이 동시에 처음 열어도 한 번만 들어가도록 쓰기 잠금을 먼저 잡는다.
+        with self.pool.transaction() as conn:
+            if conn.execute("SELECT 1 FROM items LIMIT 1").fetchone() is None:
+                placeholders = ", ".join(f":{col}" for col in ITEM_COLUMNS)
+                conn.executemany(
+                    f"INSERT INTO items ({', '.join(ITEM_COLUMNS)}) VALUES ({placeholders})",
+                    [_item_to_row(item) for item in items],
+                )
+                for item in items:
+                    self._count_daily_upload(conn, item)
+            if conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is None:
+                conn.executemany(
+                    "INSERT INTO users (name, upload_count, notification_on) VALUES (?, ?, ?)",
+                    [(name, info["upload_count"], int(info["notification_on"]))
+                     for name, info in (users or {}).items()],
+                )
+        self._bump_generation()
+
+    def add_upload(self, item):
+        """항목 추가 + 업로더의 upload_count 증가를 한 트랜잭션으로 처리하고,
+        갱신된 업로더 정보를 돌려준다."""
+        row = _item_to_row(item)
+        placeholders = ", ".join(f":{col}" for col in ITEM_COLUMNS)
+        with self.pool.transaction() as conn:
+            conn.execute(
+                f"INSERT INTO items ({', '.join(ITEM_COLUMNS)}) VALUES ({placeholders})",
+                row,
+            )
+            conn.execute(
+                "INSERT INTO users (name, upload_count) VALUES (?, 1) "
+                "ON CONFLICT(name) DO UPDATE SET upload_count = upload_count + 1",
+                (item["uploader"],),
+            )
+            self._count_daily_upload(conn, item)
+            stats = self._get_user(conn, item["uploader"])
+        self._bump_generation()
+        return stats
+
+    @staticmethod
+    def _count_daily_upload(conn, item):
+        conn.execute(
+            "INSERT INTO daily_uploads (day, name, count) VALUES (?, ?, 1) "
+            "ON CONFLICT(day, name) DO UPDATE SET count = count + 1",
+            (item["uploaded_at"].date().isoformat(), item["uploader"]),
+        )
+
+    def set_notification(self, user, on):
+        with self.pool.transaction() as conn:
+            conn.execute(
+                "INSERT INTO users (name, notification_on) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET notification_on = excluded.notification_on",
+                (user, int(on)),
+            )
+
+    # ---------- 읽기 ----------
+    def _select(self, where="", params=(), order="uploaded_at DESC", limit=None):
+        sql = f"SELECT {', '.join(ITEM_COLUMNS)} FROM items"
+        if where:
+            sql += f" WHERE {where}"
+        sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (*params, limit)
+        with self.pool.connection() as conn:
+            return [_row_to_item(row) for row in conn.execute(sql, params)]
+
+    def count(self):
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    @staticmethod
+    def _get_user(conn, name):
+        row = conn.execute(
+            "SELECT upload_count, notification_on FROM users WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return {"upload_count": 0, "notification_on": True}
+        return {"upload_count": row[0], "notification_on": bool(row[1])}
+
+    def get_user(self, name):
+        """사용자 정보. 아직 없는 사용자는 기본값(업로드 0회, 알림 ON)."""
+        with self.pool.connection() as conn:
+            return self._get_user(conn, name)
+
+    def list_users(self):
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT name, upload_count, notification_on FROM users").fetchall()
+        return {
+            name: {"upload_count": count, "notification_on": bool(on)}
+            for name, count, on in rows
+        }
+
+    def daily_uploads(self, since=None):
+        """[(날짜, 이름, 횟수)] — since(date) 이후만 읽을 수 있다."""
+        sql = "SELECT day, name, count FROM daily_uploads"
+        params = ()
+        if since is not None:
+            sql += " WHERE day >= ?"
+            params = (since.isoformat(),)
+        with self.pool.connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [(date.fromisoformat(day), name, count) for day, name, count in rows]
+
+    def list_items(self):
+        return self._select("archived_at IS NULL")
+
+    def inline_images(self):
+        # 예전 버전이 남긴 base64 이미지 (images.migrate_inline_images 에서 사용)
+        with self.pool.connection() as conn:
+            return conn.execute(
+                "SELECT id, image_data FROM items WHERE image_data IS NOT NULL"
+            ).fetchall()
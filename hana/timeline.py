@@ -0,0 +1,104 @@
+"""업로드 시각 기준 정렬 인덱스 + 주기적 자동 보관(archive).
+
+(uploaded_at, id) 키를 bisect 로 정렬 상태 그대로 유지한다.
+  - 최근 K개:        리스트 끝에서 K개만 읽으므로 O(K)
+  - 기준 시각 이전:  bisect 한 번으로 경계 위치를 찾는다
+전체를 다시 정렬하는 일은 처음 만들 때 한 번뿐이다.
+"""
+import bisect
+import threading
+import time
+from datetime import datetime, timedelta
+
+# 오래된 분실물 탭에서 고를 수 있는 기준 (일)
+CUTOFF_DAYS = (7, 30, 90)
+# 이 기간이 지난 항목은 자동 보관되어 목록에서 빠진다.
+ARCHIVE_AFTER_DAYS = 180
+
+
+class TimeIndex:
+    def __init__(self, items=()):
+        self._lock = threading.Lock()
+        self._items = {item["id"]: item for item in items}
+        self._keys = sorted((item["uploaded_at"], item["id"]) for item in self._items.values())
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, item):
+        with self._lock:
+            if item["id"] in self._items:
+                self._remove_locked(item["id"])
+            self._items[item["id"]] = item
+            bisect.insort(self._keys, (item["uploaded_at"], item["id"]))
+
+    def remove(self, item_id):
+        with self._lock:
+            self._remove_locked(item_id)
+
+    def _remove_locked(self, item_id):
+        item = self._items.pop(item_id, None)
+        if item is None:
+            return
+        key = (item["uploaded_at"], item_id)
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+
+    def recent(self, k):
+        """가장 최근에 올라온 k개 (최신순)."""
+        with self._lock:
+            return [self._items[item_id] for _, item_id in reversed(self._keys[-k:])] if k > 0 else []
+
+    def before(self, cutoff):
+        """cutoff 이전에 올라온 항목 (오래된 것부터)."""
+        with self._lock:
+            end = bisect.bisect_left(self._keys, (cutoff,))
+            return [self._items[item_id] for _, item_id in self._keys[:end]]
+
+
+def cutoff_for(days, now=None):
+    return (now or datetime.now()) - timedelta(days=days)
+
+
+class PeriodicTask:
+    """Streamlit 재실행마다 maybe_run() 을 불러도 interval 초에 한 번만 func 를 실행한다.
+
+    이미 다른 세션이 실행 중이면 기다리지 않고 그냥 넘어간다.
+    """
+
+    def __init__(self, func, interval):
+        self.func = func
+        self.interval = interval
+        self.last_run = None
+        self._lock = threading.Lock()
+
+    def maybe_run(self):
+        now = time.monotonic()
+        if self.last_run is not None and now - self.last_run < self.interval:
+            return False
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            if self.last_run is not None and now - self.last_run < self.interval:
+                return False
+            self.func()
+            self.last_run = now
+            return True
+        finally:
+            self._lock.release()
+
+
+def archive_expired(store, timeline, other_indexes=(), days=ARCHIVE_AFTER_DAYS, now=None):
+    """days 일이 지난 항목을 보관 처리하고, 메모리 인덱스들에서도 뺀다.
+
+    만료 항목은 timeline 에서 bisect 한 번으로 찾는다.
+    """
+    now = now or datetime.now()
+    expired = [item["id"] for item in timeline.before(cutoff_for(days, now))]
+    if expired:
+        store.archive_items(expired, now)
+        for index in (timeline, *other_indexes):
+            for item_id in expired:
+                index.remove(item_id)
+    return expired
@@ -0,0 +1,67 @@
+"""세대(generation)별로 한 번만 만드는 분실물 DataFrame 뷰.
+
+저장소의 generation 값은 업로드/해결/삭제가 있을 때만 올라간다.
+같은 generation 동안에는 아래 ItemFrame 하나를 모든 세션이 같이 읽고,
+"업로드 시각" 문자열이나 한글 컬럼 이름 같은 파생 컬럼도 그때 한 번만 만든다.
+필터/정렬/오래된 항목 보기는 전부 이 프레임의 위치(position) 배열 슬라이스다.
+
+ItemFrame 은 여러 세션이 공유하므로 읽기 전용으로만 다뤄야 한다.
+"""
+import numpy as np
+import pandas as pd
+
+from hana.store import ITEM_COLUMNS
+
+DISPLAY_NAMES = {
+    "name": "물건 이름",
+    "location": "발견 장소",
+    "floor": "층수",
+    "uploaded_label": "업로드 시각",
+    "uploader": "업로더",
+    "resolved": "해결 여부",
+}
+
+
+class ItemFrame:
+    def __init__(self, items, generation):
+        self.generation = generation
+        # 업로드 시각 오름차순으로 고정해 두면, 최신순은 뒤집기만 하면 되고
+        # 기준 시각 이전 항목은 searchsorted 한 번으로 잘라낼 수 있다.
+        self.items = sorted(items, key=lambda item: item["uploaded_at"])
+
+        frame = pd.DataFrame(self.items, columns=ITEM_COLUMNS)
+        frame["uploaded_at"] = pd.to_datetime(frame["uploaded_at"])
+        frame["uploaded_label"] = frame["uploaded_at"].dt.strftime("%Y-%m-%d %H:%M")
+        self.frame = frame
+        self.display = frame[list(DISPLAY_NAMES)].rename(columns=DISPLAY_NAMES)
+
+        self._uploaded_at = frame["uploaded_at"].to_numpy()
+        self._floor = frame["floor"].to_numpy()
+        self._position_by_id = {item["id"]: i for i, item in enumerate(self.items)}
+
+    def __len__(self):
+        return len(self.items)
+
+    def positions(self, floor=None, newest_first=True):
+        """층수 필터 + 시간 정렬을 적용한 행 위치 배열."""
+        if floor is None:
+            positions = np.arange(len(self.items))
+        else:
+            positions = np.flatnonzero(self._floor == floor)
+        return positions[::-1] if newest_first else positions
+
+    def positions_for_ids(self, item_ids):
+        """검색 결과처럼 순서가 정해진 id 목록 -> 행 위치 배열 (없는 id 는 건너뜀)"""
+        lookup = self._position_by_id
+        return np.array([lookup[i] for i in item_ids if i in lookup], dtype=np.intp)
+
+    def positions_before(self, cutoff):
+        """cutoff 이전에 올라온 항목 (오래된 것부터)."""
+        end = int(np.searchsorted(self._uploaded_at, np.datetime64(cutoff), side="left"))
+        return np.arange(end)
+
+    def table(self, positions):
+        return self.display.iloc[positions]
+
+    def rows(self, positions):
+        return [self.items[i] for i in positions]
@@ -0,0 +1 @@
+"""BR 키오스크(name.py)에서 쓰는 가격/주문 모듈 모음."""
@@ -0,0 +1,144 @@
+"""키오스크 매출 집계 (분 -> 시간 -> 일 롤업).
+
+대시보드가 주문 전체를 훑지 않도록, 주문을 기록하는 트랜잭션 안에서
+(kiosk.orders 훅) 집계 테이블에 UPSERT 로 더해 둔다.
+
+  sales_minute / sales_hour / sales_day   주문 수, 매출, 세금, 매장식사 주문 수
+  sales_container_day                     날짜 x 용기: 줄 수, 매출
+  sales_flavor_day                        날짜 x 맛: 줄 수, 스쿱 수
+
+주문 하나당 UPSERT 는 (3 + 줄 수 + 맛 수) 번이고, 조회는 기간 안의 집계 행
+(최대 하루 24행 / 일 1행 / 일 x 용기 / 일 x 맛)만 읽으므로 주문이 수백만 건이어도
+대시보드 비용은 그대로다.
+
+분 단위 행은 실시간 그래프(최근 60분)에만 쓰므로 MINUTE_RETENTION 보다 오래된 행은
+새 분이 시작될 때 같은 트랜잭션에서 지운다. (지난 기간은 시간/일 테이블에 남아 있음)
+그래서 sales_minute 은 하루치(최대 1,440행)를 넘지 않는다.
+"""
+import threading
+from datetime import datetime, timedelta
+
+from kiosk.pricing import is_eat_in
+
+MINUTE_FORMAT = "%Y-%m-%d %H:%M"
+MINUTE_RETENTION = timedelta(hours=24)
+
+_LEVELS = (("sales_minute", "minute", MINUTE_FORMAT),
+           ("sales_hour", "hour", "%Y-%m-%d %H"),
+           ("sales_day", "day", "%Y-%m-%d"))
+
+
+class SalesRollup:
+    def __init__(self, journal, minute_retention=MINUTE_RETENTION):
+        self.pool = journal.pool
+        self.minute_retention = minute_retention
+        self._pruned_minute = None  # 쓰기 스레드 전용: 오래된 분 행을 지운 것이 커밋된 마지막 분
+        journal.add_hook(self)
+
+    # ---------- 주문 기록 훅 (kiosk.orders.OrderJournal) ----------
+    def apply(self, conn, order):
+        created_at = order["created_at"]
+        eat_in = int(is_eat_in(order["dine_choice"]))
+        for table, key, fmt in _LEVELS:
+            conn.execute(
+                f"INSERT INTO {table} ({key}, orders, revenue, tax, eat_in) VALUES (?, 1, ?, ?, ?) "
+                f"ON CONFLICT({key}) DO UPDATE SET orders = orders + 1, revenue = revenue + excluded.revenue, "
+                "tax = tax + excluded.tax, eat_in = eat_in + excluded.eat_in",
+                (created_at.strftime(fmt), order["total"], order["tax"], eat_in),
+            )
+        minute = created_at.strftime(MINUTE_FORMAT)
+        if minute != self._pruned_minute:
+            # 분이 바뀐 뒤 커밋될 때까지만. (minute 은 기본 키라 범위 삭제가 싸고, 같은 배치에서
+            # 다시 지워도 남은 행이 없다) 표시는 committed 에서 옮긴다. 여기서 바꾸면 롤백됐을 때
+            # 지우지 않은 채로 그 분을 건너뛴다.
+            conn.execute(
+                "DELETE FROM sales_minute WHERE minute < ?",
+                ((created_at - self.minute_retention).strftime(MINUTE_FORMAT),),
+            )
+        day = created_at.strftime("%Y-%m-%d")
+        for line in order["lines"]:
+            conn.execute(
+                "INSERT INTO sales_container_day (day, container, lines, revenue) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT(day, container) DO UPDATE SET lines = lines + 1, revenue = revenue + excluded.revenue",
+                (day, line["container"], line["total"]),
+            )
+            usage = line.get("usage") or {f: 1 for f in line["flavors"]}
+            conn.executemany(
+                "INSERT INTO sales_flavor_day (day, flavor, lines, scoops) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT(day, flavor) DO UPDATE SET lines = lines + 1, scoops = scoops + excluded.scoops",
+                [(day, flavor, scoops) for flavor, scoops in usage.items()],
+            )
+
+    def committed(self, orders):
+        minute = max(order["created_at"] for order in orders).strftime(MINUTE_FORMAT)
+        if self._pruned_minute is None or minute > self._pruned_minute:
+            self._pruned_minute = minute
+
+    # ---------- 조회 ----------
+    def version(self):
+        """마지막 주문 번호. 집계는 주문이 들어올 때만 바뀌므로 캐시 키로 쓴다."""
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT COALESCE(MAX(order_no), 0) FROM orders").fetchone()[0]
+
+    def _rows(self, sql, params):
+        with self.pool.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def totals(self, since):
+        """{"orders", "revenue", "tax", "eat_in"} since(date) 부터 오늘까지."""
+        row = self._rows(
+            "SELECT COALESCE(SUM(orders), 0), COALESCE(SUM(revenue), 0), COALESCE(SUM(tax), 0), "
+            "COALESCE(SUM(eat_in), 0) FROM sales_day WHERE day >= ?",
+            (since.isoformat(),),
+        )[0]
+        return dict(zip(("orders", "revenue", "tax", "eat_in"), row))
+
+    def daily(self, since):
+        """[(날짜, 주문 수, 매출)]"""
+        return self._rows(
+            "SELECT day, orders, revenue FROM sales_day WHERE day >= ? ORDER BY day", (since.isoformat(),)
+        )
+
+    def by_hour_of_day(self, since):
+        """[(시(0~23), 주문 수, 매출)] 기간 안의 같은 시간대를 합친 값."""
+        return self._rows(
+            "SELECT CAST(substr(hour, 12, 2) AS INTEGER), SUM(orders), SUM(revenue) FROM sales_hour "
+            "WHERE hour >= ? GROUP BY 1 ORDER BY 1",
+            (since.isoformat(),),
+        )
+
+    def recent_minutes(self, minutes=60, now=None):
+        """[(분 'YYYY-MM-DD HH:MM', 주문 수, 매출)] 최근 minutes 분."""
+        start = (now or datetime.now()) - timedelta(minutes=minutes)
+        return self._rows(
+            "SELECT minute, orders, revenue FROM sales_minute WHERE minute >= ? ORDER BY minute",
+            (start.strftime(MINUTE_FORMAT),),
+        )
+
+    def top_flavors(self, since, limit=10):
+        """[(맛, 스쿱 수, 줄 수)] 스쿱 수가 많은 순."""
+        return self._rows(
+            "SELECT flavor, SUM(scoops), SUM(lines) FROM sales_flavor_day WHERE day >= ? "
+            "GROUP BY flavor ORDER BY 2 DESC, flavor LIMIT ?",
+            (since.isoformat(), limit),
+        )
+
+    def container_mix(self, since):
+        """[(용기, 줄 수, 매출)] 많이 팔린 순."""
+        return self._rows(
+            "SELECT container, SUM(lines), SUM(revenue) FROM sales_container_day WHERE day >= ? "
+            "GROUP BY container ORDER BY 2 DESC, container",
+            (since.isoformat(),),
+        )
+
+
+_rollups = {}
+_rollups_lock = threading.Lock()
+
+
+def get_sales_rollup(journal):
+    """주문 기록 하나당 하나만 만든다. (훅이 두 번 붙지 않도록)"""
+    with _rollups_lock:
+        if id(journal) not in _rollups:
+            _rollups[id(journal)] = SalesRollup(journal)
+        return _rollups[id(journal)]
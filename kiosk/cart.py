@@ -0,0 +1,95 @@
+"""여러 개를 한 번에 주문하는 장바구니 (세션마다 하나, st.session_state 에 둔다).
+
+줄(line)마다 가격을 담을 때 한 번 계산해서 들고 있고, 합계는 줄을
+더하고/빼고/바꿀 때 그 줄의 소계/추가 요금/세금/총액만큼만 고친다.
+재실행마다 모든 줄을 다시 계산하지 않는다.
+
+세금은 매장식사/포장에 따라 다르므로 줄마다 두 경우를 모두 계산해 두고
+합계도 두 벌 유지한다. 식사 형태를 바꿔도 다시 계산할 것이 없다.
+"""
+from kiosk import pricing
+from kiosk.inventory import scoop_usage
+
+_DINE_KEYS = (True, False)  # 매장식사, 포장
+_TOTAL_FIELDS = ("subtotal", "surcharge", "tax", "total")
+
+
+class Cart:
+    def __init__(self):
+        self.lines = {}  # 줄 번호 -> 줄 (담은 순서 유지)
+        self._next_id = 1
+        self._totals = {eat_in: dict.fromkeys(_TOTAL_FIELDS, 0) for eat_in in _DINE_KEYS}
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __iter__(self):
+        return iter(self.lines.items())
+
+    @staticmethod
+    def _make_line(container, meta, flavors):
+        flavors = tuple(flavors)
+        return {
+            "container": container,
+            "flavors": flavors,
+            "usage": scoop_usage(meta, flavors),
+            # 식사 형태별 가격 (True: 매장식사, False: 포장)
+            "quotes": {
+                eat_in: pricing.quote(meta, len(flavors), "매장식사" if eat_in else "포장")
+                for eat_in in _DINE_KEYS
+            },
+        }
+
+    def _apply(self, line, sign):
+        for eat_in, totals in self._totals.items():
+            q = line["quotes"][eat_in]
+            for field in _TOTAL_FIELDS:
+                totals[field] += sign * q[field]
+
+    # ---------- 담기 / 고치기 / 빼기 ----------
+    def add(self, container, meta, flavors):
+        line_id = self._next_id
+        self._next_id += 1
+        self.lines[line_id] = self._make_line(container, meta, flavors)
+        self._apply(self.lines[line_id], +1)
+        return line_id
+
+    def update(self, line_id, container, meta, flavors):
+        old = self.lines[line_id]
+        new = self._make_line(container, meta, flavors)
+        self._apply(old, -1)
+        self._apply(new, +1)
+        self.lines[line_id] = new
+
+    def remove(self, line_id):
+        line = self.lines.pop(line_id, None)
+        if line is not None:
+            self._apply(line, -1)
+
+    def clear(self):
+        self.lines.clear()
+        for totals in self._totals.values():
+            totals.update(dict.fromkeys(_TOTAL_FIELDS, 0))
+
+    # ---------- 조회 ----------
+    def totals(self, dine_choice):
+        """{"subtotal", "surcharge", "tax", "total"} 현재 식사 형태 기준."""
+        return dict(self._totals[pricing.is_eat_in(dine_choice)])
+
+    def line_quote(self, line_id, dine_choice):
+        return self.lines[line_id]["quotes"][pricing.is_eat_in(dine_choice)]
+
+    def order_lines(self, dine_choice):
+        """kiosk.orders.make_order 에 넘길 줄 목록."""
+        eat_in = pricing.is_eat_in(dine_choice)
+        return [
+            {
+                "container": line["container"],
+                "flavors": list(line["flavors"]),
+                "usage": line["usage"],
+                "subtotal": line["quotes"][eat_in]["subtotal"],
+                "tax": line["quotes"][eat_in]["tax"],
+                "total": line["quotes"][eat_in]["total"],
+            }
+            for line in self.lines.values()
+        ]
@@ -0,0 +1,124 @@
+"""키오스크 메뉴 카탈로그 (kiosk/menu.json) + 파일이 바뀌면 다시 읽기.
+
+예전에는 용기/맛 목록이 name.py 안에 리터럴로 있어서 가격이나 시즌 메뉴를 바꾸려면
+코드를 고치고 모든 키오스크를 재시작해야 했다. 이제는 menu.json 을 고치면 된다.
+
+    {
+      "containers":    {용기 이름: {"type", "scoops", "price_per_scoop" | "price_fixed", "surcharge"}},
+      "flavors":       {등급: [맛, ...]},               # classic / seasonal / premium
+      "tiers_by_type": {용기 type: [등급, ...], "*": [...]}  # "*" = 그 외 용기
+    }
+
+Catalog 는 읽을 때 한 번 만들고 바꾸지 않는다. (MappingProxyType / tuple)
+용기별 선택 가능한 맛 목록도 이때 미리 만들어 두므로, 재실행마다
+classic + seasonal + premium 목록을 이어 붙이지 않는다.
+
+CatalogSource.current() 는 check_interval 초에 한 번만 파일의 (수정 시각, 크기)를 보고
+바뀌었으면 다시 읽는다. 새 파일이 잘못됐으면 이전 카탈로그를 계속 쓰고 error 에 남긴다.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+
+MENU_PATH = Path(os.environ.get("KIOSK_MENU", Path(__file__).resolve().parent / "menu.json"))
+CHECK_INTERVAL = 1.0
+DEFAULT_TYPE = "*"
+
+
+class CatalogError(ValueError):
+    pass
+
+
+class Catalog:
+    def __init__(self, containers, flavors, tiers_by_type, version=None):
+        if not containers:
+            raise CatalogError("용기가 하나도 없습니다.")
+        for name, meta in containers.items():
+            if "type" not in meta or not (meta.get("price_fixed") or "price_per_scoop" in meta):
+                raise CatalogError(f"용기 정보가 부족합니다: {name}")
+        for container_type, tiers in tiers_by_type.items():
+            unknown = [t for t in tiers if t not in flavors]
+            if unknown:
+                raise CatalogError(f"{container_type}: 없는 맛 등급 {', '.join(unknown)}")
+        if DEFAULT_TYPE not in tiers_by_type:
+            raise CatalogError(f'tiers_by_type 에 "{DEFAULT_TYPE}" 가 없습니다.')
+
+        self.version = version
+        self.containers = MappingProxyType({n: MappingProxyType(dict(m)) for n, m in containers.items()})
+        self.container_names = tuple(self.containers)
+        self.flavors = MappingProxyType({tier: tuple(names) for tier, names in flavors.items()})
+        self.tier_of = MappingProxyType({f: tier for tier, names in self.flavors.items() for f in names})
+        by_type = {}
+        for container_type, tiers in tiers_by_type.items():
+            by_type[container_type] = tuple(f for tier in tiers for f in self.flavors[tier])
+        # 용기 이름 -> 선택 가능한 맛 (tuple, 미리 계산)
+        self.available = MappingProxyType({
+            name: by_type.get(meta["type"], by_type[DEFAULT_TYPE])
+            for name, meta in self.containers.items()
+        })
+
+    @classmethod
+    def from_dict(cls, data, version=None):
+        try:
+            return cls(data["containers"], data["flavors"], data["tiers_by_type"], version)
+        except (KeyError, TypeError) as e:
+            raise CatalogError(f"메뉴 형식이 올바르지 않습니다: {e}") from e
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def load_catalog(path=MENU_PATH):
+    stamp = _stamp(path)
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except ValueError as e:
+        raise CatalogError(f"{Path(path).name}: JSON 을 읽을 수 없습니다: {e}") from e
+    return Catalog.from_dict(data, version=stamp)
+
+
+class CatalogSource:
+    def __init__(self, path=MENU_PATH, check_interval=CHECK_INTERVAL):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._catalog = load_catalog(self.path)
+        self._checked_at = time.monotonic()
+        self.error = None  # 마지막으로 다시 읽다가 난 오류 (이전 카탈로그를 계속 씀)
+
+    def current(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._catalog
+        with self._lock:
+            if now - self._checked_at >= self.check_interval:
+                self._checked_at = now
+                self._reload_if_changed()
+            return self._catalog
+
+    def _reload_if_changed(self):
+        try:
+            if _stamp(self.path) == self._catalog.version:
+                return
+            self._catalog = load_catalog(self.path)
+            self.error = None
+        except (OSError, CatalogError) as e:
+            self.error = str(e)
+
+
+_sources = {}
+_sources_lock = threading.Lock()
+
+
+def get_catalog_source(path=MENU_PATH):
+    """경로별로 프로세스 안에서 하나만 만든다."""
+    key = str(path)
+    with _sources_lock:
+        if key not in _sources:
+            _sources[key] = CatalogSource(path)
+        return _sources[key]
@@ -0,0 +1,179 @@
+"""맛별 재고 (남은 스쿱 수).
+
+  - 차감: 결제된 주문은 주문 기록(kiosk.orders)의 그룹 커밋 트랜잭션 안에서
+    UPDATE stock SET scoops = scoops - n WHERE flavor = ? AND scoops >= n 으로 줄인다.
+    모자라면 SoldOut 이 나고 그 주문만 실패한다. (다른 주문과 같은 배치로 쓰므로
+    재고 쓰기도 배치당 한 번 동기화된다)
+  - 읽기: 키오스크 재실행마다 DB 를 읽지 않고 메모리 스냅샷(version, 재고, 품절 목록)을 쓴다.
+    이 프로세스에서 커밋한 차감은 바로 스냅샷에 반영하고, 다른 프로세스가 바꾼 것은
+    refresh_interval 초마다 stock_version 한 행만 읽어서 달라졌을 때만 다시 읽는다.
+    스냅샷은 자기가 반영한 stock_version 을 들고 있어서, 커밋 직후 다른 스레드가
+    먼저 다시 읽었으면 커밋 훅은 같은 차감을 두 번 빼지 않는다.
+  - 용기별 "품절 뺀 맛 목록"은 (맛 목록, 스냅샷 version) 으로 캐시한다.
+"""
+import threading
+import time
+from types import MappingProxyType
+
+DEFAULT_SCOOPS = 200
+REFRESH_INTERVAL = 2.0
+
+
+class SoldOut(Exception):
+    def __init__(self, flavor):
+        super().__init__(f"품절: {flavor}")
+        self.flavor = flavor
+
+
+def scoop_usage(meta, flavors):
+    """{맛: 스쿱 수}. 스쿱 용기는 맛마다 1스쿱, 고정 가격 용기는 스쿱 수를 맛 개수로 나눈다."""
+    flavors = list(dict.fromkeys(flavors))
+    scoops = meta.get("scoops", 1)
+    if not flavors:
+        return {}
+    if meta.get("price_fixed"):
+        base, extra = divmod(scoops, len(flavors))
+        usage = {f: base + (i < extra) for i, f in enumerate(flavors)}
+        return {f: n for f, n in usage.items() if n}
+    return {f: 1 for f in flavors[:scoops]}
+
+
+class _Snapshot:
+    __slots__ = ("version", "stock", "sold_out")
+
+    def __init__(self, version, stock):
+        self.version = version
+        self.stock = MappingProxyType(stock)
+        self.sold_out = frozenset(f for f, n in stock.items() if n <= 0)
+
+
+class Inventory:
+    def __init__(self, journal, refresh_interval=REFRESH_INTERVAL):
+        self.pool = journal.pool
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._available_cache = {}  # 맛 목록 -> (snapshot version, 재고 있는 맛 tuple)
+        self._ensured = None
+        self._applied_version = None  # 쓰기 스레드 전용: 마지막 apply 가 올린 stock_version
+        self._load()
+        journal.add_hook(self)
+
+    # ---------- 스냅샷 ----------
+    def _load(self):
+        with self.pool.connection() as conn:
+            db_version = conn.execute("SELECT version FROM stock_version").fetchone()[0]
+            stock = dict(conn.execute("SELECT flavor, scoops FROM stock"))
+        with self._lock:
+            previous = getattr(self, "_snapshot", None)
+            self._checked_at = time.monotonic()
+            if previous is not None and db_version < self._db_version:
+                return  # 읽는 사이 커밋 훅이 더 새 차감을 반영했다.
+            self._db_version = db_version
+            self._snapshot = _Snapshot((previous.version + 1) if previous else 0, stock)
+
+    def snapshot(self):
+        now = time.monotonic()
+        with self._lock:
+            due = now - self._checked_at >= self.refresh_interval
+            if due:
+                self._checked_at = now
+        if due:
+            with self.pool.connection() as conn:
+                db_version = conn.execute("SELECT version FROM stock_version").fetchone()[0]
+            with self._lock:
+                stale = db_version != self._db_version
+            if stale:
+                self._load()
+        return self._snapshot
+
+    def in_stock(self, flavors):
+        """flavors(tuple) 중 품절이 아닌 맛만. 스냅샷이 그대로면 지난 결과를 돌려준다."""
+        snap = self.snapshot()
+        cached = self._available_cache.get(flavors)
+        if cached is not None and cached[0] == snap.version:
+            return cached[1]
+        result = tuple(f for f in flavors if f not in snap.sold_out)
+        self._available_cache[flavors] = (snap.version, result)
+        return result
+
+    def remaining(self, flavor):
+        return self.snapshot().stock.get(flavor, 0)
+
+    # ---------- 재고 쓰기 ----------
+    def ensure(self, catalog, default_scoops=DEFAULT_SCOOPS):
+        """카탈로그에 새로 생긴 맛을 기본 재고로 넣는다. (카탈로그 version 당 한 번)"""
+        if self._ensured == catalog.version:
+            return
+        with self.pool.transaction() as conn:
+            cur = conn.executemany(
+                "INSERT OR IGNORE INTO stock (flavor, scoops) VALUES (?, ?)",
+                [(f, default_scoops) for f in catalog.tier_of],
+            )
+            if cur.rowcount:
+                conn.execute("UPDATE stock_version SET version = version + 1")
+        self._ensured = catalog.version
+        self._load()
+
+    def set_stock(self, levels):
+        """{맛: 스쿱 수} 로 재고를 맞춘다. (입고/조정) 여러 맛을 한 트랜잭션으로."""
+        with self.pool.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO stock (flavor, scoops) VALUES (?, ?) "
+                "ON CONFLICT(flavor) DO UPDATE SET scoops = excluded.scoops",
+                list(levels.items()),
+            )
+            conn.execute("UPDATE stock_version SET version = version + 1")
+        self._load()
+
+    # ---------- 주문 기록 훅 (kiosk.orders.OrderJournal) ----------
+    def apply(self, conn, order):
+        used = False
+        for line in order["lines"]:
+            for flavor, scoops in line.get("usage", {}).items():
+                cur = conn.execute(
+                    "UPDATE stock SET scoops = scoops - ? WHERE flavor = ? AND scoops >= ?",
+                    (scoops, flavor, scoops),
+                )
+                if cur.rowcount == 0:
+                    raise SoldOut(flavor)
+                used = True
+        if used:
+            conn.execute("UPDATE stock_version SET version = version + 1")
+            # 커밋되면 이 트랜잭션의 마지막 apply 값이 된다. (되돌린 배치의 값은 다시 넣을 때 덮어씀)
+            self._applied_version = conn.execute("SELECT version FROM stock_version").fetchone()[0]
+
+    def committed(self, orders):
+        changes = {}
+        for order in orders:
+            for line in order["lines"]:
+                for flavor, scoops in line.get("usage", {}).items():
+                    changes[flavor] = changes.get(flavor, 0) + scoops
+        if not changes:
+            return
+        version = self._applied_version
+        bumps = sum(1 for order in orders if any(line.get("usage") for line in order["lines"]))
+        with self._lock:
+            if self._db_version >= version:
+                return  # 커밋 뒤 다른 스레드가 이미 DB 에서 다시 읽었다. (차감이 들어 있음)
+            stock = dict(self._snapshot.stock)
+            for flavor, scoops in changes.items():
+                stock[flavor] = stock.get(flavor, 0) - scoops
+            self._snapshot = _Snapshot(self._snapshot.version + 1, stock)
+            # 이 배치 바로 앞 상태였을 때만 따라간다. 그 사이 다른 프로세스가 쓴 게 있으면
+            # version 을 그대로 두어 다음 확인 때 DB 에서 다시 읽게 한다.
+            if self._db_version + bumps == version:
+                self._db_version = version
+            else:
+                self._checked_at = float("-inf")
+
+
+_inventories = {}
+_inventories_lock = threading.Lock()
+
+
+def get_inventory(journal):
+    """주문 기록 하나당 하나만 만든다. (훅이 두 번 붙지 않도록)"""
+    with _inventories_lock:
+        if id(journal) not in _inventories:
+            _inventories[id(journal)] = Inventory(journal)
+        return _inventories[id(journal)]
@@ -0,0 +1,353 @@
+"""키오스크 주문 기록 (SQLite WAL, 추가 전용) + 픽업 대기열.
+
+결제가 끝나면 주문을 orders / order_lines 에 남기고 일련 주문 번호를 받는다.
+여러 키오스크가 동시에 결제해도 버티도록 쓰기는 전용 스레드 하나가 맡는다.
+
+  - 그룹 커밋: 쓰기 스레드는 큐에 쌓인 주문을 최대 max_batch 개까지 모아
+    트랜잭션 하나로 넣는다. 동기화(fsync)는 트랜잭션마다 한 번이므로
+    동시에 들어온 주문이 많을수록 주문당 비용이 줄어든다.
+    (쓰기 연결은 synchronous=FULL — 번호를 받은 주문은 전원이 나가도 남는다)
+  - 배치 안의 주문 하나가 실패하면 배치를 되돌리고 한 건씩 다시 넣어서
+    나머지 주문은 그대로 들어가게 한다.
+  - add_hook() 으로 붙인 훅은 같은 트랜잭션 안에서 주문마다 apply(conn, order) 가,
+    커밋 뒤에 committed(orders) 가 불린다. (재고 차감 등) apply 에서 예외가 나면
+    그 주문만 실패한다. committed 에서 난 예외는 로그만 남긴다. (주문은 이미 커밋됨)
+  - 쓰기 스레드는 어떤 오류에도 멈추지 않고, 큐에서 꺼낸 주문의 Future 는 항상
+    결과나 예외로 끝난다. (place() 가 timeout 까지 막히지 않도록)
+  - 픽업 화면은 order_events 의 seq 커서 뒤만 읽는다. (seq > ? 는 기본 키 범위 조회)
+    주문 접수와 상태 변경(준비 완료 / 수령)이 모두 이벤트로 쌓인다.
+"""
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+from pathlib import Path
+
+from db import ConnectionPool, migrate
+
+log = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = Path(os.environ.get("KIOSK_DATA_DIR", ROOT_DIR / "data" / "kiosk"))
+DB_PATH = DATA_DIR / "orders.db"
+
+PLACED, READY, PICKED_UP = "placed", "ready", "picked_up"
+STATUS_LABELS = {PLACED: "준비 중", READY: "준비 완료", PICKED_UP: "수령 완료"}
+EVENT_PAGE = 200
+
+# 스키마 변경은 항상 뒤에 추가만 한다. (PRAGMA user_version = 적용된 개수)
+_MIGRATIONS = [
+    """
+    CREATE TABLE orders (
+        order_no       INTEGER PRIMARY KEY AUTOINCREMENT,
+        created_at     TEXT NOT NULL,
+        kiosk          TEXT,
+        dine_choice    TEXT NOT NULL,
+        payment_method TEXT NOT NULL,
+        subtotal       INTEGER NOT NULL,
+        tax            INTEGER NOT NULL,
+        total          INTEGER NOT NULL,
+        status         TEXT NOT NULL DEFAULT 'placed'
+    );
+    CREATE INDEX idx_orders_status ON orders(status);
+    CREATE TABLE order_lines (
+        order_no  INTEGER NOT NULL REFERENCES orders(order_no),
+        line_no   INTEGER NOT NULL,
+        container TEXT NOT NULL,
+        flavors   TEXT NOT NULL,
+        subtotal  INTEGER NOT NULL,
+        tax       INTEGER NOT NULL,
+        total     INTEGER NOT NULL,
+        PRIMARY KEY (order_no, line_no)
+    );
+    CREATE TABLE order_events (
+        seq      INTEGER PRIMARY KEY AUTOINCREMENT,
+        order_no INTEGER NOT NULL,
+        status   TEXT NOT NULL,
+        at       TEXT NOT NULL
+    );
+    """,
+    # 맛별 남은 스쿱 수 (kiosk.inventory). stock_version 은 재고가 바뀔 때마다 1씩 오른다.
+    """
+    CREATE TABLE stock (
+        flavor TEXT PRIMARY KEY,
+        scoops INTEGER NOT NULL CHECK (scoops >= 0)
+    );
+    CREATE TABLE stock_version (
+        id      INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL
+    );
+    INSERT INTO stock_version (id, version) VALUES (1, 0);
+    """,
+    # 매출 집계 (kiosk.analytics). 주문을 기록하는 트랜잭션에서 분/시간/일 단위로 더한다.
+    # 이미 있던 주문은 여기서 한 번 채운다. (옛 주문은 맛별 스쿱 수가 없어서 맛 하나 = 1스쿱)
+    """
+    CREATE TABLE sales_minute (
+        minute  TEXT PRIMARY KEY,
+        orders  INTEGER NOT NULL DEFAULT 0,
+        revenue INTEGER NOT NULL DEFAULT 0,
+        tax     INTEGER NOT NULL DEFAULT 0,
+        eat_in  INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE sales_hour (
+        hour    TEXT PRIMARY KEY,
+        orders  INTEGER NOT NULL DEFAULT 0,
+        revenue INTEGER NOT NULL DEFAULT 0,
+        tax     INTEGER NOT NULL DEFAULT 0,
+        eat_in  INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE sales_day (
+        day     TEXT PRIMARY KEY,
+        orders  INTEGER NOT NULL DEFAULT 0,
+        revenue INTEGER NOT NULL DEFAULT 0,
+        tax     INTEGER NOT NULL DEFAULT 0,
+        eat_in  INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE sales_container_day (
+        day       TEXT NOT NULL,
+        container TEXT NOT NULL,
+        lines     INTEGER NOT NULL DEFAULT 0,
+        revenue   INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, container)
+    );
+    CREATE TABLE sales_flavor_day (
+        day    TEXT NOT NULL,
+        flavor TEXT NOT NULL,
+        lines  INTEGER NOT NULL DEFAULT 0,
+        scoops INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, flavor)
+    );
+    INSERT INTO sales_minute (minute, orders, revenue, tax, eat_in)
+        SELECT substr(created_at, 1, 16), COUNT(*), SUM(total), SUM(tax), SUM(instr(dine_choice, '매장식사') > 0)
+        FROM orders GROUP BY 1;
+    INSERT INTO sales_hour (hour, orders, revenue, tax, eat_in)
+        SELECT substr(created_at, 1, 13), COUNT(*), SUM(total), SUM(tax), SUM(instr(dine_choice, '매장식사') > 0)
+        FROM orders GROUP BY 1;
+    INSERT INTO sales_day (day, orders, revenue, tax, eat_in)
+        SELECT substr(created_at, 1, 10), COUNT(*), SUM(total), SUM(tax), SUM(instr(dine_choice, '매장식사') > 0)
+        FROM orders GROUP BY 1;
+    INSERT INTO sales_container_day (day, container, lines, revenue)
+        SELECT substr(o.created_at, 1, 10), l.container, COUNT(*), SUM(l.total)
+        FROM order_lines l JOIN orders o USING (order_no) GROUP BY 1, 2;
+    INSERT INTO sales_flavor_day (day, flavor, lines, scoops)
+        SELECT substr(o.created_at, 1, 10), f.value, COUNT(*), COUNT(*)
+        FROM order_lines l JOIN orders o USING (order_no), json_each(l.flavors) f GROUP BY 1, 2;
+    """,
+]
+
+_STOP = object()
+
+
+def _to_db_time(value):
+    return value.isoformat(sep=" ", timespec="microseconds")
+
+
+def make_order(lines, dine_choice, payment_method, kiosk=None, created_at=None):
+    """lines: [{"container", "flavors", "subtotal", "tax", "total"}] -> 주문 dict"""
+    return {
+        "created_at": created_at or datetime.now(),
+        "kiosk": kiosk,
+        "dine_choice": dine_choice,
+        "payment_method": payment_method,
+        "lines": list(lines),
+        "subtotal": sum(line["subtotal"] for line in lines),
+        "tax": sum(line["tax"] for line in lines),
+        "total": sum(line["total"] for line in lines),
+    }
+
+
+class OrderJournal:
+    def __init__(self, path=DB_PATH, pool_size=4, max_batch=256):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(path)
+        self.pool = ConnectionPool(path, size=pool_size)
+        self.max_batch = max_batch
+        self._hooks = []
+        self._migrate()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._run_writer, name="order-journal", daemon=True)
+        self._writer.start()
+
+    def _migrate(self):
+        migrate(self.pool, _MIGRATIONS)
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._writer.join()
+        self.pool.close()
+
+    def add_hook(self, hook):
+        self._hooks.append(hook)
+
+    # ---------- 쓰기 ----------
+    def submit(self, order):
+        """주문을 쓰기 큐에 넣고 Future 를 돌려준다. 결과는 주문 번호."""
+        future = Future()
+        self._queue.put((order, future))
+        return future
+
+    def place(self, order, timeout=30):
+        """주문을 기록하고(커밋될 때까지 기다림) 주문 번호를 돌려준다."""
+        return self.submit(order).result(timeout)
+
+    def set_status(self, order_no, status):
+        with self.pool.transaction() as conn:
+            conn.execute("UPDATE orders SET status = ? WHERE order_no = ?", (status, order_no))
+            conn.execute(
+                "INSERT INTO order_events (order_no, status, at) VALUES (?, ?, ?)",
+                (order_no, status, _to_db_time(datetime.now())),
+            )
+
+    def _run_writer(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        try:
+            while True:
+                batch = [self._queue.get()]
+                # 기다리는 동안 쌓인 주문을 한 번에 가져간다. (그룹 커밋)
+                while len(batch) < self.max_batch:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = any(entry is _STOP for entry in batch)
+                entries = [entry for entry in batch if entry is not _STOP]
+                try:
+                    self._write_batch(conn, entries)
+                except Exception as e:
+                    # 되돌리기(ROLLBACK) 실패 같은 예상 밖 오류. 스레드는 계속 돌고,
+                    # 아직 결과를 받지 못한 주문은 실패로 알린다.
+                    log.exception("order journal writer failed")
+                    for _, future in entries:
+                        if not future.done():
+                            future.set_exception(e)
+                if stop:
+                    break
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn, batch):
+        if not batch:
+            return
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            numbers = []
+            for order, _ in batch:
+                numbers.append(self._insert_order(conn, order))
+                for hook in self._hooks:
+                    hook.apply(conn, order)
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            # 어느 주문이 문제인지 모르니 한 건씩 다시 넣는다.
+            for entry in batch:
+                self._write_batch(conn, [entry])
+            return
+        orders = [order for order, _ in batch]
+        for hook in self._hooks:
+            try:
+                hook.committed(orders)
+            except Exception:
+                # 주문은 이미 커밋됐으므로 번호는 그대로 돌려준다. (메모리 캐시는 다음 조회 때 맞춰짐)
+                log.exception("post-commit hook %r failed", hook)
+        for (_, future), order_no in zip(batch, numbers):
+            future.set_result(order_no)
+
+    @staticmethod
+    def _insert_order(conn, order):
+        created_at = _to_db_time(order["created_at"])
+        cur = conn.execute(
+            "INSERT INTO orders (created_at, kiosk, dine_choice, payment_method, subtotal, tax, total) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (created_at, order.get("kiosk"), order["dine_choice"], order["payment_method"],
+             order["subtotal"], order["tax"], order["total"]),
+        )
+        order_no = cur.lastrowid
+        conn.executemany(
+            "INSERT INTO order_lines (order_no, line_no, container, flavors, subtotal, tax, total) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (order_no, i, line["container"], json.dumps(list(line["flavors"]), ensure_ascii=False),
+                 line["subtotal"], line["tax"], line["total"])
+                for i, line in enumerate(order["lines"], start=1)
+            ],
+        )
+        conn.execute(
+            "INSERT INTO order_events (order_no, status, at) VALUES (?, ?, ?)",
+            (order_no, PLACED, created_at),
+        )
+        return order_no
+
+    # ---------- 읽기 ----------
+    def last_event_seq(self):
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM order_events").fetchone()[0]
+
+    def events_since(self, cursor, limit=EVENT_PAGE):
+        """([{"seq", "order_no", "status", "at"}], 새 커서). 커서 뒤의 이벤트만 읽는다."""
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT seq, order_no, status, at FROM order_events WHERE seq > ? ORDER BY seq LIMIT ?",
+                (cursor, limit),
+            ).fetchall()
+        events = [{"seq": s, "order_no": n, "status": st, "at": at} for s, n, st, at in rows]
+        return events, (rows[-1][0] if rows else cursor)
+
+    def open_orders(self, statuses=(PLACED, READY)):
+        """{주문 번호: 상태} 픽업 화면 처음 불러올 때."""
+        marks = ", ".join("?" for _ in statuses)
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f"SELECT order_no, status FROM orders WHERE status IN ({marks}) ORDER BY order_no",
+                tuple(statuses),
+            ).fetchall()
+        return dict(rows)
+
+    def get(self, order_no):
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT order_no, created_at, kiosk, dine_choice, payment_method, subtotal, tax, total, status "
+                "FROM orders WHERE order_no = ?",
+                (order_no,),
+            ).fetchone()
+            if row is None:
+                return None
+            lines = conn.execute(
+                "SELECT container, flavors, subtotal, tax, total FROM order_lines "
+                "WHERE order_no = ? ORDER BY line_no",
+                (order_no,),
+            ).fetchall()
+        keys = ("order_no", "created_at", "kiosk", "dine_choice", "payment_method", "subtotal", "tax", "total", "status")
+        order = dict(zip(keys, row))
+        order["created_at"] = datetime.fromisoformat(order["created_at"])
+        order["lines"] = [
+            {"container": c, "flavors": json.loads(f), "subtotal": s, "tax": t, "total": tot}
+            for c, f, s, t, tot in lines
+        ]
+        return order
+
+    def count(self):
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+
+_journals = {}
+_journals_lock = threading.Lock()
+
+
+def get_journal(path=DB_PATH):
+    """경로별로 프로세스 안에서 하나만 만든다. (키오스크 화면과 픽업 화면이 쓰기 스레드를 같이 쓴다)"""
+    key = str(path)
+    with _journals_lock:
+        if key not in _journals:
+            _journals[key] = OrderJournal(path)
+        return _journals[key]
@@ -0,0 +1,115 @@
+"""키오스크 가격 계산.
+
+name.py 안에 있던 계산을 그대로 옮겼다.
+  - 고정 가격 용기(파인트 등): 용기 가격
+  - 스쿱 용기(컵/콘): 스쿱 단가 x min(맛 개수, 최대 스쿱) + 추가 요금(와플콘)
+  - 매장식사: 소계의 10% 세금 (int() 로 버림)
+
+quote()       주문 하나 — 외부 라이브러리 없이 계산 (키오스크 재실행용)
+price_batch() 주문 여러 건을 한 번에 — pandas/NumPy 배열 연산 (정산/분석용)
+두 방식의 결과가 같은지는 benchmarks/pricing_agreement.py 로 확인한다.
+용기 정보(meta / containers)는 kiosk.catalog 의 메뉴 카탈로그에서 온다.
+"""
+
+EAT_IN_TAX_RATE = 0.10
+FIXED_LABEL = "용기(고정 가격)"
+SURCHARGE_LABEL = "와플콘 추가 요금"
+
+
+def is_eat_in(dine_choice):
+    return "매장식사" in dine_choice
+
+
+def scoop_label(used_scoops, price_per_scoop):
+    return f"스쿱 {used_scoops} x {price_per_scoop}원"
+
+
+def quote(meta, flavor_count, dine_choice):
+    """{"subtotal", "surcharge", "breakdown": [(항목, 금액)], "tax_rate", "tax", "total"}"""
+    subtotal = 0
+    surcharge = 0
+    breakdown = []
+
+    if meta.get("price_fixed"):
+        subtotal = meta["price_fixed"]
+        breakdown.append((FIXED_LABEL, meta["price_fixed"]))
+    else:
+        price_per_scoop = meta.get("price_per_scoop", 0)
+        used_scoops = min(flavor_count, meta.get("scoops", 1))
+        scoop_cost = price_per_scoop * used_scoops
+        subtotal += scoop_cost
+        breakdown.append((scoop_label(used_scoops, price_per_scoop), scoop_cost))
+
+        surcharge = meta.get("surcharge", 0)
+        if surcharge:
+            subtotal += surcharge
+            breakdown.append((SURCHARGE_LABEL, surcharge))
+
+    # 간단 예시로 매장식사 시 세금 10% 적용
+    tax_rate = EAT_IN_TAX_RATE if is_eat_in(dine_choice) else 0.0
+    tax = int(subtotal * tax_rate) if tax_rate else 0
+    return {
+        "subtotal": subtotal,
+        "surcharge": surcharge,
+        "breakdown": breakdown,
+        "tax_rate": tax_rate,
+        "tax": tax,
+        "total": subtotal + tax,
+    }
+
+
+def price_batch(orders, containers):
+    """orders: container / flavor_count / dine_choice 열을 가진 DataFrame.
+
+    같은 행 순서로 used_scoops, price_per_scoop, scoop_cost, surcharge, price_fixed,
+    subtotal, tax_rate, tax, total 열을 가진 DataFrame 을 돌려준다.
+    (용기별 값은 용기 수 길이의 배열로 한 번 만들고 범주 코드로 한꺼번에 꺼낸다)
+    """
+    import numpy as np
+    import pandas as pd
+
+    names = list(containers)
+    codes = pd.Categorical(orders["container"], categories=names).codes
+    if (codes < 0).any():
+        unknown = orders["container"][codes < 0].iloc[0]
+        raise KeyError(f"unknown container: {unknown}")
+
+    fixed = np.array([containers[n].get("price_fixed") or 0 for n in names], dtype=np.int64)[codes]
+    per_scoop = np.array([containers[n].get("price_per_scoop", 0) for n in names], dtype=np.int64)[codes]
+    max_scoops = np.array([containers[n].get("scoops", 1) for n in names], dtype=np.int64)[codes]
+    surcharge = np.array([containers[n].get("surcharge", 0) for n in names], dtype=np.int64)[codes]
+
+    is_fixed = fixed > 0
+    used = np.where(is_fixed, 0, np.minimum(orders["flavor_count"].to_numpy(dtype=np.int64), max_scoops))
+    scoop_cost = per_scoop * used
+    surcharge = np.where(is_fixed, 0, surcharge)
+    subtotal = np.where(is_fixed, fixed, scoop_cost + surcharge)
+
+    eat_in = orders["dine_choice"].str.contains("매장식사", regex=False).to_numpy()
+    tax_rate = np.where(eat_in, EAT_IN_TAX_RATE, 0.0)
+    tax = np.trunc(subtotal * tax_rate).astype(np.int64)  # int() 와 같은 버림
+
+    return pd.DataFrame(
+        {
+            "used_scoops": used,
+            "price_per_scoop": np.where(is_fixed, 0, per_scoop),
+            "scoop_cost": scoop_cost,
+            "surcharge": surcharge,
+            "price_fixed": fixed,
+            "subtotal": subtotal,
+            "tax_rate": tax_rate,
+            "tax": tax,
+            "total": subtotal + tax,
+        },
+        index=orders.index,
+    )
+
+
+def batch_breakdown(row):
+    """price_batch() 결과 한 행 -> quote() 와 같은 형식의 [(항목, 금액)]."""
+    if row["price_fixed"]:
+        return [(FIXED_LABEL, int(row["price_fixed"]))]
+    breakdown = [(scoop_label(int(row["used_scoops"]), int(row["price_per_scoop"])), int(row["scoop_cost"]))]
+    if row["surcharge"]:
+        breakdown.append((SURCHARGE_LABEL, int(row["surcharge"])))
+    return breakdown
@@ -0,0 +1 @@
+"""Countries MBTI Explorer(pages/01_MBTI국가.py 등)에서 쓰는 데이터/차트 모듈 모음."""
@@ -0,0 +1,38 @@
+"""MBTI 페이지들(pages/01, 03, 04, 05)이 같이 쓰는 캐시된 데이터 접근.
+
+이진 스냅샷(data/mbti/values.npy)을 메모리 매핑한 CountryMatrix 를 프로세스당
+하나만 만들어 모든 페이지/세션이 공유한다. 없거나 CSV 가 바뀌었으면 CSV 를 읽어
+스냅샷을 새로 만든다. cache_data 는 값을 피클로 복사하므로 매핑을 그대로
+공유하도록 cache_resource 를 쓴다.
+
+mbti.ingest --dataset 으로 쌓은 데이터셋(data/mbti/datasets/<이름>)은 사이드바에서
+고를 수 있다. 캐시 키는 (이름, 버전) 이라 이어 붙이면 다음 재실행부터 새 행렬을 쓴다.
+"""
+import streamlit as st
+
+from mbti.data import MBTI_TYPES
+from mbti.snapshot import dataset_version, list_datasets, load_dataset, load_matrix
+
+BASE_LABEL = "기본 (국가별)"
+
+
+@st.cache_resource(max_entries=8)
+def get_matrix(dataset=None, version=None):
+    """dataset 이 None 이면 기본 국가별 스냅샷, 아니면 datasets/<dataset> (version 은 캐시 키)."""
+    if dataset is None:
+        return load_matrix(types=list(MBTI_TYPES))
+    matrix = load_dataset(dataset)
+    if matrix is None:
+        raise FileNotFoundError(f"MBTI 데이터셋을 열 수 없습니다: {dataset}")
+    return matrix
+
+
+def choose_dataset():
+    """사이드바에서 고른 데이터셋의 (이름, 버전). 쌓아 둔 데이터셋이 없으면 선택 상자 없이 기본값."""
+    datasets = list_datasets()
+    if not datasets:
+        return None, None
+    choice = st.sidebar.selectbox("데이터셋", [BASE_LABEL, *datasets], key="mbti_dataset")
+    if choice == BASE_LABEL:
+        return None, None
+    return choice, dataset_version(choice)
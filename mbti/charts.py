@@ -0,0 +1,132 @@
+"""MBTI 그래프 캐시 — 국가별 막대그래프 / 유형별 세계 지도.
+
+색상 규칙은 예전 페이지와 같다.
+  - 1등 유형은 rgb(255,0,0)
+  - 나머지는 (값 - 최소) / (최대 - 최소) 에 따라 0.2 ~ 0.8 세기의 빨강 + 흰색
+예전에는 막대 16개를 파이썬 루프로 돌며 계산했지만, 여기서는 고른 행 하나만
+배열 연산으로 계산한다. (데이터셋이 수백만 행이어도 전체 색 배열을 미리 만들지 않음)
+Figure 는 국가별로 처음 요청될 때 한 번만 만들고 최근에 쓴 max_entries 개만 LRU 로 남긴다.
+
+세계 지도(choropleth)는 158개국 값이 다 들어가서 막대그래프보다 훨씬 크므로
+유형별 Figure 를 처음 요청될 때 만들고 최근에 쓴 max_entries 개만 LRU 로 남긴다.
+유형을 바꾸면 만들어 둔 Figure 를 꺼내서 넘기기만 한다.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.graph_objects as go
+
+BASE_COLOR = np.array([255, 0, 0])
+WHITE = np.array([255, 255, 255])
+
+
+def bar_colors(values):
+    """(n, 16) 비율 -> (n, 16, 3) uint8 RGB. 행마다 1등 칸은 완전 빨강."""
+    values = np.asarray(values, dtype=np.float64)
+    vmax = values.max(axis=1, keepdims=True)
+    vmin = values.min(axis=1, keepdims=True)
+    vmin = np.where(vmin < vmax, vmin, 0.0)
+    span = vmax - vmin
+    norm = np.divide(values - vmin, span, out=np.zeros_like(values), where=span != 0)
+    intensity = np.where(span == 0, 0.4, 0.2 + 0.6 * norm)[..., None]
+    rgb = (BASE_COLOR * intensity + WHITE * (1 - intensity)).astype(np.uint8)
+    rgb[np.arange(len(values)), values.argmax(axis=1)] = BASE_COLOR
+    return rgb
+
+
+class BarFigures:
+    def __init__(self, matrix, max_entries=64):
+        self.matrix = matrix
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._figures = OrderedDict()  # 국가 -> go.Figure (만든 뒤에는 바꾸지 않는다)
+
+    def figure(self, country):
+        with self._lock:
+            fig = self._figures.get(country)
+            if fig is not None:
+                self._figures.move_to_end(country)
+                return fig
+        fig = self._build(country)
+        with self._lock:
+            fig = self._figures.setdefault(country, fig)
+            self._figures.move_to_end(country)
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return fig
+
+    def _build(self, country):
+        i = self.matrix.index[country]
+        y = self.matrix.shares(country)
+        colors = [f"rgb({r},{g},{b})" for r, g, b in bar_colors(self.matrix.values[i:i + 1])[0].tolist()]
+
+        fig = go.Figure()
+        fig.add_trace(
+            go.Bar(
+                x=list(self.matrix.types),
+                y=y,
+                marker=dict(color=colors),
+                text=[f"{val*100:.1f}%" for val in y],
+                textposition="outside",
+                hovertemplate="<b>%{x}</b><br>%{y:.3f} (비율)<extra></extra>",
+            )
+        )
+        fig.update_layout(
+            title=f"{country} MBTI 비율 (16유형)",
+            xaxis_title="MBTI 유형",
+            yaxis_title="비율 (0~1)",
+            yaxis=dict(range=[0, max(y) * 1.2]),
+            template="simple_white",
+            margin=dict(l=40, r=40, t=80, b=40),
+        )
+        return fig
+
+
+class ChoroplethFigures:
+    def __init__(self, matrix, max_entries=8):
+        self.matrix = matrix
+        self.max_entries = max_entries
+        values = np.asarray(matrix.values, dtype=np.float64)
+        # 색 범위는 유형마다 전체 국가의 최소/최대 (한 번에 계산)
+        self._ranges = dict(zip(matrix.types, zip(values.min(axis=0).tolist(), values.max(axis=0).tolist())))
+        self._lock = threading.Lock()
+        self._figures = OrderedDict()  # 유형 -> go.Figure
+
+    def figure(self, mbti_type):
+        with self._lock:
+            fig = self._figures.get(mbti_type)
+            if fig is not None:
+                self._figures.move_to_end(mbti_type)
+                return fig
+        fig = self._build(mbti_type)
+        with self._lock:
+            fig = self._figures.setdefault(mbti_type, fig)
+            self._figures.move_to_end(mbti_type)
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return fig
+
+    def _build(self, mbti_type):
+        j = self.matrix.types.index(mbti_type)
+        shares = np.round(np.asarray(self.matrix.values[:, j], dtype=np.float64) * 100, 2).tolist()
+        zmin, zmax = self._ranges[mbti_type]
+
+        fig = go.Figure(
+            go.Choropleth(
+                locations=self.matrix.countries,
+                locationmode="country names",
+                z=shares,
+                zmin=zmin * 100,
+                zmax=zmax * 100,
+                colorscale="Reds",
+                colorbar=dict(title="%"),
+                hovertemplate="<b>%{location}</b><br>%{z:.2f}%<extra></extra>",
+            )
+        )
+        fig.update_layout(
+            title=f"국가별 {mbti_type} 비율",
+            geo=dict(showframe=False, showcoastlines=False, projection_type="natural earth"),
+            margin=dict(l=0, r=0, t=60, b=0),
+        )
+        return fig
@@ -0,0 +1,67 @@
+"""국가 x MBTI 16유형 비율 행렬.
+
+DataFrame 에서 df[df["Country"] == 국가] 로 매번 전체를 훑는 대신,
+값은 (국가 수, 16) float 행렬 하나로 들고 국가 -> 행 번호는 dict 로 찾는다.
+열은 파일의 헤더 순서가 아니라 이름으로 골라서 MBTI_TYPES 순서로 맞춘다.
+"""
+import bisect
+from itertools import islice, takewhile
+
+import numpy as np
+
+# 화면에 보여주는 순서 (CSV 헤더 순서와는 다르다)
+MBTI_TYPES = (
+    "INFJ", "ISFJ", "INTP", "ISFP",
+    "ENTP", "INFP", "ENTJ", "ISTP",
+    "INTJ", "ESFP", "ENFP", "ESTP",
+    "ISTJ", "ESTJ", "ENFJ", "ESFJ",
+)
+
+
+class CountryMatrix:
+    def __init__(self, countries, values, types=MBTI_TYPES):
+        self.countries = list(countries)
+        self.types = tuple(types)
+        # 스냅샷에서 매핑한 float32 배열은 복사하지 않도록 실수형이면 dtype 을 그대로 둔다.
+        self.values = np.asarray(values)
+        if not np.issubdtype(self.values.dtype, np.floating):
+            self.values = self.values.astype(np.float64)
+        if self.values.shape != (len(self.countries), len(self.types)):
+            raise ValueError(f"shape mismatch: {self.values.shape}")
+        # 같은 국가가 두 번 나오면 예전 코드(.iloc[0])처럼 첫 행을 쓴다.
+        self.index = {}
+        for i, country in enumerate(self.countries):
+            self.index.setdefault(country, i)
+        self.sorted_countries = sorted(self.index)
+
+    @classmethod
+    def from_frame(cls, df, types=MBTI_TYPES):
+        return cls(df["Country"].tolist(), df[list(types)].to_numpy(), types)
+
+    def __len__(self):
+        return len(self.countries)
+
+    def __contains__(self, country):
+        return country in self.index
+
+    def search(self, query, limit=50):
+        """이름에 query 가 들어간 국가 최대 limit 개. 앞부분이 같은 이름(bisect)을 먼저,
+        나머지는 대소문자 없이 부분 일치로 채운다. (행이 많은 데이터셋의 검색 상자용)"""
+        start = bisect.bisect_left(self.sorted_countries, query)
+        prefixed = islice(self.sorted_countries, start, None)
+        matches = list(islice(takewhile(lambda c: c.startswith(query), prefixed), limit))
+        if len(matches) < limit:
+            seen = set(matches)
+            needle = query.casefold()
+            matches += islice(
+                (c for c in self.sorted_countries if needle in c.casefold() and c not in seen),
+                limit - len(matches),
+            )
+        return matches
+
+    def row(self, country):
+        return self.values[self.index[country]]
+
+    def shares(self, country, decimals=6):
+        """화면 표시용 파이썬 float 목록. (float32 저장 오차는 반올림해서 없앤다)"""
+        return np.round(self.row(country).astype(np.float64), decimals).tolist()
@@ -0,0 +1,172 @@
+"""MBTI 비율 CSV 를 조각(chunk) 단위로 읽어 이진 스냅샷으로 쌓는다.
+
+파일 전체를 메모리에 올리지 않고 pd.read_csv(chunksize=...) 로 읽으면서
+  - 열은 이름으로 찾는다. (헤더 순서와 상관없이 MBTI_TYPES 순서로 맞춤,
+    없는 열이 있으면 SchemaError)
+  - 숫자가 아니거나 음수인 값, 16유형 합이 1 에서 tolerance 이상 벗어난 행은 버리고
+    몇 번째 행이 왜 빠졌는지 보고한다.
+  - 0.054900000000000004 같은 실수 잡음은 소수 6자리로 반올림한다.
+    (renormalize=True 면 행마다 합이 1이 되도록 다시 나눈다)
+  - 통과한 행은 float32 로 임시 파일에 이어 쓰고, 끝나면 .npy 헤더를 붙여
+    values.npy 로 바꾼다. 그래서 메모리는 조각 하나 + 이름 목록만큼만 쓴다.
+append=True 면 기존 스냅샷 뒤에 이어 붙인다. (연도별 파일을 차례로 넣는 경우)
+기존 스냅샷이 있는데 열 수 없으면(깨졌거나 유형 순서가 다름) 새로 만들어 덮어쓰지 않고
+SchemaError 를 낸다. (쌓아 둔 행을 조용히 잃지 않도록)
+
+    python -m mbti.ingest regions_2025.csv --dataset regions --label-columns Country Region
+    python -m mbti.ingest regions_2026.csv --dataset regions --label-columns Country Region --append
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mbti.data import MBTI_TYPES
+from mbti.snapshot import (
+    CSV_PATH, META_FILE, SNAPSHOT_DIR, SNAPSHOT_DTYPE, VALUES_FILE,
+    base_stamp, dataset_dir, load_matrix, open_snapshot, read_meta, source_stamp, write_atomic, write_meta,
+)
+
+CHUNK_ROWS = 100_000
+SUM_TOLERANCE = 0.05
+DECIMALS = 6
+MAX_EXAMPLES = 20
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def check_header(csv_path, types=MBTI_TYPES, label_columns=("Country",)):
+    header = pd.read_csv(csv_path, nrows=0).columns
+    missing = [c for c in (*label_columns, *types) if c not in header]
+    if missing:
+        raise SchemaError(f"{Path(csv_path).name}: 열이 없습니다: {', '.join(missing)}")
+
+
+def validated_chunks(csv_path, types=MBTI_TYPES, label_columns=("Country",), chunksize=CHUNK_ROWS,
+                     tolerance=SUM_TOLERANCE, renormalize=False, report=None):
+    """(이름 목록, (행 수, 16) float64) 를 조각마다 내보낸다. 버린 행은 report 에 적는다."""
+    check_header(csv_path, types, label_columns)
+    report = report if report is not None else {"rows": 0, "rejected": 0, "examples": []}
+    reader = pd.read_csv(
+        csv_path, usecols=[*label_columns, *types], chunksize=chunksize, dtype={c: str for c in label_columns}
+    )
+    offset = 0
+    for chunk in reader:
+        values = chunk[list(types)].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+        totals = values.sum(axis=1)
+        finite = np.isfinite(values).all(axis=1)
+        ok = finite & (values >= 0).all(axis=1) & (np.abs(totals - 1.0) <= tolerance)
+
+        for i in np.flatnonzero(~ok)[: MAX_EXAMPLES - len(report["examples"])]:
+            reason = "숫자가 아닌 값" if not finite[i] else (
+                "음수 값" if (values[i] < 0).any() else f"합계 {totals[i]:.4f}"
+            )
+            report["examples"].append((offset + int(i) + 2, reason))  # 헤더 포함 파일 줄 번호
+        report["rejected"] += int((~ok).sum())
+        report["rows"] += int(ok.sum())
+        offset += len(chunk)
+
+        labels = chunk[label_columns[0]].fillna("")
+        for column in label_columns[1:]:
+            labels = labels + " / " + chunk[column].fillna("")
+        values = values[ok]
+        if renormalize:
+            values /= totals[ok, None]
+        yield labels[ok].tolist(), np.round(values, DECIMALS)
+
+
+def _write_npy(path, raw, rows, columns):
+    # 임시 파일(raw)에 이어 쓴 float32 바이트 앞에 .npy 헤더만 붙인다. (전체를 메모리에 올리지 않음)
+    def write(f):
+        np.lib.format.write_array_header_1_0(f, {
+            "descr": np.lib.format.dtype_to_descr(np.dtype(SNAPSHOT_DTYPE)),
+            "fortran_order": False,
+            "shape": (rows, columns),
+        })
+        raw.seek(0)
+        shutil.copyfileobj(raw, f, 1 << 20)
+
+    write_atomic(path, write)
+
+
+def ingest_csv(csv_path, snapshot_dir=SNAPSHOT_DIR, types=MBTI_TYPES, label_columns=("Country",),
+               append=False, chunksize=CHUNK_ROWS, tolerance=SUM_TOLERANCE, renormalize=False):
+    """csv_path 를 검증하며 snapshot_dir 에 저장한다. {"rows", "rejected", "examples"} 보고를 돌려준다."""
+    snapshot_dir = Path(snapshot_dir)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    dtype = np.dtype(SNAPSHOT_DTYPE)
+    report = {"rows": 0, "rejected": 0, "examples": []}
+    labels, sources, base = [], [], None
+    existing = open_snapshot(snapshot_dir, types) if append else None
+    if append and existing is None and any((snapshot_dir / f).exists() for f in (META_FILE, VALUES_FILE)):
+        raise SchemaError(f"{snapshot_dir}: 기존 스냅샷을 열 수 없어 이어 붙이지 않았습니다. "
+                          "(파일이 깨졌거나 유형 순서가 다름 — 확인 후 --append 없이 다시 만드세요)")
+
+    with tempfile.TemporaryFile(dir=snapshot_dir) as raw:
+        if existing is not None:
+            for start in range(0, len(existing), chunksize):
+                raw.write(np.ascontiguousarray(existing.values[start:start + chunksize], dtype=dtype).tobytes())
+            labels.extend(existing.countries)
+            meta = read_meta(snapshot_dir)
+            sources = meta.get("sources", [])
+            base = base_stamp(meta)
+
+        for chunk_labels, values in validated_chunks(
+            csv_path, types, label_columns, chunksize, tolerance, renormalize, report
+        ):
+            raw.write(values.astype(dtype).tobytes())
+            labels.extend(chunk_labels)
+
+        raw.flush()
+        _write_npy(snapshot_dir / VALUES_FILE, raw, len(labels), len(types))
+
+    stamp = source_stamp(csv_path)
+    write_meta(snapshot_dir, {
+        # 기본 스냅샷이 낡았는지는 처음 만든 CSV(base)로만 판단한다. (이어 붙인 파일과는 비교하지 않음)
+        "base": base or stamp,
+        "sources": sources + [stamp],
+        "types": list(types),
+        "label_columns": list(label_columns),
+        "countries": labels,
+    })
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MBTI 비율 CSV 를 검증하며 이진 스냅샷으로 저장한다.")
+    parser.add_argument("csv", type=Path, nargs="?", default=CSV_PATH)
+    parser.add_argument("--dataset", help="data/mbti/datasets/<이름> 에 저장 (기본: 국가별 기본 스냅샷)")
+    parser.add_argument("--label-columns", nargs="+", default=["Country"])
+    parser.add_argument("--append", action="store_true")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--tolerance", type=float, default=SUM_TOLERANCE)
+    parser.add_argument("--renormalize", action="store_true")
+    args = parser.parse_args(argv)
+
+    target = dataset_dir(args.dataset) if args.dataset else SNAPSHOT_DIR
+    if args.append and not args.dataset:
+        # 기본 스냅샷에 이어 붙일 때는 먼저 기본 CSV 로 최신 스냅샷을 만들어 둔다.
+        # (없거나 낡은 상태에서 붙이면 다음 페이지 로드 때 다시 만들어지며 사라진다)
+        load_matrix(snapshot_dir=target)
+    try:
+        report = ingest_csv(
+            args.csv, target, label_columns=tuple(args.label_columns), append=args.append,
+            chunksize=args.chunksize, tolerance=args.tolerance, renormalize=args.renormalize,
+        )
+    except SchemaError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"{target}: {report['rows']:,} rows stored, {report['rejected']:,} rejected")
+    for line, reason in report["examples"]:
+        print(f"  line {line}: {reason}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
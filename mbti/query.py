@@ -0,0 +1,167 @@
+"""MBTI 행렬 질의 엔진 (유형별 순위 / 전체 평균 / 지표별 합계 / 조건 검색).
+
+  - 유형별 순위: 처음에 16개 열을 한꺼번에 argsort 해 두고 앞에서 k개만 꺼낸다.
+  - 지표별 합계(E/I, S/N, T/F, J/P): (16, 8) 지시 행렬과의 곱 한 번으로
+    모든 국가의 E, I, S, N, T, F, J, P 비율을 구한다.
+  - 조건 검색: "E > 0.5", "INTJ >= 0.03 and N > 0.45" 같은 식을 ast 로 파싱해서
+    허용된 노드(비교, and/or/not, 사칙연산, 숫자, 유형/지표 이름)만 열 단위로 계산한다.
+    eval 은 쓰지 않는다.
+결과는 질의 키(조건식은 파싱 결과 기준)로 LRU 캐시해서 같은 화면을 다시 그릴 때는
+계산하지 않는다. 결과는 튜플이라 여러 세션이 같이 써도 안전하다.
+"""
+import ast
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+LETTERS = ("E", "I", "S", "N", "T", "F", "J", "P")
+DICHOTOMIES = (("E", "I"), ("S", "N"), ("T", "F"), ("J", "P"))
+CACHE_SIZE = 256
+
+
+class QueryError(ValueError):
+    pass
+
+
+def dichotomy_indicator(types):
+    """(유형 수, 8) 0/1 행렬. 유형 이름에 해당 글자가 있으면 1."""
+    return np.array([[letter in t for letter in LETTERS] for t in types], dtype=np.float64)
+
+
+_BINOPS = {ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.divide}
+_COMPARES = {
+    ast.Gt: np.greater, ast.GtE: np.greater_equal,
+    ast.Lt: np.less, ast.LtE: np.less_equal,
+    ast.Eq: np.isclose, ast.NotEq: lambda a, b: ~np.isclose(a, b),
+}
+
+
+def parse_filter(expression):
+    try:
+        return ast.parse(expression.strip(), mode="eval").body
+    except SyntaxError as e:
+        raise QueryError(f"조건식을 읽을 수 없습니다: {expression!r}") from e
+
+
+def _condition(node, columns):
+    """and/or/not 의 피연산자. 국가마다 참/거짓이 하나씩 나오는 비교식이어야 한다."""
+    value = _evaluate(node, columns)
+    rows = len(next(iter(columns.values())))
+    if not (isinstance(value, np.ndarray) and value.dtype == bool and value.shape == (rows,)):
+        raise QueryError(f"and/or/not 에는 비교식만 쓸 수 있습니다: {ast.unparse(node)}")
+    return value
+
+
+def _number(node, columns):
+    """사칙연산/비교의 피연산자. 비교 결과(참/거짓)는 받지 않는다."""
+    value = _evaluate(node, columns)
+    if isinstance(value, np.ndarray) and value.dtype == bool:
+        raise QueryError(f"비교식에는 계산/비교를 이어 쓸 수 없습니다: {ast.unparse(node)}")
+    return value
+
+
+def _evaluate(node, columns):
+    if isinstance(node, ast.BoolOp):
+        parts = [_condition(v, columns) for v in node.values]
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        return combine.reduce(parts)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return ~_condition(node.operand, columns)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return -_number(node.operand, columns)
+    if isinstance(node, ast.Compare):
+        # 0.3 < E < 0.6 같은 연쇄 비교도 허용
+        left, result = _number(node.left, columns), None
+        for op, comparator in zip(node.ops, node.comparators):
+            if type(op) not in _COMPARES:
+                raise QueryError(f"지원하지 않는 비교입니다: {type(op).__name__}")
+            right = _number(comparator, columns)
+            part = _COMPARES[type(op)](left, right)
+            result = part if result is None else result & part
+            left = right
+        return result
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+        return _BINOPS[type(node.op)](_number(node.left, columns), _number(node.right, columns))
+    if isinstance(node, ast.Name):
+        if node.id not in columns:
+            raise QueryError(f"알 수 없는 이름입니다: {node.id}")
+        return columns[node.id]
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    raise QueryError(f"지원하지 않는 식입니다: {ast.unparse(node)}")
+
+
+class QueryEngine:
+    def __init__(self, matrix, cache_size=CACHE_SIZE):
+        self.matrix = matrix
+        self.types = matrix.types
+        self._values = np.asarray(matrix.values, dtype=np.float64)
+        # 열마다 큰 값 -> 작은 값 순서의 행 번호 (같은 값이면 원래 순서)
+        self._order = np.argsort(-self._values, axis=0, kind="stable")
+        self._letters = self._values @ dichotomy_indicator(self.types)
+        self._columns = {t: self._values[:, j] for j, t in enumerate(self.types)}
+        self._columns.update({l: self._letters[:, j] for j, l in enumerate(LETTERS)})
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+
+    def _memo(self, key, compute):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        result = compute()
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    # ---------- 질의 ----------
+    def top(self, mbti_type, k=10, ascending=False):
+        """((국가, 비율), ...) 해당 유형 비율이 높은(ascending 이면 낮은) 순 k개."""
+        j = self.types.index(mbti_type)
+
+        def compute():
+            order = self._order[:, j]
+            rows = order[::-1][:k] if ascending else order[:k]
+            return tuple((self.matrix.countries[i], float(self._values[i, j])) for i in rows)
+
+        return self._memo(("top", mbti_type, k, ascending), compute)
+
+    def global_mean(self):
+        """((유형, 국가 평균 비율), ...) 16유형."""
+        return self._memo(
+            ("mean",),
+            lambda: tuple(zip(self.types, self._values.mean(axis=0).tolist())),
+        )
+
+    def dichotomies(self, country=None):
+        """((글자, 비율), ...) E, I, S, N, T, F, J, P. country 가 없으면 국가 평균."""
+        def compute():
+            row = self._letters.mean(axis=0) if country is None else self._letters[self.matrix.index[country]]
+            return tuple(zip(LETTERS, row.tolist()))
+
+        return self._memo(("dichotomies", country), compute)
+
+    def letter_share(self, letter):
+        """모든 국가의 해당 글자(E, N ...) 유형 합계 비율 (국가 순서 그대로)."""
+        return self._letters[:, LETTERS.index(letter)]
+
+    def filter(self, expression):
+        """((국가, {이름: 값}), ...) 조건식을 만족하는 국가. 식에 나온 이름의 값을 같이 돌려준다."""
+        tree = parse_filter(expression)
+        names = tuple(dict.fromkeys(n.id for n in ast.walk(tree) if isinstance(n, ast.Name)))
+
+        def compute():
+            mask = _evaluate(tree, self._columns)
+            if np.ndim(mask) == 0 or np.asarray(mask).dtype != bool:
+                raise QueryError("조건식은 비교식이어야 합니다. (예: E > 0.5)")
+            return tuple(
+                (self.matrix.countries[i], {n: float(self._columns[n][i]) for n in names})
+                for i in np.flatnonzero(mask)
+            )
+
+        # 띄어쓰기만 다른 식은 같은 키가 되도록 파싱 결과로 캐시한다.
+        return self._memo(("filter", ast.dump(tree)), compute)
@@ -0,0 +1,128 @@
+"""국가 간 MBTI 분포 유사도 / 군집.
+
+모든 계산은 (국가 수, 16) 행렬 단위의 NumPy 연산이다. (국가별 파이썬 루프 없음)
+
+  - 거리: 코사인 거리(1 - 코사인 유사도), Jensen-Shannon 거리(밑 2, 0~1)
+  - pairwise_distances: 전체 거리 행렬. 행을 블록으로 나눠 계산하므로
+    중간 배열 크기가 (블록 행 수, n, 16) 을 넘지 않는다.
+  - SimilarityIndex: 거리 행렬이 있으면 행 하나를 꺼내고, 행 수가 많아
+    거리 행렬을 만들 수 없으면 한 국가 대 전체만 그때그때 계산한다.
+    가장 가까운 k개는 argpartition 으로 고른다. (전체 정렬 없음)
+  - kmeans: k-means++ 초기화 + Lloyd 반복
+"""
+import numpy as np
+
+BLOCK_ELEMENTS = 4_000_000  # 블록 하나의 (행 x n x 16) 원소 수 상한
+PRECOMPUTE_LIMIT = 5_000    # 이보다 행이 많으면 거리 행렬을 미리 만들지 않는다
+
+METRIC_LABELS = {"cosine": "코사인", "jensen-shannon": "Jensen-Shannon"}
+
+
+def as_distributions(values):
+    """각 행을 합이 1인 분포로 맞춘다. (CSV 의 반올림 오차 보정)"""
+    x = np.asarray(values, dtype=np.float64)
+    totals = x.sum(axis=1, keepdims=True)
+    return np.divide(x, totals, out=np.zeros_like(x), where=totals > 0)
+
+
+def _entropy(p, axis=-1):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return -np.where(p > 0, p * np.log2(p), 0.0).sum(axis=axis)
+
+
+def cosine_distances(a, b):
+    a_norm = a / np.maximum(np.linalg.norm(a, axis=1, keepdims=True), 1e-12)
+    b_norm = b / np.maximum(np.linalg.norm(b, axis=1, keepdims=True), 1e-12)
+    return np.clip(1.0 - a_norm @ b_norm.T, 0.0, 2.0)
+
+
+def js_distances(a, b):
+    # JS(P, Q) = H((P + Q) / 2) - (H(P) + H(Q)) / 2, 거리는 그 제곱근
+    mixed = _entropy((a[:, None, :] + b[None, :, :]) / 2)
+    divergence = mixed - (_entropy(a)[:, None] + _entropy(b)[None, :]) / 2
+    return np.sqrt(np.clip(divergence, 0.0, 1.0))
+
+
+METRICS = {"cosine": cosine_distances, "jensen-shannon": js_distances}
+
+
+def pairwise_distances(values, metric="cosine", dtype=np.float32):
+    x = as_distributions(values)
+    n = len(x)
+    distance = METRICS[metric]
+    block = max(1, BLOCK_ELEMENTS // max(1, n * x.shape[1]))
+    out = np.empty((n, n), dtype=dtype)
+    for start in range(0, n, block):
+        out[start:start + block] = distance(x[start:start + block], x)
+    np.fill_diagonal(out, 0.0)
+    return out
+
+
+def nearest(distances, k, exclude=None):
+    """거리 배열에서 가장 가까운 k개의 위치 (가까운 순)."""
+    distances = np.asarray(distances, dtype=np.float64)
+    if exclude is not None:
+        distances = distances.copy()
+        distances[exclude] = np.inf
+    k = min(k, len(distances) - (0 if exclude is None else 1))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    picked = np.argpartition(distances, k - 1)[:k]
+    return picked[np.argsort(distances[picked], kind="stable")]
+
+
+class SimilarityIndex:
+    def __init__(self, matrix, metric="cosine", distances=None, precompute_limit=PRECOMPUTE_LIMIT):
+        self.matrix = matrix
+        self.metric = metric
+        self._x = as_distributions(matrix.values)
+        if distances is None and len(matrix) <= precompute_limit:
+            distances = pairwise_distances(self._x, metric)
+        self._distances = distances
+
+    def distances_from(self, country):
+        i = self.matrix.index[country]
+        if self._distances is not None:
+            return self._distances[i]
+        return METRICS[self.metric](self._x[i:i + 1], self._x)[0]
+
+    def most_similar(self, country, k=10):
+        """[(국가, 거리)] 자기 자신을 뺀 가장 가까운 k개."""
+        i = self.matrix.index[country]
+        row = self.distances_from(country)
+        return [(self.matrix.countries[j], float(row[j])) for j in nearest(row, k, exclude=i)]
+
+
+def kmeans(values, k, iterations=100, seed=0):
+    """(labels, centers). 군집 번호는 크기가 큰 순서로 0, 1, 2 ..."""
+    x = np.asarray(values, dtype=np.float64)
+    n = len(x)
+    k = max(1, min(k, n))
+    rng = np.random.default_rng(seed)
+
+    # k-means++ : 이미 고른 중심에서 먼 점일수록 다음 중심으로 뽑힐 확률이 높다.
+    centers = np.empty((k, x.shape[1]))
+    centers[0] = x[rng.integers(n)]
+    closest = ((x - centers[0]) ** 2).sum(axis=1)
+    for j in range(1, k):
+        total = closest.sum()
+        p = closest / total if total > 0 else None
+        centers[j] = x[rng.choice(n, p=p)]
+        closest = np.minimum(closest, ((x - centers[j]) ** 2).sum(axis=1))
+
+    sq_norms = (x ** 2).sum(axis=1)[:, None]
+    for _ in range(iterations):
+        labels = (sq_norms - 2 * x @ centers.T + (centers ** 2).sum(axis=1)).argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, x)
+        updated = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers)
+        if np.allclose(updated, centers):
+            break
+        centers = updated
+    labels = (sq_norms - 2 * x @ centers.T + (centers ** 2).sum(axis=1)).argmin(axis=1)
+
+    order = np.argsort(-np.bincount(labels, minlength=k), kind="stable")
+    relabel = np.empty(k, dtype=np.intp)
+    relabel[order] = np.arange(k)
+    return relabel[labels], centers[order]
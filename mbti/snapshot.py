@@ -0,0 +1,167 @@
+"""countriesMBTI_16types.csv 의 이진 스냅샷.
+
+CSV 는 0.054900000000000004 처럼 긴 실수 문자열이라 프로세스마다 파싱하는 데
+시간이 들고, pandas DataFrame 으로 들고 있으면 메모리도 많이 쓴다.
+처음 한 번 CSV 를 읽어서
+
+    data/mbti/
+      values.npy     (국가 수, 16) float32 행렬 (MBTI_TYPES 순서)
+      meta.json      국가 이름 목록 + 유형 순서 + 원본 CSV 의 크기/수정 시각
+                     ("base": 기본 CSV, "sources": 이어 붙인 파일까지 전부)
+
+으로 저장해 두고, 이후에는 values.npy 를 np.load(mmap_mode="r") 로 매핑만 한다.
+(복사 없이 OS 페이지 캐시를 모든 워커가 같이 쓴다.)
+기본 CSV 의 크기나 수정 시각이 meta.json 의 "base" 와 다르면 스냅샷이 낡은 것으로 보고
+CSV 를 다시 읽어 새로 만든다. (mbti.ingest 로 검증하면서 조각 단위로 읽는다)
+mbti.ingest --append 로 이어 붙인 행은 "base" 를 바꾸지 않으므로 그대로 남는다.
+(기본 CSV 자체가 바뀌면 스냅샷을 새로 만들므로 그때는 다시 이어 붙여야 한다)
+
+지역별/연도별처럼 큰 데이터는 mbti.ingest 로 data/mbti/datasets/<이름>/ 에
+같은 형식으로 쌓아 두고 load_dataset(이름) 으로 매핑한다. (탐색 페이지 사이드바에서 고름)
+"""
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from mbti.data import MBTI_TYPES, CountryMatrix
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+CSV_PATH = ROOT_DIR / "countriesMBTI_16types.csv"
+SNAPSHOT_DIR = Path(os.environ.get("MBTI_DATA_DIR", ROOT_DIR / "data" / "mbti"))
+DATASETS_DIR = SNAPSHOT_DIR / "datasets"
+VALUES_FILE = "values.npy"
+META_FILE = "meta.json"
+SNAPSHOT_DTYPE = np.float32
+
+
+def write_atomic(path, write):
+    """write(f) 로 임시 파일에 쓴 뒤 이름만 바꾼다. (읽는 쪽은 반쯤 쓰인 파일을 보지 않음)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def source_stamp(csv_path):
+    st = os.stat(csv_path)
+    return {"source": Path(csv_path).name, "source_size": st.st_size, "source_mtime_ns": st.st_mtime_ns}
+
+
+def base_stamp(meta):
+    """스냅샷을 처음 만든 기본 CSV 의 기록. (예전 meta.json 은 최상위에 들어 있음)"""
+    return meta.get("base", meta)
+
+
+def read_csv_matrix(csv_path=CSV_PATH, types=MBTI_TYPES):
+    import pandas as pd
+
+    return CountryMatrix.from_frame(pd.read_csv(csv_path), types)
+
+
+def write_snapshot(matrix, csv_path=CSV_PATH, snapshot_dir=SNAPSHOT_DIR):
+    """matrix 를 스냅샷으로 저장한다. values.npy 를 먼저 바꾸고 meta.json 을 나중에
+    바꾸므로, meta.json 이 새 것이면 values.npy 도 항상 새 것이다."""
+    snapshot_dir = Path(snapshot_dir)
+    values = np.ascontiguousarray(matrix.values, dtype=SNAPSHOT_DTYPE)
+    stamp = source_stamp(csv_path)
+    meta = {
+        "base": stamp,
+        "sources": [stamp],
+        "types": list(matrix.types),
+        "countries": list(matrix.countries),
+    }
+    write_atomic(snapshot_dir / VALUES_FILE, lambda f: np.save(f, values))
+    write_meta(snapshot_dir, meta)
+
+
+def write_meta(snapshot_dir, meta):
+    write_atomic(
+        Path(snapshot_dir) / META_FILE,
+        lambda f: f.write(json.dumps(meta, ensure_ascii=False).encode("utf-8")),
+    )
+
+
+def read_meta(snapshot_dir):
+    try:
+        return json.loads((Path(snapshot_dir) / META_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def open_snapshot(snapshot_dir, types=MBTI_TYPES, meta=None):
+    """스냅샷을 메모리 매핑한 CountryMatrix. 없거나 형식이 맞지 않으면 None."""
+    meta = meta or read_meta(snapshot_dir)
+    if meta is None or tuple(meta.get("types", ())) != tuple(types):
+        return None
+    try:
+        values = np.load(Path(snapshot_dir) / VALUES_FILE, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    if values.shape != (len(meta["countries"]), len(types)):
+        return None
+    return CountryMatrix(meta["countries"], values, types)
+
+
+def read_snapshot(csv_path=CSV_PATH, snapshot_dir=SNAPSHOT_DIR, types=MBTI_TYPES):
+    """스냅샷이 원본과 맞으면 메모리 매핑한 CountryMatrix, 아니면 None."""
+    meta = read_meta(snapshot_dir)
+    try:
+        stamp = source_stamp(csv_path)
+    except OSError:
+        return None
+    if meta is None:
+        return None
+    base = base_stamp(meta)
+    if (base.get("source_size"), base.get("source_mtime_ns")) != (
+        stamp["source_size"], stamp["source_mtime_ns"]
+    ):
+        return None
+    return open_snapshot(snapshot_dir, types, meta)
+
+
+def load_matrix(csv_path=CSV_PATH, snapshot_dir=SNAPSHOT_DIR, types=MBTI_TYPES):
+    """스냅샷을 매핑해서 돌려준다. 없거나 낡았으면 CSV 를 검증하며 읽어 스냅샷을 새로 만든다."""
+    matrix = read_snapshot(csv_path, snapshot_dir, types)
+    if matrix is not None:
+        return matrix
+    from mbti.ingest import ingest_csv  # pandas 는 스냅샷을 새로 만들 때만 불러온다
+
+    try:
+        ingest_csv(csv_path, snapshot_dir, types)
+    except OSError:
+        # 읽기 전용 배포 등으로 저장할 수 없으면 CSV 결과를 그대로 쓴다.
+        return read_csv_matrix(csv_path, types)
+    return read_snapshot(csv_path, snapshot_dir, types) or read_csv_matrix(csv_path, types)
+
+
+def dataset_dir(name):
+    return DATASETS_DIR / name
+
+
+def list_datasets():
+    """mbti.ingest 로 쌓아 둔 데이터셋 이름 목록."""
+    if not DATASETS_DIR.is_dir():
+        return []
+    return sorted(p.parent.name for p in DATASETS_DIR.glob(f"*/{META_FILE}"))
+
+
+def dataset_version(name):
+    """meta.json 은 values.npy 다음에 바뀌므로, 그 수정 시각을 데이터셋 버전으로 쓴다."""
+    try:
+        return os.stat(dataset_dir(name) / META_FILE).st_mtime_ns
+    except OSError:
+        return None
+
+
+def load_dataset(name, types=MBTI_TYPES):
+    """mbti.ingest 로 쌓은 데이터셋을 메모리 매핑한다. 없으면 None."""
+    return open_snapshot(dataset_dir(name), types)
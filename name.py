@@ -1,10 +1,30 @@
+from concurrent.futures import TimeoutError as OrderTimeout
+
 import streamlit as st
 
+import perf
+from kiosk import pricing
+from kiosk.analytics import get_sales_rollup
+from kiosk.cart import Cart
+from kiosk.catalog import get_catalog_source
+from kiosk.inventory import SoldOut, get_inventory, scoop_usage
+from kiosk.orders import get_journal, make_order
+
 # 🍨 Baskin-Robbins 스타일 키오스크 (Streamlit)
 # ➜ 외부 라이브러리 X, streamlit 기본만 사용
 
 st.set_page_config(page_title="🍨 BR Kiosk", page_icon="🍦", layout="centered")
 
+# 재실행 프로파일링 (APP_PERF=0 이면 꺼짐)
+profiler = perf.get_profiler("kiosk")
+profiler.begin_rerun()
+
+# 장바구니는 세션마다 하나. (줄마다 가격을 담을 때 계산해 두고, 합계는 바뀐 줄만큼만 고친다)
+if "cart" not in st.session_state:
+    st.session_state.cart = Cart()
+    st.session_state.cart_editing = None  # 수정 중인 장바구니 줄 번호
+cart = st.session_state.cart
+
 # --- 전체 테마용 CSS (베스킨라빈스 느낌 색감) ---
 st.markdown(
     """
@@ -62,20 +82,16 @@ with st.container():
 # ======================
 # 2) 용기 선택
 # ======================
-containers = {
-    "싱글컵 (1스쿱)": {"type": "cup", "scoops": 1, "price_per_scoop": 3300, "surcharge": 0},
-    "더블컵 (2스쿱)": {"type": "cup", "scoops": 2, "price_per_scoop": 3100, "surcharge": 0},  # 예시 단가
-    "싱글콘 (슈가콘, 1스쿱)": {"type": "cone", "scoops": 1, "price_per_scoop": 3500, "surcharge": 0},
-    "싱글콘 (와플콘, 1스쿱)": {"type": "cone", "scoops": 1, "price_per_scoop": 3500, "surcharge": 500},
-    "파인트 (약 3~4스쿱)": {"type": "pint", "scoops": 4, "price_fixed": 9900, "surcharge": 0},
-    "쿼터 (약 4가지 맛)": {"type": "quart", "scoops": 4, "price_fixed": 15500, "surcharge": 0},
-    "패밀리 (약 5가지 맛)": {"type": "family", "scoops": 5, "price_fixed": 22000, "surcharge": 0},
-    "하프갤런 (약 6가지 맛)": {"type": "half_gallon", "scoops": 6, "price_fixed": 27000, "surcharge": 0},
-}
+# 메뉴는 kiosk/menu.json 에서 읽는다. (파일이 바뀌면 재시작 없이 다음 재실행부터 반영)
+catalog_source = get_catalog_source()
+catalog = catalog_source.current()
+containers = catalog.containers
+if catalog_source.error:
+    st.sidebar.warning(f"메뉴 파일을 다시 읽지 못해 이전 메뉴를 쓰고 있어요: {catalog_source.error}")
 
 with st.container():
     st.markdown('<div class="br-box">', unsafe_allow_html=True)
-    container_choice = st.selectbox("2) 용기를 골라주세요 🥄", list(containers.keys()))
+    container_choice = st.selectbox("2) 용기를 골라주세요 🥄", catalog.container_names, key="container_choice")
     st.markdown('</div>', unsafe_allow_html=True)
 
 meta = containers[container_choice]
@@ -85,49 +101,21 @@ meta = containers[container_choice]
 #   (실제 베스킨라빈스에서 자주 볼 수 있는 인기 메뉴들 중심)
 # ======================
 
-# 대표적인 베라 맛들 (예시 - 수업/프로젝트용)
-classic_flavors = [
-    "엄마는외계인",
-    "슈팅스타",
-    "민트초코봉봉",
-    "아몬드봉봉",
-    "베리베리스트로베리",
-    "뉴욕치즈케이크",
-    "피스타치오아몬드",
-    "초코나무숲",
-    "바람과함께사라지다",
-    "초콜릿무스",
-    "레인보우샤베트",
-    "사랑에빠진딸기",
-    "체리쥬빌레",
-    "이상한나라의솜사탕",
-    "쿨민트",
-    "요거트",
-]
-
-# 시즌/스페셜 맛 예시
-seasonal_flavors = [
-    "아이스허니버터아몬드",
-    "치즈고구마",
-    "망고탱고",
-    "쿠앤크봉봉",
-]
-
-# 프리미엄/리치한 느낌의 맛 예시
-premium_flavors = [
-    "피칸프랄린",
-    "초콜릿브라우니",
-    "블랙소금카라멜",
-]
-
-# 용기 타입에 따라 선택 가능한 맛 범위 설정
-if meta["type"] in ("cup", "cone"):
-    available_flavors = classic_flavors + seasonal_flavors
-else:
-    available_flavors = classic_flavors + seasonal_flavors + premium_flavors
+# 용기 타입에 따라 선택 가능한 맛 범위 (카탈로그를 읽을 때 용기별로 미리 계산해 둠)
+# 품절된 맛은 뺀다. (재고는 메모리 스냅샷에서 읽고, 스냅샷이 바뀔 때만 다시 거른다)
+journal = get_journal()
+inventory = get_inventory(journal)
+get_sales_rollup(journal)  # 주문 기록 트랜잭션에서 매출 집계도 같이 갱신
+inventory.ensure(catalog)
+available_flavors = inventory.in_stock(catalog.available[container_choice])
 
 max_scoops = meta.get("scoops", 1)
 
+# 용기를 바꿨거나 그 사이 품절된 맛은 선택에서 뺀다. (위젯을 그리기 전이라 고쳐도 된다)
+if "chosen_flavors" in st.session_state:
+    allowed = set(available_flavors)
+    st.session_state.chosen_flavors = [f for f in st.session_state.chosen_flavors if f in allowed]
+
 with st.container():
     st.markdown('<div class="br-box">', unsafe_allow_html=True)
     if meta.get("price_fixed"):
@@ -138,6 +126,7 @@ with st.container():
         chosen_flavors = st.multiselect(
             f"3) 아이스크림 맛을 골라주세요 (최대 {max_scoops}가지) 🍦",
             available_flavors,
+            key="chosen_flavors",
         )
     else:
         scoops = max_scoops
@@ -145,6 +134,7 @@ with st.container():
         chosen_flavors = st.multiselect(
             f"3) 아이스크림 맛을 골라주세요 (최대 {scoops}가지) 🍦",
             available_flavors,
+            key="chosen_flavors",
         )
 
     if len(chosen_flavors) > max_scoops:
@@ -153,42 +143,58 @@ with st.container():
     st.markdown('</div>', unsafe_allow_html=True)
 
 # ======================
-# 4) 가격 계산
+# 4) 가격 계산 (지금 고른 구성)
 # ======================
-subtotal = 0
-price_breakdown = []
-
-if meta.get("price_fixed"):
-    subtotal = meta["price_fixed"]
-    price_breakdown.append(("용기(고정 가격)", meta["price_fixed"]))
-else:
-    price_per_scoop = meta.get("price_per_scoop", 0)
-    used_scoops = min(len(chosen_flavors), max_scoops)
-    scoop_cost = price_per_scoop * used_scoops
-    subtotal += scoop_cost
-    price_breakdown.append((f"스쿱 {used_scoops} x {price_per_scoop}원", scoop_cost))
-
-    surcharge = meta.get("surcharge", 0)
-    if surcharge:
-        subtotal += surcharge
-        price_breakdown.append(("와플콘 추가 요금", surcharge))
-
-# 간단 예시로 매장식사 시 세금 10% 적용
-tax_rate = 0.0
-if "매장식사" in dine_choice:
-    tax_rate = 0.10
-    tax = int(subtotal * tax_rate)
-else:
-    tax = 0
-
-total = subtotal + tax
+with profiler.section("pricing"):
+    quote = pricing.quote(meta, len(chosen_flavors), dine_choice)
+    subtotal = quote["subtotal"]
+    price_breakdown = quote["breakdown"]
+    tax_rate = quote["tax_rate"]
+    tax = quote["tax"]
+    total = quote["total"]
+
+selection_ok = 0 < len(chosen_flavors) <= max_scoops
+
+
+# --- 장바구니 버튼 콜백 (위젯보다 먼저 실행되므로 선택 위젯 값을 여기서 바꿀 수 있다) ---
+def reset_selection():
+    st.session_state.cart_editing = None
+    st.session_state.chosen_flavors = []
+
+
+def add_to_cart(container, container_meta, flavors):
+    cart.add(container, container_meta, flavors)
+    reset_selection()
+
+
+def save_cart_edit(line_id, container, container_meta, flavors):
+    cart.update(line_id, container, container_meta, flavors)
+    reset_selection()
+
+
+def start_cart_edit(line_id):
+    line = cart.lines[line_id]
+    st.session_state.cart_editing = line_id
+    if line["container"] in catalog.containers:
+        st.session_state.container_choice = line["container"]
+    # 담은 뒤에 품절됐거나 메뉴에서 빠진 맛은 빼고 불러온다.
+    st.session_state.chosen_flavors = inventory.in_stock(
+        [f for f in line["flavors"] if f in catalog.available.get(line["container"], ())]
+    )
+
+
+def remove_from_cart(line_id):
+    cart.remove(line_id)
+    if st.session_state.cart_editing == line_id:
+        reset_selection()
+
 
 # ======================
 # 5) 주문 요약
 # ======================
 with st.container():
     st.markdown('<div class="br-box">', unsafe_allow_html=True)
-    st.markdown("### 🧾 주문 요약")
+    st.markdown("### 🧾 지금 고른 구성")
     st.write(f"**용기:** {container_choice}")
     st.write(f"**식사 형태:** {dine_choice}")
     if chosen_flavors:
@@ -203,7 +209,50 @@ with st.container():
     if tax > 0:
         st.write(f"- 매장 세금 (예시 {int(tax_rate * 100)}%): {tax:,}원")
 
-    st.subheader(f"💰 총액: {total:,}원")
+    st.write(f"**이 구성 가격:** {total:,}원")
+
+    editing = st.session_state.cart_editing
+    if editing is not None and editing in cart.lines:
+        st.caption(f"장바구니 {list(cart.lines).index(editing) + 1}번째 구성을 수정하고 있어요.")
+        col_save, col_cancel = st.columns(2)
+        col_save.button(
+            "✏️ 수정 저장",
+            disabled=not selection_ok,
+            on_click=save_cart_edit,
+            args=(editing, container_choice, meta, list(chosen_flavors)),
+        )
+        col_cancel.button("취소", on_click=reset_selection)
+    else:
+        st.button(
+            "🛒 장바구니에 담기",
+            disabled=not selection_ok,
+            on_click=add_to_cart,
+            args=(container_choice, meta, list(chosen_flavors)),
+        )
+    st.markdown('</div>', unsafe_allow_html=True)
+
+with st.container():
+    st.markdown('<div class="br-box">', unsafe_allow_html=True)
+    st.markdown(f"### 🛒 장바구니 ({len(cart)}개)")
+    if len(cart) == 0:
+        st.write("장바구니가 비어 있어요. 위에서 고른 구성을 담거나 바로 결제할 수 있어요. 🍧")
+    for i, (line_id, line) in enumerate(cart, start=1):
+        line_quote = cart.line_quote(line_id, dine_choice)
+        col_text, col_edit, col_remove = st.columns([6, 1, 1])
+        col_text.write(f"{i}. **{line['container']}** — {', '.join(line['flavors'])} · {line_quote['total']:,}원")
+        col_edit.button("수정", key=f"cart_edit_{line_id}", on_click=start_cart_edit, args=(line_id,))
+        col_remove.button("삭제", key=f"cart_remove_{line_id}", on_click=remove_from_cart, args=(line_id,))
+
+    if len(cart):
+        cart_totals = cart.totals(dine_choice)
+        st.write(f"- 소계: {cart_totals['subtotal']:,}원")
+        if cart_totals["surcharge"] > 0:
+            st.write(f"- {pricing.SURCHARGE_LABEL} 합계: {cart_totals['surcharge']:,}원")
+        if cart_totals["tax"] > 0:
+            st.write(f"- 매장 세금 (예시 {int(tax_rate * 100)}%): {cart_totals['tax']:,}원")
+        st.subheader(f"💰 총액: {cart_totals['total']:,}원")
+    else:
+        st.subheader(f"💰 총액: {total:,}원")
     st.markdown('</div>', unsafe_allow_html=True)
 
 # ======================
@@ -222,38 +271,85 @@ with st.container():
 # 7) 결제 버튼 & 완료 화면 (핑크 하트 폭발 💗)
 # ======================
 if st.button("결제 진행하기 ✅"):
-    if len(chosen_flavors) == 0:
+    if len(cart) == 0 and len(chosen_flavors) == 0:
         st.error("아직 아이스크림 맛을 선택하지 않았어요. 먼저 맛부터 골라볼까요? 🍨")
-    elif len(chosen_flavors) > max_scoops:
+    elif len(cart) == 0 and len(chosen_flavors) > max_scoops:
         st.error(f"선택된 맛이 최대 스쿱 수({max_scoops})를 초과했어요. 다시 조정해 주세요. 🙏")
+    elif len(cart) and chosen_flavors:
+        # 장바구니에 담지 않은 선택이 남아 있으면 말없이 빼고 결제하지 않는다.
+        editing = st.session_state.cart_editing
+        if editing in cart.lines:
+            st.warning("수정 중인 구성이 아직 저장되지 않았어요. 저장하거나 취소한 뒤 다시 결제해 주세요. 🙏")
+            keep_label, keep_callback = "✏️ 수정 저장하기", save_cart_edit
+            keep_args = (editing, container_choice, meta, list(chosen_flavors))
+        else:
+            st.warning("장바구니에 담지 않은 구성이 있어요. 담거나 비운 뒤 다시 결제해 주세요. 🙏")
+            keep_label, keep_callback = "🛒 담고 계속하기", add_to_cart
+            keep_args = (container_choice, meta, list(chosen_flavors))
+        col_keep, col_drop = st.columns(2)
+        col_keep.button(keep_label, key="pending_keep", disabled=not selection_ok,
+                        on_click=keep_callback, args=keep_args)
+        col_drop.button("🗑️ 선택 비우기", key="pending_drop", on_click=reset_selection)
     else:
-        # 풍선 이펙트
-        st.balloons()
-
-        # 결제 성공 메시지
-        st.success(
-            f"결제가 완료되었습니다! 🎉\n\n"
-            f"총 **{total:,}원** — (**{payment_method}**)로 결제되었어요.\n"
-            "달콤한 아이스크림, 맛있게 드세요! 😋"
-        )
-
-        # 다양한 톤의 핑크 하트 연출
-        heart_line_1 = "💗 💖 💕 💓 💞 💗 💖 💕"
-        heart_line_2 = "💞 💓 💕 💖 💗 💞 💓 💕"
-        heart_line_3 = "💖 💗 💞 💕 💓 💖 💗 💞"
-
-        st.markdown(
-            f"""
-            <div style="text-align:center; font-size: 2rem; margin-top: 1rem;">
-                {heart_line_1}<br>
-                {heart_line_2}<br>
-                {heart_line_3}
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-        st.info("주문 영수증 화면을 직원에게 보여주시면, 바로 준비해 드릴게요. 감사합니다! 🙏")
+        if len(cart):
+            # 장바구니의 모든 줄을 주문 하나로 (재고 차감까지 한 트랜잭션)
+            order_lines = cart.order_lines(dine_choice)
+            order_total = cart.totals(dine_choice)["total"]
+        else:
+            # 장바구니 없이 지금 고른 구성만 바로 결제
+            order_lines = [{
+                "container": container_choice,
+                "flavors": chosen_flavors,
+                "usage": scoop_usage(meta, chosen_flavors),
+                "subtotal": subtotal,
+                "tax": tax,
+                "total": total,
+            }]
+            order_total = total
+
+        # 주문 기록 + 주문 번호 발급 (모든 키오스크가 같은 기록에 그룹 커밋, 커밋된 뒤에 번호를 보여준다)
+        # 재고 차감도 같은 트랜잭션에서 한다. 그 사이 품절되면 주문이 기록되지 않는다.
+        try:
+            with profiler.section("order_write"):
+                order_no = journal.place(make_order(order_lines, dine_choice, payment_method))
+        except SoldOut as e:
+            st.error(f"죄송해요, 방금 **{e.flavor}** 맛이 품절됐어요. 다른 맛으로 골라주세요. 🙏")
+        except OrderTimeout:
+            # 기록이 늦어졌을 뿐 나중에 커밋될 수도 있으니 바로 다시 누르지 않도록 안내한다.
+            st.warning("주문 기록이 늦어지고 있어요. 카운터에서 결제 여부를 확인한 뒤 다시 시도해 주세요. 🙏")
+        except Exception:
+            st.error("주문을 기록하지 못했어요. 잠시 후 다시 시도해 주세요. 🙏")
+        else:
+            cart.clear()
+            st.session_state.cart_editing = None
+
+            # 풍선 이펙트
+            st.balloons()
+
+            # 결제 성공 메시지
+            st.success(
+                f"결제가 완료되었습니다! 🎉\n\n"
+                f"주문 번호 **{order_no}번** · 총 **{order_total:,}원** — (**{payment_method}**)로 결제되었어요.\n"
+                "달콤한 아이스크림, 맛있게 드세요! 😋"
+            )
+
+            # 다양한 톤의 핑크 하트 연출
+            heart_line_1 = "💗 💖 💕 💓 💞 💗 💖 💕"
+            heart_line_2 = "💞 💓 💕 💖 💗 💞 💓 💕"
+            heart_line_3 = "💖 💗 💞 💕 💓 💖 💗 💞"
+
+            st.markdown(
+                f"""
+                <div style="text-align:center; font-size: 2rem; margin-top: 1rem;">
+                    {heart_line_1}<br>
+                    {heart_line_2}<br>
+                    {heart_line_3}
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
+
+            st.info(f"픽업 화면에 **{order_no}번**이 '준비 완료'로 뜨면 카운터에서 받아 가세요. 감사합니다! 🙏")
 
 # ======================
 # 8) 하단 안내
@@ -263,3 +359,6 @@ st.write(
     "💡 *가격이나 맛 구성, 세금 규칙 등을 실제 매장 상황에 맞게 바꾸고 싶다면,*\n"
     "원하는 조건을 알려주시면 코드도 같이 수정해 드릴게요! 🍦"
 )
+
+profiler.render_sidebar()
+profiler.end_rerun()
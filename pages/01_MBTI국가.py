@@ -1,25 +1,30 @@
 import pandas as pd
 import streamlit as st
-import plotly.graph_objects as go
-import numpy as np
+
+import perf
+from mbti.cache import choose_dataset, get_matrix
+from mbti.charts import BarFigures
+from mbti.data import MBTI_TYPES
+
+# 재실행 프로파일링 (APP_PERF=0 이면 꺼짐)
+profiler = perf.get_profiler("mbti")
+profiler.begin_rerun()
 
 # -------------------
 #  데이터 불러오기
 # -------------------
-@st.cache_data
-def load_data():
-    df = pd.read_csv("countriesMBTI_16types.csv")
-    return df
+# MBTI 컬럼(16개 유형)
+mbti_cols = list(MBTI_TYPES)
+# 이보다 행이 많은 데이터셋은 선택 상자 대신 검색 상자 + 일치하는 MAX_MATCHES 개만 보여 준다.
+MAX_PICKER_OPTIONS = 1000
+MAX_MATCHES = 50
 
-df = load_data()
 
-# MBTI 컬럼(16개 유형)
-mbti_cols = [
-    "INFJ", "ISFJ", "INTP", "ISFP",
-    "ENTP", "INFP", "ENTJ", "ISTP",
-    "INTJ", "ESFP", "ENFP", "ESTP",
-    "ISTJ", "ESTJ", "ENFJ", "ESFJ"
-]
+@st.cache_resource(max_entries=8)
+def get_bar_figures(dataset):
+    # 국가 -> 행 번호 인덱스는 데이터셋마다 한 번, Figure 는 국가별로 한 번 (최근 것만 남김)
+    return BarFigures(get_matrix(*dataset))
+
 
 # -------------------
 #  사이드바 / 제목
@@ -29,6 +34,13 @@ st.set_page_config(
     layout="wide"
 )
 
+# 스냅샷 매핑은 프로세스당 한 번 (mbti.cache), 이후 재실행에서는 캐시 조회만 한다.
+dataset = choose_dataset()
+with profiler.section("load_data"):
+    get_matrix(*dataset)
+bar_figures = get_bar_figures(dataset)
+matrix = bar_figures.matrix
+
 st.title("🌎 Countries MBTI Explorer")
 st.markdown(
     """
@@ -38,83 +50,38 @@ st.markdown(
 )
 
 # 국가 선택
-countries = df["Country"].sort_values().unique()
-default_country = "South Korea" if "South Korea" in countries else countries[0]
-selected_country = st.sidebar.selectbox("국가를 선택하세요", countries, index=list(countries).index(default_country))
+countries = matrix.sorted_countries
+default_country = "South Korea" if "South Korea" in matrix else countries[0]
+if len(countries) <= MAX_PICKER_OPTIONS:
+    selected_country = st.sidebar.selectbox("국가를 선택하세요", countries, index=countries.index(default_country))
+else:
+    # 수백만 행을 선택 상자에 다 넣으면 브라우저로 보내는 것만으로 느려진다.
+    query = st.sidebar.text_input("국가 검색", placeholder="이름 일부를 입력하세요")
+    matches = matrix.search(query.strip(), MAX_MATCHES) if query.strip() else [default_country]
+    if not matches:
+        st.sidebar.warning("일치하는 국가가 없어요.")
+        matches = [default_country]
+    selected_country = st.sidebar.selectbox("국가를 선택하세요", matches)
+    st.sidebar.caption(f"전체 {len(countries):,}개 중 일치하는 앞 {MAX_MATCHES}개까지만 보여요.")
 
 st.sidebar.markdown("---")
 st.sidebar.markdown("**그래프 설명**")
 st.sidebar.markdown("- 1등 유형은 **빨간색** 🔴")
 st.sidebar.markdown("- 나머지는 **밝기만 다른 그라데이션** 색상")
 
-# 선택된 국가의 데이터 추출
-country_row = df[df["Country"] == selected_country].iloc[0]
-
-# x, y 데이터 준비
-x = mbti_cols
-y = [country_row[c] for c in mbti_cols]
+# 선택된 국가의 데이터 / 그래프 (국가별로 미리 만들어 둔 것을 꺼내기만 한다)
+with profiler.section("country_lookup"):
+    x = list(matrix.types)
+    y = matrix.shares(selected_country)
 
-# -------------------
-#  색상 설정 (1등 = 빨간색, 나머지 그라데이션)
-# -------------------
-# 1등 인덱스
-max_idx = int(np.argmax(y))
-
-# 기본 색상: 빨간색 계열 (hex)
-base_color = np.array([255, 0, 0])  # 빨간색
-
-colors = []
-max_value = max(y)
-min_value = min(y) if min(y) < max_value else 0.0
-
-for i, val in enumerate(y):
-    if i == max_idx:
-        # 1등: 완전 빨강
-        colors.append("rgb(255,0,0)")
-    else:
-        # 값에 따라 밝기 조절 (그라데이션 느낌)
-        # val이 작을수록 밝고, 클수록 진한 붉은색
-        if max_value - min_value == 0:
-            intensity = 0.4
-        else:
-            norm = (val - min_value) / (max_value - min_value)
-            # 0.2 ~ 0.8 사이에서 변화 (너무 밝거나 너무 어두운 것 방지)
-            intensity = 0.2 + 0.6 * norm
-
-        # base_color * intensity + 흰색 섞기
-        rgb = base_color * intensity + np.array([255, 255, 255]) * (1 - intensity)
-        r, g, b = rgb.astype(int)
-        colors.append(f"rgb({r},{g},{b})")
-
-# -------------------
-#  Plotly 막대그래프 생성
-# -------------------
-fig = go.Figure()
-
-fig.add_trace(
-    go.Bar(
-        x=x,
-        y=y,
-        marker=dict(color=colors),
-        text=[f"{val*100:.1f}%" for val in y],
-        textposition="outside",
-        hovertemplate="<b>%{x}</b><br>%{y:.3f} (비율)<extra></extra>",
-    )
-)
-
-fig.update_layout(
-    title=f"{selected_country} MBTI 비율 (16유형)",
-    xaxis_title="MBTI 유형",
-    yaxis_title="비율 (0~1)",
-    yaxis=dict(range=[0, max_value * 1.2]),
-    template="simple_white",
-    margin=dict(l=40, r=40, t=80, b=40),
-)
+with profiler.section("plotly_figure"):
+    fig = bar_figures.figure(selected_country)
 
 # -------------------
 #  페이지에 그래프 표시
 # -------------------
-st.plotly_chart(fig, use_container_width=True)
+with profiler.section("plotly_chart"):
+    st.plotly_chart(fig, use_container_width=True)
 
 # 데이터 테이블 옵션
 with st.expander("🔎 이 국가의 MBTI 원본 데이터 보기"):
@@ -127,3 +94,6 @@ with st.expander("🔎 이 국가의 MBTI 원본 데이터 보기"):
             }
         ).set_index("MBTI")
     )
+
+profiler.render_sidebar()
+profiler.end_rerun()
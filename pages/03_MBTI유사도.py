@@ -0,0 +1,121 @@
+import pandas as pd
+import streamlit as st
+import plotly.graph_objects as go
+
+import perf
+from mbti.cache import choose_dataset, get_matrix
+from mbti.data import MBTI_TYPES
+from mbti.similarity import METRIC_LABELS, SimilarityIndex, as_distributions, kmeans
+
+st.set_page_config(
+    page_title="MBTI 국가 유사도",
+    layout="wide"
+)
+
+# 재실행 프로파일링 (APP_PERF=0 이면 꺼짐)
+profiler = perf.get_profiler("mbti_similarity")
+profiler.begin_rerun()
+
+mbti_cols = list(MBTI_TYPES)
+
+
+# -------------------
+#  데이터 / 유사도 인덱스 (데이터셋 x 기준마다 프로세스당 한 번)
+# -------------------
+@st.cache_resource(max_entries=8)
+def get_index(metric, dataset):
+    # 국가 x 국가 거리 행렬을 미리 계산해 둔 인덱스. "가장 비슷한 국가"는 행 하나를 꺼내기만 한다.
+    # (행이 아주 많으면 PRECOMPUTE_LIMIT 를 넘어 거리 행렬 없이 한 국가 대 전체만 계산)
+    # cache_data 는 n x n 행렬을 재실행마다 피클로 복사하므로 cache_resource 로 그대로 공유한다.
+    with profiler.section("pairwise_distances"):
+        return SimilarityIndex(get_matrix(*dataset), metric)
+
+
+@st.cache_data
+def get_clusters(k, dataset, seed=0):
+    with profiler.section("kmeans"):
+        return kmeans(as_distributions(get_matrix(*dataset).values), k, seed=seed)
+
+
+dataset = choose_dataset()
+with profiler.section("load_data"):
+    matrix = get_matrix(*dataset)
+
+st.title("🧭 MBTI 국가 유사도 / 군집")
+st.markdown(
+    """
+    선택한 국가와 **MBTI 16유형 분포가 가장 비슷한 국가**를 찾고,  
+    전체 국가를 분포가 비슷한 것끼리 **군집**으로 묶어 볼 수 있어요.
+    """
+)
+
+# -------------------
+#  사이드바
+# -------------------
+countries = matrix.sorted_countries
+default_country = "South Korea" if "South Korea" in matrix else countries[0]
+selected_country = st.sidebar.selectbox("기준 국가", countries, index=countries.index(default_country))
+metric = st.sidebar.radio(
+    "유사도 기준", list(METRIC_LABELS), format_func=METRIC_LABELS.get
+)
+top_k = st.sidebar.slider("표시할 국가 수", 3, 30, 10)
+
+# -------------------
+#  비슷한 국가
+# -------------------
+st.subheader(f"🔗 {selected_country} 와(과) 비슷한 국가 ({METRIC_LABELS[metric]})")
+
+with profiler.section("nearest"):
+    neighbours = get_index(metric, dataset).most_similar(selected_country, top_k)
+
+st.dataframe(
+    pd.DataFrame(
+        {
+            "순위": range(1, len(neighbours) + 1),
+            "국가": [c for c, _ in neighbours],
+            "유사도": [round(1 - d, 4) for _, d in neighbours],
+            "거리": [round(d, 4) for _, d in neighbours],
+        }
+    ).set_index("순위"),
+    use_container_width=True,
+)
+
+with profiler.section("compare_figure"):
+    fig = go.Figure()
+    for country in [selected_country] + [c for c, _ in neighbours[:3]]:
+        fig.add_trace(go.Bar(name=country, x=mbti_cols, y=matrix.shares(country)))
+    fig.update_layout(
+        barmode="group",
+        title=f"{selected_country} vs 가장 비슷한 3개국",
+        xaxis_title="MBTI 유형",
+        yaxis_title="비율 (0~1)",
+        template="simple_white",
+        margin=dict(l=40, r=40, t=80, b=40),
+    )
+st.plotly_chart(fig, use_container_width=True)
+
+# -------------------
+#  군집
+# -------------------
+st.markdown("---")
+st.subheader("🧩 분포가 비슷한 국가끼리 묶기 (k-means)")
+k = st.slider("군집 수", 2, 12, 5)
+labels, centers = get_clusters(k, dataset)
+my_cluster = int(labels[matrix.index[selected_country]])
+
+st.caption(f"{selected_country} 은(는) **군집 {my_cluster + 1}** 에 속해요. (군집 번호는 크기 순)")
+cols = st.columns(min(k, 4))
+for c in range(k):
+    members = sorted(matrix.countries[i] for i in (labels == c).nonzero()[0])
+    top_types = [mbti_cols[j] for j in centers[c].argsort()[::-1][:3]]
+    with cols[c % len(cols)]:
+        st.markdown(f"**군집 {c + 1}** · {len(members)}개국 · 많은 유형: {', '.join(top_types)}")
+        st.write(", ".join(members))
+
+with st.expander("🔎 군집별 평균 분포 보기"):
+    st.dataframe(
+        pd.DataFrame(centers.round(4), columns=mbti_cols, index=[f"군집 {c + 1}" for c in range(k)])
+    )
+
+profiler.render_sidebar()
+profiler.end_rerun()
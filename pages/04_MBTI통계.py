@@ -0,0 +1,115 @@
+import pandas as pd
+import streamlit as st
+import plotly.graph_objects as go
+
+import perf
+from mbti.cache import choose_dataset, get_matrix
+from mbti.data import MBTI_TYPES
+from mbti.query import DICHOTOMIES, QueryEngine, QueryError
+
+st.set_page_config(
+    page_title="MBTI 국가 통계",
+    layout="wide"
+)
+
+# 재실행 프로파일링 (APP_PERF=0 이면 꺼짐)
+profiler = perf.get_profiler("mbti_stats")
+profiler.begin_rerun()
+
+mbti_cols = list(MBTI_TYPES)
+
+
+# -------------------
+#  데이터 / 질의 엔진 (프로세스당 한 번, 질의 결과는 엔진 안에서 캐시)
+# -------------------
+@st.cache_resource(max_entries=8)
+def get_engine(dataset):
+    return QueryEngine(get_matrix(*dataset))
+
+
+dataset = choose_dataset()
+with profiler.section("load_data"):
+    get_matrix(*dataset)
+engine = get_engine(dataset)
+matrix = engine.matrix
+
+st.title("📊 MBTI 국가 통계")
+
+# -------------------
+#  1) 유형별 순위
+# -------------------
+st.subheader("🏅 유형별 국가 순위")
+col1, col2, col3 = st.columns([2, 2, 1])
+rank_type = col1.selectbox("MBTI 유형", mbti_cols, index=mbti_cols.index("INTJ"))
+top_k = col2.slider("표시할 국가 수", 5, 50, 10)
+ascending = col3.checkbox("낮은 순", value=False)
+
+with profiler.section("top"):
+    ranked = engine.top(rank_type, top_k, ascending=ascending)
+st.dataframe(
+    pd.DataFrame(
+        {
+            "순위": range(1, len(ranked) + 1),
+            "국가": [c for c, _ in ranked],
+            "퍼센트(%)": [round(v * 100, 2) for _, v in ranked],
+        }
+    ).set_index("순위"),
+    use_container_width=True,
+)
+
+# -------------------
+#  2) 전체 평균 / 지표별 합계
+# -------------------
+st.subheader("🌐 국가 평균 분포")
+with profiler.section("global_mean"):
+    means = engine.global_mean()
+fig = go.Figure(
+    go.Bar(
+        x=[t for t, _ in means],
+        y=[v for _, v in means],
+        text=[f"{v*100:.1f}%" for _, v in means],
+        textposition="outside",
+        hovertemplate="<b>%{x}</b><br>%{y:.3f} (비율)<extra></extra>",
+    )
+)
+fig.update_layout(
+    xaxis_title="MBTI 유형",
+    yaxis_title="비율 (0~1)",
+    template="simple_white",
+    margin=dict(l=40, r=40, t=40, b=40),
+)
+st.plotly_chart(fig, use_container_width=True)
+
+dichotomy_country = st.selectbox("지표별 합계 (E/I · S/N · T/F · J/P)", ["국가 평균"] + matrix.sorted_countries)
+with profiler.section("dichotomies"):
+    letters = dict(engine.dichotomies(None if dichotomy_country == "국가 평균" else dichotomy_country))
+for col, (a, b) in zip(st.columns(len(DICHOTOMIES)), DICHOTOMIES):
+    col.metric(f"{a} / {b}", f"{letters[a]*100:.1f}% / {letters[b]*100:.1f}%")
+
+# -------------------
+#  3) 조건 검색
+# -------------------
+st.subheader("🔎 조건으로 국가 찾기")
+st.caption(
+    "유형(INTJ 등)과 지표(E, I, S, N, T, F, J, P) 이름, 비교(>, >=, <, <=, ==, !=), "
+    "and / or / not, 사칙연산을 쓸 수 있어요. 예: `E > 0.5`, `INTJ >= 0.05 and N > 0.45`"
+)
+expression = st.text_input("조건식", value="E > 0.5")
+if expression.strip():
+    try:
+        with profiler.section("filter"):
+            found = engine.filter(expression)
+    except QueryError as e:
+        st.error(str(e))
+    else:
+        st.write(f"**{len(found)}개국**이 조건을 만족해요.")
+        if found:
+            st.dataframe(
+                pd.DataFrame(
+                    [{"국가": c, **{k: round(v, 4) for k, v in values.items()}} for c, values in found]
+                ).set_index("국가"),
+                use_container_width=True,
+            )
+
+profiler.render_sidebar()
+profiler.end_rerun()
@@ -0,0 +1,42 @@
+import streamlit as st
+
+import perf
+from mbti.cache import get_matrix
+from mbti.charts import ChoroplethFigures
+from mbti.data import MBTI_TYPES
+
+st.set_page_config(
+    page_title="MBTI 세계 지도",
+    layout="wide"
+)
+
+# 재실행 프로파일링 (APP_PERF=0 이면 꺼짐)
+profiler = perf.get_profiler("mbti_map")
+profiler.begin_rerun()
+
+mbti_cols = list(MBTI_TYPES)
+
+
+@st.cache_resource
+def get_map_figures():
+    # 유형별 지도 Figure 는 처음 요청될 때 한 번 만들고, 최근 8개 유형만 남긴다.
+    return ChoroplethFigures(get_matrix(), max_entries=8)
+
+
+with profiler.section("load_data"):
+    get_matrix()
+map_figures = get_map_figures()
+
+st.title("🗺️ MBTI 세계 지도")
+st.markdown("유형을 고르면 **158개국의 해당 유형 비율**을 지도 색으로 보여줘요. (진할수록 비율이 높음)")
+
+selected_type = st.radio("MBTI 유형", mbti_cols, horizontal=True, index=mbti_cols.index("INFP"))
+
+with profiler.section("map_figure"):
+    fig = map_figures.figure(selected_type)
+
+with profiler.section("plotly_chart"):
+    st.plotly_chart(fig, use_container_width=True)
+
+profiler.render_sidebar()
+profiler.end_rerun()
@@ -0,0 +1,96 @@
+import streamlit as st
+
+import perf
+from kiosk.catalog import get_catalog_source
+from kiosk.inventory import get_inventory
+from kiosk.orders import EVENT_PAGE, PICKED_UP, PLACED, READY, STATUS_LABELS, get_journal
+
+st.set_page_config(page_title="🛎️ 픽업 대기", page_icon="🛎️", layout="wide")
+
+# 재실행 프로파일링 (APP_PERF=0 이면 꺼짐)
+profiler = perf.get_profiler("pickup")
+profiler.begin_rerun()
+
+journal = get_journal()
+
+st.title("🛎️ 픽업 대기 화면")
+staff_mode = st.toggle("직원 모드 (상태 변경 버튼 보기)", value=False)
+
+# 처음 열 때만 전체 대기 주문을 읽고, 이후에는 커서 뒤의 이벤트만 읽는다.
+# (커서를 먼저 읽어야 그 사이에 들어온 이벤트를 놓치지 않는다. 다시 적용해도 결과는 같다)
+if "pickup_board" not in st.session_state:
+    st.session_state.pickup_cursor = journal.last_event_seq()
+    st.session_state.pickup_board = journal.open_orders()
+
+
+def apply_events():
+    board = st.session_state.pickup_board
+    while True:
+        events, cursor = journal.events_since(st.session_state.pickup_cursor)
+        for event in events:
+            if event["status"] == PICKED_UP:
+                board.pop(event["order_no"], None)
+            else:
+                board[event["order_no"]] = event["status"]
+        st.session_state.pickup_cursor = cursor
+        if len(events) < EVENT_PAGE:
+            break
+
+
+def change_status(order_no, status):
+    journal.set_status(order_no, status)
+    apply_events()
+
+
+@st.fragment(run_every=2)
+def render_board():
+    with profiler.section("poll"):
+        apply_events()
+    board = st.session_state.pickup_board
+
+    col_wait, col_ready = st.columns(2)
+    for col, status in ((col_wait, PLACED), (col_ready, READY)):
+        numbers = [n for n, s in board.items() if s == status]
+        with col:
+            st.subheader(f"{STATUS_LABELS[status]} ({len(numbers)})")
+            if not numbers:
+                st.caption("없음")
+            for order_no in numbers:
+                if not staff_mode:
+                    st.markdown(f"### {order_no}번")
+                    continue
+                c1, c2 = st.columns([1, 1])
+                c1.markdown(f"### {order_no}번")
+                next_status = READY if status == PLACED else PICKED_UP
+                c2.button(
+                    STATUS_LABELS[next_status],
+                    key=f"pickup-{order_no}-{next_status}",
+                    on_click=change_status,
+                    args=(order_no, next_status),
+                )
+
+
+render_board()
+
+# 직원 모드: 맛별 재고 확인 / 입고
+if staff_mode:
+    inventory = get_inventory(journal)
+    inventory.ensure(get_catalog_source().current())
+    with st.expander("🍨 맛별 재고 (남은 스쿱)"):
+        snap = inventory.snapshot()
+        if snap.sold_out:
+            st.warning(f"품절: {', '.join(sorted(snap.sold_out))}")
+        st.dataframe(
+            [{"맛": f, "남은 스쿱": n} for f, n in sorted(snap.stock.items(), key=lambda kv: kv[1])],
+            use_container_width=True,
+            hide_index=True,
+        )
+        c1, c2, c3 = st.columns([2, 1, 1])
+        flavor = c1.selectbox("맛", sorted(snap.stock))
+        scoops = c2.number_input("스쿱 수", min_value=0, value=int(snap.stock.get(flavor, 0)), step=10)
+        if c3.button("재고 설정"):
+            inventory.set_stock({flavor: int(scoops)})
+            st.rerun()
+
+profiler.render_sidebar()
+profiler.end_rerun()
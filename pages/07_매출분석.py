@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+
+import streamlit as st
+import plotly.graph_objects as go
+
+import perf
+from kiosk.analytics import get_sales_rollup
+from kiosk.orders import get_journal
+
+st.set_page_config(page_title="📈 매출 분석", page_icon="📈", layout="wide")
+
+# 재실행 프로파일링 (APP_PERF=0 이면 꺼짐)
+profiler = perf.get_profiler("sales")
+profiler.begin_rerun()
+
+rollup = get_sales_rollup(get_journal())
+
+RANGES = {"오늘": 0, "최근 7일": 6, "최근 30일": 29}
+
+
+# 그래프는 (기간, 마지막 주문 번호, 날짜) 로 캐시한다. 새 주문이 없으면 다시 만들지 않는다.
+@st.cache_resource(max_entries=16)
+def build_figures(days, version, today):
+    since = today - timedelta(days=days)
+    with profiler.section("rollup_queries"):
+        totals = rollup.totals(since)
+        hours = rollup.by_hour_of_day(since)
+        daily = rollup.daily(since)
+        flavors = rollup.top_flavors(since, 10)
+        mix = rollup.container_mix(since)
+
+    layout = dict(template="simple_white", margin=dict(l=40, r=40, t=60, b=40))
+    by_hour = dict((h, revenue) for h, _, revenue in hours)
+    fig_hour = go.Figure(go.Bar(x=list(range(24)), y=[by_hour.get(h, 0) for h in range(24)]))
+    fig_hour.update_layout(title="시간대별 매출 (원)", xaxis_title="시", **layout)
+
+    fig_daily = go.Figure(go.Scatter(x=[d for d, _, _ in daily], y=[r for _, _, r in daily], mode="lines+markers"))
+    fig_daily.update_layout(title="일별 매출 (원)", **layout)
+
+    fig_flavors = go.Figure(go.Bar(x=[s for _, s, _ in flavors][::-1], y=[f for f, _, _ in flavors][::-1], orientation="h"))
+    fig_flavors.update_layout(title="인기 맛 (스쿱 수)", **layout)
+
+    fig_mix = go.Figure(go.Pie(labels=[c for c, _, _ in mix], values=[n for _, n, _ in mix], hole=0.4))
+    fig_mix.update_layout(title="용기 구성", **layout)
+
+    takeout = totals["orders"] - totals["eat_in"]
+    fig_dine = go.Figure(go.Pie(labels=["매장식사", "포장"], values=[totals["eat_in"], takeout], hole=0.4))
+    fig_dine.update_layout(title="매장식사 vs 포장", **layout)
+    return totals, (fig_hour, fig_daily, fig_flavors, fig_mix, fig_dine)
+
+
+st.title("📈 매출 분석")
+range_label = st.radio("기간", list(RANGES), horizontal=True)
+
+totals, (fig_hour, fig_daily, fig_flavors, fig_mix, fig_dine) = build_figures(
+    RANGES[range_label], rollup.version(), date.today()
+)
+
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("주문 수", f"{totals['orders']:,}")
+c2.metric("매출", f"{totals['revenue']:,}원")
+c3.metric("객단가", f"{totals['revenue'] // totals['orders']:,}원" if totals["orders"] else "-")
+c4.metric("매장식사 비율", f"{totals['eat_in'] / totals['orders'] * 100:.1f}%" if totals["orders"] else "-")
+
+with profiler.section("plotly_chart"):
+    left, right = st.columns(2)
+    left.plotly_chart(fig_hour, use_container_width=True)
+    right.plotly_chart(fig_daily, use_container_width=True)
+    left.plotly_chart(fig_flavors, use_container_width=True)
+    right.plotly_chart(fig_mix, use_container_width=True)
+    left.plotly_chart(fig_dine, use_container_width=True)
+
+
+# 최근 1시간 분당 주문 (분 단위 집계, 10초마다 갱신)
+@st.fragment(run_every=10)
+def render_live():
+    with profiler.section("recent_minutes"):
+        rows = rollup.recent_minutes(60)
+    fig = go.Figure(go.Bar(x=[m for m, _, _ in rows], y=[n for _, n, _ in rows]))
+    fig.update_layout(title="최근 1시간 분당 주문 수", template="simple_white", margin=dict(l=40, r=40, t=60, b=40))
+    st.plotly_chart(fig, use_container_width=True)
+
+
+with right:
+    render_live()
+
+profiler.render_sidebar()
+profiler.end_rerun()
@@ -0,0 +1,243 @@
+"""재실행(rerun) 프로파일링 도구 — name.py / 하나줍줍.py / pages/* 공용.
+
+사용법:
+
+    profiler = perf.get_profiler("kiosk")
+    profiler.begin_rerun()
+    with profiler.section("pricing"):
+        ...
+    profiler.count("image_decodes")
+    profiler.render_sidebar()   # 사이드바 패널 (구간별 마지막/p50/p90/p99)
+    profiler.end_rerun()        # 기록 마감 (+ JSON-lines 로그)
+
+st.fragment 는 페이지 전체가 아니라 자기만 다시 실행하므로, fragment 재실행에서 잰
+구간은 기록은 되지만 사이드바 패널은 다음 전체 재실행 때까지 다시 그려지지 않는다.
+fragment 안에서 바로 보려면 끝에 profiler.render_caption("<구간>") 을 부른다.
+(fragment 자신을 재는 구간이면 직전 실행까지의 값이 나온다)
+
+환경 변수
+  APP_PERF=0            끄기. section() 은 미리 만들어 둔 빈 컨텍스트를 돌려주고
+                        count() 는 바로 반환하므로 켜 둔 채 배포해도 부담이 거의 없다.
+  APP_PERF_LOG_DIR=dir  재실행마다 <dir>/<app>.jsonl 에 한 줄씩 기록한다.
+
+할당량은 sys.getallocatedblocks() 의 구간 전후 차이(살아남은 메모리 블록 수)로 잰다.
+tracemalloc 과 달리 항상 켜 둘 수 있을 만큼 싸다.
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import nullcontext
+from pathlib import Path
+
+ENABLED = os.environ.get("APP_PERF", "1") != "0"
+LOG_DIR = os.environ.get("APP_PERF_LOG_DIR")
+HISTORY = 500
+RERUN = "rerun"
+
+_NULL_SECTION = nullcontext()
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class _Section:
+    __slots__ = ("profiler", "name", "started", "blocks")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.blocks = sys.getallocatedblocks()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        self.profiler._add(self.name, elapsed_ms, sys.getallocatedblocks() - self.blocks)
+        return False
+
+
+class Profiler:
+    def __init__(self, app, enabled=ENABLED, history=HISTORY, log_dir=LOG_DIR):
+        self.app = app
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._times = defaultdict(lambda: deque(maxlen=history))   # 구간 -> 최근 ms 기록
+        self._blocks = defaultdict(lambda: deque(maxlen=history))  # 구간 -> 최근 할당 블록 수
+        self._counters = defaultdict(int)
+        self._local = threading.local()  # Streamlit 세션(스크립트 스레드)별 진행 중인 재실행
+        self._log_path = Path(log_dir) / f"{app}.jsonl" if log_dir else None
+
+    # ---------- 재실행 단위 ----------
+    def begin_rerun(self):
+        if not self.enabled:
+            return
+        self._local.current = {
+            "started": time.perf_counter(),
+            "blocks": sys.getallocatedblocks(),
+            "sections": defaultdict(float),
+            "allocs": defaultdict(int),
+            "counters": defaultdict(int),
+        }
+
+    def end_rerun(self):
+        current = getattr(self._local, "current", None)
+        if not self.enabled or current is None:
+            return
+        self._local.current = None
+        total_ms = (time.perf_counter() - current["started"]) * 1000
+        total_blocks = sys.getallocatedblocks() - current["blocks"]
+        with self._lock:
+            self._times[RERUN].append(total_ms)
+            self._blocks[RERUN].append(total_blocks)
+            for name, ms in current["sections"].items():
+                self._times[name].append(ms)
+                self._blocks[name].append(current["allocs"][name])
+            for name, n in current["counters"].items():
+                self._counters[name] += n
+        if self._log_path is not None:
+            self._write_log({
+                "app": self.app,
+                "time": time.time(),
+                "rerun_ms": round(total_ms, 3),
+                "alloc_blocks": total_blocks,
+                "sections": {k: round(v, 3) for k, v in current["sections"].items()},
+                "counters": dict(current["counters"]),
+            })
+
+    def _write_log(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._log_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    # ---------- 구간 / 카운터 ----------
+    def section(self, name):
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def timed(self, name=None):
+        """함수 전체를 구간 하나로 재는 데코레이터."""
+        def decorator(func):
+            label = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.section(label):
+                    return func(*args, **kwargs)
+
+            return wrapper
+        return decorator
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        current = getattr(self._local, "current", None)
+        if current is not None:
+            current["counters"][name] += n
+        else:
+            with self._lock:
+                self._counters[name] += n
+
+    def _add(self, name, elapsed_ms, blocks):
+        current = getattr(self._local, "current", None)
+        if current is not None:
+            # 한 재실행 안에서 같은 구간이 여러 번 돌면 합산한다.
+            current["sections"][name] += elapsed_ms
+            current["allocs"][name] += blocks
+        else:
+            # fragment 재실행처럼 begin_rerun() 없이 돈 구간은 바로 기록한다.
+            with self._lock:
+                self._times[name].append(elapsed_ms)
+                self._blocks[name].append(blocks)
+
+    # ---------- 조회 ----------
+    def current_sections(self):
+        current = getattr(self._local, "current", None)
+        return list(current["sections"]) if current else []
+
+    def summary(self):
+        """{구간: {runs, last_ms, p50_ms, p90_ms, p99_ms, last_alloc_blocks}}"""
+        with self._lock:
+            snapshot = {name: (list(times), self._blocks[name][-1] if self._blocks[name] else 0)
+                        for name, times in self._times.items()}
+            counters = dict(self._counters)
+        result = {}
+        for name, (times, last_blocks) in snapshot.items():
+            ordered = sorted(times)
+            result[name] = {
+                "runs": len(times),
+                "last_ms": times[-1] if times else 0.0,
+                "p50_ms": percentile(ordered, 0.50),
+                "p90_ms": percentile(ordered, 0.90),
+                "p99_ms": percentile(ordered, 0.99),
+                "last_alloc_blocks": last_blocks,
+            }
+        return result, counters
+
+    def reset(self):
+        with self._lock:
+            self._times.clear()
+            self._blocks.clear()
+            self._counters.clear()
+
+    # ---------- 화면 ----------
+    def render_sidebar(self):
+        if not self.enabled:
+            return
+        import pandas as pd
+        import streamlit as st
+
+        summary, counters = self.summary()
+        with st.sidebar.expander("⏱ 성능 (재실행 프로파일)"):
+            running = self.current_sections()
+            if running:
+                st.caption(f"이번 재실행에서 잰 구간: {', '.join(running)}")
+            rows = [
+                {
+                    "구간": name,
+                    "횟수": s["runs"],
+                    "마지막 (ms)": round(s["last_ms"], 2),
+                    "p50": round(s["p50_ms"], 2),
+                    "p90": round(s["p90_ms"], 2),
+                    "p99": round(s["p99_ms"], 2),
+                    "할당 블록": s["last_alloc_blocks"],
+                }
+                for name, s in sorted(summary.items())
+            ]
+            st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+            if counters:
+                st.caption(" · ".join(f"{k}: {v:,}" for k, v in sorted(counters.items())))
+
+    def render_caption(self, name):
+        """구간 하나의 마지막/p50 을 한 줄로. fragment 안에서 사이드바 대신 쓴다."""
+        if not self.enabled:
+            return
+        import streamlit as st
+
+        s = self.summary()[0].get(name)
+        if s is not None:
+            st.caption(f"⏱ {name}: 마지막 {s['last_ms']:.1f} ms · p50 {s['p50_ms']:.1f} ms ({s['runs']}회)")
+
+
+_profilers = {}
+_profilers_lock = threading.Lock()
+
+
+def get_profiler(app):
+    """앱 이름별로 프로세스 안에서 하나만 만든다. (모든 세션이 같은 기록을 본다)"""
+    with _profilers_lock:
+        if app not in _profilers:
+            _profilers[app] = Profiler(app)
+        return _profilers[app]
@@ -2,7 +2,18 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 import uuid
-import base64
+
+import perf
+
+from hana.images import ImageStore, InvalidImage, migrate_inline_images
+from hana.leaderboard import WINDOWS, Leaderboard, window_start
+from hana.notifications import NotificationLog
+from hana.remote_images import LOST_ITEM_URL, NO_IMAGE_URL, RemoteImageCache
+from hana.search import SearchIndex
+from hana.state import SharedState
+from hana.store import DB_PATH, ItemStore
+from hana.timeline import CUTOFF_DAYS, PeriodicTask, TimeIndex, archive_expired, cutoff_for
+from hana.views import ItemFrame
 
 # ============================================
 # 기본 설정 (하나은행 스타일)
@@ -15,6 +26,10 @@ st.set_page_config(
 
 HANA_GREEN = "#008485"
 
+# 재실행 프로파일링 (APP_PERF=0 이면 꺼짐)
+profiler = perf.get_profiler("hana")
+profiler.begin_rerun()
+
 st.markdown(
     f"""
     <style>
@@ -53,86 +68,166 @@ st.markdown(
 # ============================================
 # 초기 데이터 생성
 # ============================================
-def init_data():
-    if "lost_items" not in st.session_state:
-        # 현재 시간을 기준으로 과거 시간을 계산하여 초기 데이터 설정
-        now = datetime.now()
-        st.session_state.lost_items = [
-            {
-                "id": str(uuid.uuid4()),
-                "name": "하나카드",
-                "location": "매점 입구",
-                "floor": 1,
-                "uploaded_at": now - timedelta(days=5, hours=3), # 최근 항목 테스트용
-                "image_url": "https://community-api-cdn.kr.karrotmarket.com/v1/resource/images/load?id=kr-community%231987053135104090112",
-                "image_data": None,
-                "uploader": "25199 허민서",
-                "resolved": False,
-            },
-            {
-                "id": str(uuid.uuid4()),
-                "name": "C타입 충전기",
-                "location": "A동 움파",
-                "floor": 3,
-                "uploaded_at": now - timedelta(days=35, hours=10), # 30일 이상 오래된 항목 테스트용
-                "image_url": "https://my.snu.ac.kr/dext5editor/handler/image_handler.jsp?fn=%2F2025%2F10%2F20251023_170208372_05296.jpg",
-                "image_data": None,
-                "uploader": "25116 이래나",
-                "resolved": False,
-            },
-            {
-                "id": str(uuid.uuid4()),
-                "name": "갤럭시 버즈",
-                "location": "B305",
-                "floor": 3,
-                "uploaded_at": now - timedelta(days=1, hours=8), # 최근 항목 테스트용
-                "image_url": "https://community-api-cdn.kr.karrotmarket.com/v1/resource/images/load?id=kr-community%231750767056434888704",
-                "image_data": None,
-                "uploader": "25116 이래나",
-                "resolved": False,
-            },
-            {
-                "id": str(uuid.uuid4()),
-                "name": "영어 교과서",
-                "location": "급식실",
-                "floor": 4,
-                "uploaded_at": now - timedelta(days=10, hours=15), # 최근 항목 테스트용
-                "image_url": "https://static.mercdn.net/item/detail/orig/photos/m16043469936_1.jpg?1736746405",
-                "image_data": None,
-                "uploader": "25116 이래나",
-                "resolved": False,
-            },
-        ]
-
-    if "user_stats" not in st.session_state:
-        st.session_state.user_stats = {
-            "25199 허민서": {"upload_count": 1, "notification_on": True},
-            "25116 이래나": {"upload_count": 3, "notification_on": True},
-        }
+def seed_items():
+    # 현재 시간을 기준으로 과거 시간을 계산하여 초기 데이터 설정
+    now = datetime.now()
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "name": "하나카드",
+            "location": "매점 입구",
+            "floor": 1,
+            "uploaded_at": now - timedelta(days=5, hours=3), # 최근 항목 테스트용
+            "image_url": "https://community-api-cdn.kr.karrotmarket.com/v1/resource/images/load?id=kr-community%231987053135104090112",
+            "image_hash": None,
+            "uploader": "25199 허민서",
+            "resolved": False,
+        },
+        {
+            "id": str(uuid.uuid4()),
+            "name": "C타입 충전기",
+            "location": "A동 움파",
+            "floor": 3,
+            "uploaded_at": now - timedelta(days=35, hours=10), # 30일 이상 오래된 항목 테스트용
+            "image_url": "https://my.snu.ac.kr/dext5editor/handler/image_handler.jsp?fn=%2F2025%2F10%2F20251023_170208372_05296.jpg",
+            "image_hash": None,
+            "uploader": "25116 이래나",
+            "resolved": False,
+        },
+        {
+            "id": str(uuid.uuid4()),
+            "name": "갤럭시 버즈",
+            "location": "B305",
+            "floor": 3,
+            "uploaded_at": now - timedelta(days=1, hours=8), # 최근 항목 테스트용
+            "image_url": "https://community-api-cdn.kr.karrotmarket.com/v1/resource/images/load?id=kr-community%231750767056434888704",
+            "image_hash": None,
+            "uploader": "25116 이래나",
+            "resolved": False,
+        },
+        {
+            "id": str(uuid.uuid4()),
+            "name": "영어 교과서",
+            "location": "급식실",
+            "floor": 4,
+            "uploaded_at": now - timedelta(days=10, hours=15), # 최근 항목 테스트용
+            "image_url": "https://static.mercdn.net/item/detail/orig/photos/m16043469936_1.jpg?1736746405",
+            "image_hash": None,
+            "uploader": "25116 이래나",
+            "resolved": False,
+        },
+    ]
 
-    if "notifications" not in st.session_state:
-        now = datetime.now()
-        st.session_state.notifications = [
-            {
-                "time": now - timedelta(days=5, hours=3),
-                "message": "새로운 분실물 '하나카드'가 등록되었습니다.",
-            }
-        ]
 
+def seed_users():
+    return {
+        "25199 허민서": {"upload_count": 1, "notification_on": True},
+        "25116 이래나": {"upload_count": 3, "notification_on": True},
+    }
+
+
+# ============================================
+# 저장소 (모든 세션이 공유)
+# ============================================
+@st.cache_resource
+def get_store():
+    item_store = ItemStore(DB_PATH)
+    # 분실물은 공유 저장소에 한 번만 넣는다. (이미 있으면 아무 것도 하지 않음)
+    item_store.seed_if_empty(seed_items(), seed_users())
+    return item_store
+
+
+@st.cache_resource
+def get_image_store():
+    image_store = ImageStore()
+    migrate_inline_images(get_store(), image_store)
+    return image_store
+
+
+@st.cache_resource
+def get_remote_images():
+    return RemoteImageCache()
+
+
+@st.cache_resource
+def get_search_index():
+    # 처음 한 번만 전체를 색인하고, 이후에는 업로드 때마다 그 항목만 추가한다.
+    return SearchIndex(get_store().list_items())
+
+
+@st.cache_resource
+def get_timeline():
+    return TimeIndex(get_store().list_items())
+
+
+@st.cache_resource
+def get_archiver():
+    # 한 시간에 한 번, 보관 기간이 지난 항목을 목록/인덱스에서 뺀다.
+    return PeriodicTask(
+        lambda: archive_expired(get_store(), get_timeline(), [get_search_index()]),
+        interval=3600,
+    )
+
+
+@st.cache_resource
+def get_notifications():
+    log = NotificationLog()
+    log.publish(
+        "새로운 분실물 '하나카드'가 등록되었습니다.",
+        time=datetime.now() - timedelta(days=5, hours=3),
+    )
+    return log
+
+
+@st.cache_resource
+def get_leaderboard():
+    item_store = get_store()
+    counts = {name: info["upload_count"] for name, info in item_store.list_users().items()}
+    # 기간별 랭킹은 이번 주/이번 달만 보므로 그 이전 날짜 카운터는 읽지 않는다.
+    since = min(window_start(window) for window in WINDOWS)
+    return Leaderboard(counts, item_store.daily_uploads(since=since))
+
+
+@st.cache_resource
+def get_state():
+    # 업로드/횟수/알림 설정은 전부 이 객체를 거친다. (여러 세션이 동시에 써도 안전)
+    return SharedState(
+        get_store(), get_search_index(), get_timeline(), get_notifications(), get_leaderboard()
+    )
+
+
+@st.cache_resource(max_entries=2)
+def get_item_frame(generation):
+    # generation 이 바뀔 때(업로드/해결/삭제)만 새로 만든다. 세션끼리 공유하므로 읽기 전용.
+    with profiler.section("item_frame_build"):
+        return ItemFrame(get_store().list_items(), generation)
+
+
+store = get_store()
+images = get_image_store()
+remote_images = get_remote_images()
+search_index = get_search_index()
+timeline = get_timeline()
+notifications = get_notifications()
+state = get_state()
+get_archiver().maybe_run()
 
-init_data()
 
 # ============================================
 # 이미지 출력 함수
 # ============================================
+@profiler.timed("image")
 def show_item_image(item, width=None, use_column_width=False):
-    if item.get("image_data"):
-        img_bytes = base64.b64decode(item["image_data"])
-        st.image(img_bytes, width=width, use_column_width=use_column_width)
-    elif item.get("image_url"):
-        st.image(item["image_url"], width=width, use_column_width=use_column_width)
+    profiler.count("images")
+    if item.get("image_hash"):
+        # 업로드 때 만들어 둔 크기별 썸네일을 그대로 보낸다. (매번 디코딩하지 않음)
+        thumb_path = images.thumbnail(item["image_hash"], None if use_column_width else width)
+        st.image(str(thumb_path), width=width, use_column_width=use_column_width)
     else:
-        st.image("https://placehold.co/400x250?text=No+Image", width=width, use_column_width=use_column_width)
+        # 외부 CDN 원본 대신, 서버에서 한 번 받아 카드 폭으로 줄여 둔 로컬 파일을 보낸다.
+        url = item.get("image_url") or NO_IMAGE_URL
+        local_path = remote_images.get(url, images.best_width(None if use_column_width else width))
+        st.image(str(local_path), width=width, use_column_width=use_column_width)
 
 
 # ============================================
@@ -140,27 +235,22 @@ def show_item_image(item, width=None, use_column_width=False):
 # ============================================
 st.title("🎒 하나고 온라인 분실물함 - 하나줍줍")
 
-tabs = st.tabs([
-    "🏠 홈 (최근 분실물)",
-    "📝 업로드",
-    "🔍 전체/검색 목록",
-    "⏳ 오래된 분실물",
-    "🏆 랭킹",
-    "🔔 알림/설정",
-])
+
+# st.tabs 는 여섯 탭의 본문을 매번 전부 실행한다.
+# 대신 화면(view)마다 함수로 나누고, 지금 선택된 화면 함수 하나만 실행한다.
+# 각 화면 함수는 profiler 구간(view:...)으로 재서 사이드바 성능 패널에 나온다.
+
 
 # ===========================================================
-# TAB 1 — 홈 (최근 분실물)
+# 화면 1 — 홈 (최근 분실물)
 # ===========================================================
-with tabs[0]:
+@profiler.timed("view:home")
+def render_home():
     st.subheader("✨ 최근 분실물 게시판 (업로드 최신순)")
     st.info("이 탭에는 가장 최근에 **업로드된** 12개 항목이 표시됩니다.")
 
-    items = sorted(
-        st.session_state.lost_items,
-        key=lambda x: x["uploaded_at"],
-        reverse=True,
-    )[:12]
+    # 시간순 인덱스 끝에서 12개만 읽는다. (전체 정렬 없음)
+    items = timeline.recent(12)
 
     cols = st.columns(3)
     for i, item in enumerate(items):
@@ -177,9 +267,10 @@ with tabs[0]:
 
 
 # ===========================================================
-# TAB 2 — 업로드 (st.rerun() 추가)
+# 화면 2 — 업로드 (st.rerun() 추가)
 # ===========================================================
-with tabs[1]:
+@profiler.timed("view:upload")
+def render_upload():
     st.subheader("📝 새로운 분실물 등록")
 
     with st.form("upload_form", clear_on_submit=True):
@@ -197,10 +288,14 @@ with tabs[1]:
         submitted = st.form_submit_button("등록하기")
 
     if submitted:
-        image_b64 = None
+        image_hash = None
         if uploaded_file is not None:
-            img_bytes = uploaded_file.read()
-            image_b64 = base64.b64encode(img_bytes).decode("utf-8")
+            # 원본 1회 저장 + 220/400px 썸네일 생성 (같은 사진이면 재사용)
+            try:
+                image_hash = images.put(uploaded_file.getvalue())
+            except InvalidImage:
+                st.error("사진을 읽을 수 없어요. 손상되지 않은 PNG/JPG 파일로 다시 올려 주세요. 🙏")
+                return
 
         new_item = {
             "id": str(uuid.uuid4()),
@@ -208,27 +303,14 @@ with tabs[1]:
             "location": location,
             "floor": floor,
             "uploaded_at": datetime.now(),
-            "image_url": None if image_b64 else "https://placehold.co/400x250?text=Lost+Item",
-            "image_data": image_b64,
+            "image_url": None if image_hash else LOST_ITEM_URL,
+            "image_hash": image_hash,
             "uploader": uploader,
             "resolved": False,
         }
 
-        st.session_state.lost_items.append(new_item)
-
-        stats = st.session_state.user_stats.get(
-            uploader, {"upload_count": 0, "notification_on": True}
-        )
-        stats["upload_count"] += 1
-        st.session_state.user_stats[uploader] = stats
-
-        st.session_state.notifications.insert(
-            0,
-            {
-                "time": datetime.now(),
-                "message": f"새로운 분실물 '{name}'이(가) 등록되었습니다. (업로더: {uploader})",
-            },
-        )
+        # 저장 + 업로드 횟수 증가 + 인덱스/알림 갱신을 한 번에 (동시 업로드에도 안전)
+        state.record_upload(new_item)
 
         st.success("🎉 분실물이 성공적으로 등록되었습니다! 홈 탭에서 바로 확인할 수 있습니다.")
         st.balloons()
@@ -238,47 +320,44 @@ with tabs[1]:
 
 
 # ===========================================================
-# TAB 3 — 전체/검색 목록
+# 화면 3 — 전체/검색 목록
 # ===========================================================
-with tabs[2]:
+@st.fragment
+@profiler.timed("view:search")
+def render_search():
+    # 검색창에 입력할 때마다 이 함수(fragment)만 다시 실행된다.
+    item_frame = get_item_frame(store.generation)
     st.subheader("🔍 분실물 검색 및 전체 목록")
 
-    df = pd.DataFrame(st.session_state.lost_items)
-
     col1, col2, col3 = st.columns([3,1,2])
     query = col1.text_input("검색어 입력 (물건/장소)")
     floor_filter = col2.selectbox("층수", ["전체",0,1,2,3,4,5,6,7], index=0)
-    sort_order = col3.radio("정렬 기준", ["최신순","오래된순"], horizontal=True)
-
-    filtered = df.copy()
+    sort_options = ["관련도순","최신순","오래된순"] if query else ["최신순","오래된순"]
+    sort_order = col3.radio("정렬 기준", sort_options, horizontal=True)
 
+    floor_value = None if floor_filter == "전체" else floor_filter
     if query:
-        filtered = filtered[
-            filtered["name"].str.contains(query, case=False) |
-            filtered["location"].str.contains(query, case=False)
-        ]
+        # 검색어가 있으면 역색인에서 받은 id 순서 그대로, 없으면 캐시된 프레임을 층수로만 거른다.
+        order = {"관련도순": "relevance", "최신순": "newest", "오래된순": "oldest"}[sort_order]
+        matched_ids = search_index.search(query, floor=floor_value, order=order)
+        positions = item_frame.positions_for_ids(matched_ids)
+    else:
+        positions = item_frame.positions(floor_value, newest_first=(sort_order == "최신순"))
+    total_count = len(positions)
 
-    if floor_filter != "전체":
-        filtered = filtered[filtered["floor"] == floor_filter]
+    # 페이지 단위로만 그린다. (보이는 페이지의 이미지만 그림)
+    col4, col5, col6 = st.columns([1,1,4])
+    page_size = col4.selectbox("페이지당 개수", [10, 20, 50], index=1)
+    page_count = max(1, -(-total_count // page_size))
+    page = col5.number_input("페이지", min_value=1, max_value=page_count, value=1, step=1)
+    col6.caption(f"검색 결과 {total_count}개 · {page}/{page_count} 페이지")
 
-    filtered = filtered.sort_values(
-        by="uploaded_at", ascending=(sort_order=="오래된순")
-    )
+    offset = (page - 1) * page_size
+    page_positions = positions[offset:offset + page_size]
 
     # 표 출력
-    tmp = filtered.copy()
-    tmp["업로드 시각"] = tmp["uploaded_at"].dt.strftime("%Y-%m-%d %H:%M")
-
-    tmp = tmp.rename(columns={
-        "name": "물건 이름",
-        "location": "발견 장소",
-        "floor": "층수",
-        "uploader": "업로더",
-        "resolved": "해결 여부"
-    })
-
     st.dataframe(
-        tmp[["물건 이름","발견 장소","층수","업로드 시각","업로더","해결 여부"]],
+        item_frame.table(page_positions),
         use_container_width=True,
         hide_index=True
     )
@@ -286,8 +365,7 @@ with tabs[2]:
     st.markdown("---")
     st.markdown("### 🖼 사진 카드로 보기")
 
-    for _, row in filtered.iterrows():
-        item = next(x for x in st.session_state.lost_items if x["id"] == row["id"])
+    for item in item_frame.rows(page_positions):
         st.markdown("<div class='item-card'>", unsafe_allow_html=True)
         cols = st.columns([1,2])
         with cols[0]:
@@ -299,74 +377,86 @@ with tabs[2]:
             st.write(f"🙋 업로더: {item['uploader']}")
         st.markdown("</div>", unsafe_allow_html=True)
 
+    # fragment 만 다시 돌 때는 사이드바 성능 패널이 다시 그려지지 않으므로 여기에 표시
+    profiler.render_caption("view:search")
+
 
 # ===========================================================
-# TAB 4 — 오래된 분실물
+# 화면 4 — 오래된 분실물
 # ===========================================================
-with tabs[3]:
-    st.subheader("⏳ 오래된 분실물 (업로드 30일 이상 경과)")
-    st.info("이 탭에는 **업로드된 시점**부터 30일이 지난 항목만 표시됩니다.")
-
-    today = datetime.now()
-    # uploaded_at이 30일 이상 지난 항목만 필터링
-    old_items = [
-        item for item in st.session_state.lost_items
-        if item["uploaded_at"] < today - timedelta(days=30)
-    ]
-
-    if len(old_items) == 0:
-        st.info("30일 이상 지난 분실물이 없습니다.")
-    else:
-        df_old = pd.DataFrame(old_items)
-        df_old["업로드 시각"] = df_old["uploaded_at"].dt.strftime("%Y-%m-%d %H:%M")
+@profiler.timed("view:old_items")
+def render_old_items():
+    item_frame = get_item_frame(store.generation)
+
+    cutoff_days = st.radio(
+        "기준 기간",
+        CUTOFF_DAYS,
+        index=CUTOFF_DAYS.index(30),
+        format_func=lambda d: f"{d}일 이상",
+        horizontal=True,
+    )
+    st.subheader(f"⏳ 오래된 분실물 (업로드 {cutoff_days}일 이상 경과)")
+    st.info(f"이 탭에는 **업로드된 시점**부터 {cutoff_days}일이 지난 항목만 표시됩니다.")
 
-        df_old = df_old.rename(columns={
-            "name": "물건 이름",
-            "location": "발견 장소",
-            "floor": "층수",
-            "uploader": "업로더",
-            "resolved": "해결 여부"
-        })
+    # 시간순으로 정렬된 프레임에서 기준 시각 위치를 한 번에 찾아 앞부분만 잘라낸다.
+    old_positions = item_frame.positions_before(cutoff_for(cutoff_days))
 
+    if len(old_positions) == 0:
+        st.info(f"{cutoff_days}일 이상 지난 분실물이 없습니다.")
+    else:
         st.dataframe(
-            df_old[["물건 이름","발견 장소","층수","업로드 시각","업로더","해결 여부"]],
+            item_frame.table(old_positions),
             use_container_width=True,
             hide_index=True
         )
 
+
 # ===========================================================
-# TAB 5 — 랭킹
+# 화면 5 — 랭킹
 # ===========================================================
-with tabs[4]:
+@profiler.timed("view:ranking")
+def render_ranking():
     st.subheader("🏆 업로드 랭킹")
 
-    rank = [
-        {"이름": name, "업로드 횟수": info["upload_count"]}
-        for name, info in st.session_state.user_stats.items()
-    ]
+    colR1, colR2, colR3 = st.columns([2,1,2])
+    rank_window = colR1.radio(
+        "기간", ["전체", "이번 주", "이번 달"], horizontal=True
+    )
+    top_k = colR2.selectbox("표시 인원", [10, 20, 50, 100], index=1)
+    my_name = colR3.text_input("🙋 내 이름 (순위 확인)", value="25116 이래나")
+
+    # 정렬된 랭킹에서 앞 K명만 읽는다. (전체 정렬/DataFrame 재생성 없음)
+    leaderboard = state.leaderboard
+    window = {"이번 주": "week", "이번 달": "month"}.get(rank_window)
+    if window is None:
+        top_rows = leaderboard.top(top_k)
+        my_rank = leaderboard.rank(my_name)
+    else:
+        top_rows = leaderboard.top_window(window, top_k)
+        my_rank = leaderboard.rank_window(window, my_name)
 
-    df_rank = pd.DataFrame(rank).sort_values(
-        by="업로드 횟수", ascending=False
-    ).reset_index(drop=True)
-    df_rank["순위"] = df_rank.index + 1
+    if my_rank is None:
+        st.info(f"'{my_name}' 님은 이 기간에 업로드 기록이 없습니다.")
+    else:
+        st.success(f"🏅 '{my_name}' 님은 **{my_rank[0]}위** (업로드 {my_rank[1]}회) 입니다.")
 
     st.dataframe(
-        df_rank[["순위","이름","업로드 횟수"]],
+        pd.DataFrame(top_rows, columns=["순위","이름","업로드 횟수"]),
         use_container_width=True,
         hide_index=True
     )
 
+
 # ===========================================================
-# TAB 6 — 알림
+# 화면 6 — 알림
 # ===========================================================
-with tabs[5]:
+@profiler.timed("view:notifications")
+def render_notifications():
     st.subheader("🔔 알림 내역 및 설정")
 
     current_user = st.text_input("🔧 알림 설정할 사용자 이름", value="25116 이래나")
 
-    stats = st.session_state.user_stats.get(
-        current_user, {"upload_count": 0, "notification_on": True}
-    )
+    stats = state.user_stats(current_user)
 
     notif_on = st.checkbox(
         f"새 분실물 등록 시 알림 받기 (현재 {'ON' if stats['notification_on'] else 'OFF'})",
@@ -374,21 +464,77 @@ with tabs[5]:
     )
 
     if notif_on != stats["notification_on"]:
-        stats["notification_on"] = notif_on
-        st.session_state.user_stats[current_user] = stats
+        state.set_notification(current_user, notif_on)
         st.success("알림 설정이 저장되었습니다.")
         st.rerun()
 
+    if stats["notification_on"]:
+        notifications.subscribe(current_user)
+
+    st.markdown("---")
+    unread_count = notifications.unread_count(current_user)
+    st.markdown(f"### 📬 읽지 않은 알림 ({unread_count}개)")
+
+    if not stats["notification_on"]:
+        st.info("알림이 꺼져 있어서 새 알림을 받지 않습니다.")
+    elif unread_count == 0:
+        st.info("새 알림이 없습니다.")
+    else:
+        for n in notifications.unread(current_user, limit=20):
+            st.write(f"[{n['time'].strftime('%Y-%m-%d %H:%M:%S')}] {n['message']}")
+        if unread_count > 20:
+            st.caption(f"... 외 {unread_count - 20}개")
+
+        if st.button("✅ 모두 읽음으로 표시"):
+            notifications.mark_read(current_user)
+            st.rerun()
+
     st.markdown("---")
     st.markdown("### 📋 전체 알림 내역")
 
-    if len(st.session_state.notifications) == 0:
+    # 커서(이전 페이지의 마지막 seq) 기준으로 20개씩 본다.
+    before = st.session_state.get("notification_cursor")
+    page, next_cursor = notifications.page(before=before, limit=20, user=current_user)
+
+    if len(page) == 0 and before is None:
         st.info("알림이 없습니다.")
     else:
-        for n in st.session_state.notifications:
+        for n in page:
             st.write(f"[{n['time'].strftime('%Y-%m-%d %H:%M:%S')}] {n['message']}")
 
-        if st.button("🗑️️ 알림 모두 지우기"):
-            st.session_state.notifications = []
+        colP, colN = st.columns(2)
+        if before is not None and colP.button("⏮ 최신 알림으로"):
+            st.session_state.notification_cursor = None
+            st.rerun()
+        if next_cursor is not None and colN.button("이전 알림 더 보기 ▶"):
+            st.session_state.notification_cursor = next_cursor
+            st.rerun()
+
+        # 공용 로그는 그대로 두고, 이 사용자에게만 지금까지의 알림을 숨긴다.
+        if st.button("🗑️️ 내 알림 모두 지우기"):
+            notifications.clear_for(current_user)
+            st.session_state.notification_cursor = None
             st.success("알림이 삭제되었습니다.")
             st.rerun()
+
+
+# ===========================================================
+# 화면 선택 — 선택된 화면 하나만 실행
+# ===========================================================
+VIEWS = {
+    "🏠 홈 (최근 분실물)": render_home,
+    "📝 업로드": render_upload,
+    "🔍 전체/검색 목록": render_search,
+    "⏳ 오래된 분실물": render_old_items,
+    "🏆 랭킹": render_ranking,
+    "🔔 알림/설정": render_notifications,
+}
+
+active_view = st.radio(
+    "화면 선택", list(VIEWS), horizontal=True, label_visibility="collapsed", key="active_view"
+)
+st.markdown("---")
+VIEWS[active_view]()
+
+profiler.render_sidebar()
+profiler.end_rerun()